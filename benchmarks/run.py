@@ -0,0 +1,593 @@
+"""
+GrimNode benchmark suite
+Runs scan, livefeed, send-job and bundle against local stand-ins and writes a
+machine-readable results file that can be compared across commits
+
+    python -m benchmarks.run run --output bench_results.json
+    python -m benchmarks.run compare old.json new.json
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.standins import FakePumpPortal, FakeSolanaRPC, ShadowAgentStandin, price_source_standin
+
+# Scenarios measure in-process execution unless they start their own daemon
+os.environ["GRIMNODE_DAEMON"] = "0"
+
+app = typer.Typer(add_completion=False)
+console = Console()
+
+# Wall-clock budget for `cli.py --no-banner` on top of a bare interpreter start
+STARTUP_BUDGET_MS = 150.0
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+def quiet_console() -> Console:
+    """Console that renders everything but writes nowhere, so output cost stays in the measurement"""
+    return Console(file=open(os.devnull, "w"), force_terminal=True, width=120)
+
+def latency_stats(latencies: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p99/mean in milliseconds"""
+    if not latencies:
+        return {"p50_ms": None, "p99_ms": None, "mean_ms": None}
+    ordered = sorted(latencies)
+    pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+    return {"p50_ms": pick(0.50), "p99_ms": pick(0.99), "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3)}
+
+def timed(fn: Callable[[], Any], iterations: int, unit: str) -> Dict[str, Any]:
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    return {"iterations": iterations, "elapsed_s": round(elapsed, 4), f"{unit}_per_s": round(iterations / elapsed, 2),
+            **latency_stats(latencies)}
+
+def bench_scan(rpc: FakeSolanaRPC, iterations: int, limit: int) -> Dict[str, Any]:
+    """cli.py scan against the fake RPC; throughput is transactions inspected per second"""
+    import cli
+    cli.SOLANA_RPC_ENDPOINTS = [rpc.url]
+    cli.console = quiet_console()
+    result = timed(lambda: cli.scan(limit=limit), iterations, "scans")
+    result["tx_per_s"] = round(result["scans_per_s"] * limit, 2)
+    return result
+
+def bench_pumpportal_scan(portal: FakePumpPortal, iterations: int) -> Dict[str, Any]:
+    """pump_cli.py scan against the fake PumpPortal REST API"""
+    import pump_cli
+    pump_cli.PUMPPORTAL_NEW_API = f"{portal.api_base}/tokens/new"
+    pump_cli.PUMPPORTAL_TRENDING_API = f"{portal.api_base}/tokens/trending"
+    pump_cli.console = quiet_console()
+    return timed(lambda: pump_cli.scan(limit=portal.page_size, trending=False), iterations, "scans")
+
+def bench_livefeed(portal: FakePumpPortal, events: int) -> Dict[str, Any]:
+    """Decode and render firehose events the way pump_cli.py livefeed does"""
+    import pump_cli
+    import websockets
+    from utils import models
+    pump_cli.console = quiet_console()
+
+    async def consume() -> Dict[str, Any]:
+        latencies = []
+        async with websockets.connect(portal.ws_url) as ws:
+            await ws.send(json.dumps({"method": "subscribeNewToken"}))
+            started = time.perf_counter()
+            for _ in range(events):
+                payload = models.loads(await ws.recv())
+                pump_cli.pretty_print_event(models.LiveEvent.from_dict(payload))
+                latencies.append(time.time() - payload["sent_at"])
+            elapsed = time.perf_counter() - started
+        return {"events": events, "elapsed_s": round(elapsed, 4), "events_per_s": round(events / elapsed, 2),
+                **latency_stats(latencies)}
+
+    return asyncio.run(consume())
+
+def bench_send_job(agent: ShadowAgentStandin, iterations: int) -> Dict[str, Any]:
+    """cli.py send-job round trips through the in-process agent"""
+    import cli
+    cli.SHADOWNET_AGENT_ADDRESS = agent.address
+    cli.console = quiet_console()
+    return timed(lambda: cli.send_job("benchmark job payload"), iterations, "jobs")
+
+def bench_bundle(iterations: int, tokens: int) -> Dict[str, Any]:
+    """Build, simulate, validate and cost a bundle in-process"""
+    from bundle.executor import bundle_tokens, validate_bundle, estimate_bundle_cost, generate_bundle_summary
+    symbols = [f"TOK{i}" for i in range(tokens)]
+
+    def one():
+        data = bundle_tokens(symbols, 1.0, simulate=True)
+        validate_bundle(data)
+        estimate_bundle_cost(data)
+        generate_bundle_summary(data)
+
+    return timed(one, iterations, "bundles")
+
+def bench_submission(rpc: FakeSolanaRPC, transactions: int) -> Dict[str, Any]:
+    """Sign, send and confirm transfers through SubmissionPipeline against the fake RPC"""
+    from solders.keypair import Keypair
+    from solders.message import Message
+    from solders.system_program import TransferParams, transfer
+    from utils.solana_client import SubmissionPipeline
+
+    payer = Keypair()
+    destination = Keypair().pubkey()
+    messages = [
+        Message([transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=destination, lamports=i + 1))], payer.pubkey())
+        for i in range(transactions)
+    ]
+    report = SubmissionPipeline(rpc.url, rpc.ws_url).run(messages, [[payer]] * transactions)
+    return {
+        "transactions": transactions,
+        "elapsed_s": report["elapsed_s"],
+        "tx_per_s": round(report["landed"] / report["elapsed_s"], 2) if report["elapsed_s"] else None,
+        "landed_rate": report["landed_rate"],
+        "p50_ms": round(report["confirm_p50_ms"], 3) if report["confirm_p50_ms"] is not None else None,
+        "p99_ms": round(report["confirm_p99_ms"], 3) if report["confirm_p99_ms"] is not None else None
+    }
+
+@contextmanager
+def running_daemon() -> Iterator[Any]:
+    """A GrimNode daemon on a private socket, with thin clients pointed at it"""
+    from utils.daemon import start_daemon_thread
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "daemon.sock"
+        os.environ.update(GRIMNODE_DAEMON="1", GRIMNODE_SOCKET=str(path))
+        server = start_daemon_thread(path)
+        try:
+            yield server
+        finally:
+            server.stop_threadsafe()
+            os.environ["GRIMNODE_DAEMON"] = "0"
+            os.environ.pop("GRIMNODE_SOCKET", None)
+
+def bench_daemon_scan(rpc: FakeSolanaRPC, iterations: int, limit: int) -> Dict[str, Any]:
+    """Repeated cli.py scan as a thin client of a warm daemon"""
+    with running_daemon():
+        return bench_scan(rpc, iterations, limit)
+
+def bench_daemon_pumpportal_scan(portal: FakePumpPortal, iterations: int) -> Dict[str, Any]:
+    """Repeated pump_cli.py scan as a thin client of a warm daemon"""
+    with running_daemon():
+        return bench_pumpportal_scan(portal, iterations)
+
+def bench_daemon_send_job(agent: ShadowAgentStandin, iterations: int) -> Dict[str, Any]:
+    """send-job relayed through the daemon's kept-open agent socket"""
+    with running_daemon():
+        return bench_send_job(agent, iterations)
+
+def bench_backfill(rpc: FakeSolanaRPC, signatures: int, concurrency: int = 16) -> Dict[str, Any]:
+    """Backfill the stand-in's signature history into a throwaway create store"""
+    import tempfile
+    from utils.backfill import run_backfill
+    from utils.create_store import CreateStore
+    with tempfile.TemporaryDirectory() as tmp:
+        with CreateStore(f"{tmp}/creates.db") as store:
+            stats = run_backfill([rpc.url], store, max_signatures=signatures, concurrency=concurrency)
+            query = timed(lambda: store.query(since=rpc.history_time - 60, limit=1000), 50, "queries")
+    return {"signatures": stats["signatures"], "creates": stats["creates"], "failed": stats["failed"],
+            "elapsed_s": stats["elapsed_s"], "query_p50_ms": query["p50_ms"],
+            "signatures_per_s": round(stats["signatures"] / stats["elapsed_s"], 2)}
+
+def bench_lookup_tables(signatures: int, lookup_ratio: float = 0.5, inner_ratio: float = 0.3) -> Dict[str, Any]:
+    """Backfill a v0 history routed through lookup tables and CPIs, with and without loaded addresses in the meta"""
+    import tempfile
+    from utils import lookup_tables
+    from utils.backfill import run_backfill
+    from utils.create_store import CreateStore
+    results: Dict[str, Any] = {"signatures": signatures, "lookup_ratio": lookup_ratio, "inner_ratio": inner_ratio}
+    for mode, loaded in (("meta", True), ("table_cache", False)):
+        lookup_tables.shared_cache().clear()
+        with FakeSolanaRPC(lookup_ratio=lookup_ratio, inner_ratio=inner_ratio, loaded_addresses=loaded) as rpc, \
+                tempfile.TemporaryDirectory() as tmp, CreateStore(f"{tmp}/creates.db") as store:
+            stats = run_backfill([rpc.url], store, max_signatures=signatures, concurrency=16)
+            results[f"{mode}_creates"] = stats["creates"]
+            results[f"{mode}_failed"] = stats["failed"]
+            results[f"{mode}_table_fetches"] = rpc.calls.get("getMultipleAccounts", 0)
+            results[f"{mode}_signatures_per_s"] = round(stats["signatures"] / stats["elapsed_s"], 2)
+    return results
+
+def bench_priority_fees(rpc: FakeSolanaRPC, iterations: int, account_sets: int = 8) -> Dict[str, Any]:
+    """Priority-fee estimates per account set: every call refetching vs the estimator's short-lived cache"""
+    import random
+    from solders.pubkey import Pubkey
+    from utils.fees import FeeEstimator
+    sets = [[str(Pubkey.new_unique()) for _ in range(3)] for _ in range(account_sets)]
+    uncached = FeeEstimator(rpc.url, ttl=0.0)
+    cold = timed(lambda: uncached.recommend(random.choice(sets), 0.9), iterations, "estimates")
+    cached = FeeEstimator(rpc.url)
+    for accounts in sets:
+        cached.estimate(accounts)
+    warm = timed(lambda: cached.recommend(random.choice(sets), 0.9), iterations * 20, "estimates")
+    estimate = cached.estimate(sets[0])
+    return {"account_sets": account_sets, "refetch_p50_ms": cold["p50_ms"], "cached_p50_ms": warm["p50_ms"],
+            "slots": len(estimate.fees), "recommended": estimate.recommendations()}
+
+def bench_prices(reads: int, tokens: int = 20, latency_ms: float = 150.0) -> Dict[str, Any]:
+    """USD prices for fee and table figures: a blocking source call per read vs the background-refreshed snapshot"""
+    import random
+    from benchmarks.standins import fake_trade, price_source_standin
+    from utils.prices import SOL_MINT, PriceService
+    source = price_source_standin(latency_ms)
+    mints = [fake_trade()["mint"] for _ in range(tokens)]
+    watched = {SOL_MINT: 9, **{mint: 6 for mint in mints}}
+    blocking = timed(lambda: source(watched)[SOL_MINT], max(1, reads // 1000), "reads")
+    service = PriceService(source, interval=0.2)
+    for mint in mints:
+        service.watch(mint)
+    service.start().wait(5.0)
+    snapshot = timed(lambda: service.usd(random.choice(mints)), reads, "reads")
+    service.stop()
+    return {"tokens": tokens, "blocking_p50_ms": blocking["p50_ms"], "snapshot_p50_ms": snapshot["p50_ms"],
+            "snapshot_p99_ms": snapshot["p99_ms"], "priced": len(service.snapshot.prices),
+            "reads_per_s": snapshot["reads_per_s"]}
+
+def bench_rate_limited(requests: int, rate_limit: float = 50.0, workers: int = 32) -> Dict[str, Any]:
+    """Hammer a 429-ing RPC from many threads over pooled sessions, with and without the shared limiter"""
+    from concurrent.futures import ThreadPoolExecutor
+    import requests as http
+    from utils import ratelimit
+    payload = {"jsonrpc": "2.0", "id": 1, "method": "getBlockHeight", "params": []}
+    results: Dict[str, Any] = {"requests": requests, "server_rate_limit": rate_limit}
+    for mode in ("unlimited", "limited"):
+        ratelimit.reset()
+        with FakeSolanaRPC(rate_limit=rate_limit) as rpc:
+            session = http.Session() if mode == "unlimited" else ratelimit.limited_session()
+            session.mount("http://", session.get_adapter("http://").__class__(pool_maxsize=workers))
+
+            def call(_):
+                return session.post(rpc.url, json=payload).status_code == 200
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(workers) as pool:
+                ok = sum(pool.map(call, range(requests)))
+            elapsed = time.perf_counter() - started
+            results.update({f"{mode}_succeeded": ok, f"{mode}_throttled": rpc.throttled,
+                            f"{mode}_elapsed_s": round(elapsed, 3), f"{mode}_goodput_per_s": round(ok / elapsed, 2)})
+    return results
+
+def bench_momentum(events: int, mints: int = 5000, top: int = 20) -> Dict[str, Any]:
+    """Fold a synthetic trade stream over thousands of mints into the local ranking, querying top-K as it goes"""
+    import random
+    from benchmarks.standins import fake_trade
+    from utils.momentum import MomentumRanker
+    pool = [fake_trade()["mint"] for _ in range(mints)]
+    stream = [{"method": "tokenTrade", "data": fake_trade(random.choice(pool))} for _ in range(events)]
+    ranker = MomentumRanker(window=60.0)
+    started = time.perf_counter()
+    for i, event in enumerate(stream):
+        ranker.observe(event, now=i * 0.001)
+    elapsed = time.perf_counter() - started
+    query = timed(lambda: ranker.top(top), 200, "queries")
+    return {"events": events, "mints": len(ranker.heap), "elapsed_s": round(elapsed, 4),
+            "top_k_p50_ms": query["p50_ms"], "top_k_p99_ms": query["p99_ms"],
+            "events_per_s": round(events / elapsed, 2)}
+
+def bench_models(events: int) -> Dict[str, Any]:
+    """Parse cost and retained memory of livefeed events and REST tokens: stdlib json dicts vs __slots__ models"""
+    import gc
+    import random
+    import tracemalloc
+    from benchmarks.standins import fake_token, fake_trade
+    from utils import models
+    mints = [fake_trade()["mint"] for _ in range(200)]
+    messages = []
+    for i in range(events):
+        if i % 4 == 0:
+            data = {**fake_token(i), "txType": "create"}
+            messages.append(json.dumps({"method": "newToken", "data": data}).encode())
+        else:
+            data = fake_trade(random.choice(mints))
+            data["txType"] = "buy" if data["is_buy"] else "sell"
+            messages.append(json.dumps({"method": "tokenTrade", "data": data}).encode())
+    rest_page = json.dumps({"tokens": [fake_token(i) for i in range(100)]}).encode()
+
+    def measure(parse: Callable[[bytes], Any]) -> Dict[str, float]:
+        passes = []
+        for _ in range(3):
+            gc.collect()
+            started = time.perf_counter()
+            for message in messages:
+                parse(message)
+            passes.append(time.perf_counter() - started)
+        parse_us = min(passes) / events * 1e6
+        gc.collect()
+        tracemalloc.start()
+        kept = [parse(message) for message in messages]
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del kept
+        return {"parse_us": round(parse_us, 3), "bytes_per_event": round(retained / events, 1)}
+
+    as_dicts = measure(json.loads)
+    as_models = measure(models.decode_event)
+    rest_dicts = timed(lambda: json.loads(rest_page).get("tokens", []), 200, "pages")
+    rest_models = timed(lambda: models.decode_tokens(rest_page), 200, "pages")
+    return {"events": events, "backend": models.BACKEND,
+            "dict_parse_us": as_dicts["parse_us"], "model_parse_us": as_models["parse_us"],
+            "dict_bytes_per_event": as_dicts["bytes_per_event"], "model_bytes_per_event": as_models["bytes_per_event"],
+            "memory_saved_pct": round(100 * (1 - as_models["bytes_per_event"] / as_dicts["bytes_per_event"]), 1),
+            "rest_page_dict_p50_ms": rest_dicts["p50_ms"], "rest_page_model_p50_ms": rest_models["p50_ms"]}
+
+def bench_zk_prover(proofs: int, workers: int = 2, load_ms: float = 600.0, prove_ms: float = 50.0) -> Dict[str, Any]:
+    """Preimage proofs on a persistent worker pool vs a fresh worker (start + circuit load) per proof"""
+    from benchmarks.standins import prover_standin_command
+    from utils.zk_prover import ProverPool
+    command = prover_standin_command(load_ms, prove_ms)
+    cold = []
+    for i in range(3):
+        started = time.perf_counter()
+        with ProverPool(workers=1, command=command) as pool:
+            pool.prove(f"cold-{i}")
+        cold.append((time.perf_counter() - started) * 1000)
+    started = time.perf_counter()
+    with ProverPool(workers=workers, command=command) as pool:
+        startup_ms = (time.perf_counter() - started) * 1000
+        single = [pool.prove(f"warm-{i}")["latency_ms"] for i in range(10)]
+        started = time.perf_counter()
+        pool.prove_many([f"batch-{i}" for i in range(proofs)])
+        elapsed = time.perf_counter() - started
+        stats = pool.stats()
+    return {"proofs": proofs, "workers": workers, "prove_ms": prove_ms, "pool_startup_ms": round(startup_ms, 1),
+            "cold_per_proof_ms": round(sorted(cold)[len(cold) // 2], 1),
+            "warm_per_proof_ms": round(sorted(single)[len(single) // 2], 2),
+            "warm_overhead_ms": round(sorted(single)[len(single) // 2] - prove_ms, 2),
+            "batch_p99_ms": stats["latency_p99_ms"], "proofs_per_s": round(proofs / elapsed, 2)}
+
+def bench_bundle_stream(bundles: int, wallets: int = 4, startup_ms: float = 50.0, rpc_ms: float = 20.0) -> Dict[str, Any]:
+    """Sent transfer bundles through one streaming executor vs one executor launch per bundle"""
+    from solders.keypair import Keypair
+    from benchmarks.standins import executor_standin_command
+    from bundle.streamer import BundleStreamer
+    command = executor_standin_command(startup_ms, rpc_ms)
+    keys = [str(Keypair()) for _ in range(wallets)]
+    bundle = {"wallets": keys, "instructions": [{"from": i, "to_pubkey": str(Keypair().pubkey()), "lamports": 1000}
+                                                for i in range(wallets)]}
+    spawned = []
+    for _ in range(5):
+        started = time.perf_counter()
+        with BundleStreamer(command=command) as streamer:
+            streamer.run(bundle, send=True)
+        spawned.append((time.perf_counter() - started) * 1000)
+    with BundleStreamer(command=command) as streamer:
+        streamer.run(bundle, send=True)
+        started = time.perf_counter()
+        results = streamer.run_many([bundle] * bundles, send=True)
+        elapsed = time.perf_counter() - started
+        stats = streamer.stats()
+    return {"bundles": bundles, "wallets": wallets, "rpc_ms": rpc_ms,
+            "spawned_per_bundle_ms": round(sorted(spawned)[len(spawned) // 2], 1),
+            "streamed_per_bundle_ms": round(elapsed * 1000 / bundles, 2),
+            "streamed_bundles_per_s": round(bundles / elapsed, 1),
+            "failed": sum(not r["ok"] for r in results), "latency_p99_ms": stats["latency_p99_ms"]}
+
+def bench_rules(events: int, rules: int = 300) -> Dict[str, Any]:
+    """Evaluate a few hundred alert rules per event: each expression on its own vs the compiled rule set"""
+    import random
+    from benchmarks.standins import fake_token, fake_trade
+    from utils.rules import Rule, RuleSet, normalize_event
+    templates = [
+        ("is_buy and sol_amount >= {x}", ("trade",)),
+        ("market_cap > {y} and match(symbol, '^B{n}')", ("new_token",)),
+        ("token_amount / sol_amount > {y}", ("trade",)),
+        ("not is_buy and {x} < sol_amount <= {x} + 1", ()),
+        ("lower(name) in ['bench token {n}', 'pepe'] or volume_24h > {y}", ())
+    ]
+    rule_set = RuleSet([
+        Rule(f"rule-{i}", template.format(x=random.uniform(0, 5), y=random.uniform(1e3, 1e6), n=i % 100), on)
+        for i, (template, on) in enumerate(random.choice(templates) for _ in range(rules))
+    ])
+    stream = [{"method": "newToken", "data": fake_token(i)} if i % 4 == 0 else {"method": "tokenTrade", "data": fake_trade()}
+              for i in range(events)]
+    # Baseline: each rule's expression evaluated on its own per event
+    naive = [(rule, compile(rule.when, rule.name, "eval")) for rule in rule_set.rules]
+    namespace = {"lower": str.lower, "abs": abs, "min": min, "max": max,
+                 "match": lambda value, pattern: __import__("re").search(pattern, value) is not None}
+    sample = stream[:max(1, events // 10)]
+    started = time.perf_counter()
+    naive_hits = 0
+    for event in sample:
+        fields = normalize_event(event)
+        for rule, code in naive:
+            if rule.on and fields["event"] not in rule.on:
+                continue
+            try:
+                naive_hits += bool(eval(code, namespace, fields))
+            except ZeroDivisionError:
+                pass
+    naive_us = (time.perf_counter() - started) / len(sample) * 1e6
+    started = time.perf_counter()
+    scalar_hits = sum(len(rule_set.match(event)) for event in stream)
+    scalar_us = (time.perf_counter() - started) / events * 1e6
+    return {"events": events, "rules": rules, "matches": scalar_hits,
+            "naive_us_per_event": round(naive_us, 2), "scalar_us_per_event": round(scalar_us, 2),
+            "events_per_s": round(1e6 / scalar_us, 2)}
+
+def bench_metrics_overhead(calls: int = 200_000) -> Dict[str, Any]:
+    """Cost of one metrics.track() around an empty body, disabled and enabled"""
+    from utils import metrics
+    was_enabled = metrics.ENABLED
+
+    def per_call_ns() -> float:
+        started = time.perf_counter()
+        for _ in range(calls):
+            with metrics.track("benchmark", "noop"):
+                pass
+        return round((time.perf_counter() - started) / calls * 1e9, 1)
+
+    try:
+        metrics.disable()
+        disabled = per_call_ns()
+        metrics.enable()
+        enabled = per_call_ns()
+    finally:
+        metrics.ENABLED = was_enabled
+    return {"calls": calls, "disabled_ns": disabled, "enabled_ns": enabled,
+            "calls_per_s": round(1e9 / disabled, 2)}
+
+def bench_startup(iterations: int) -> Dict[str, Any]:
+    """Wall time of fresh cli.py processes, measured against a bare `python -c pass`"""
+    def spawn(args: List[str]) -> Callable[[], Any]:
+        return lambda: subprocess.run([sys.executable, *args], cwd=REPO_ROOT, capture_output=True, check=True)
+
+    interpreter = timed(spawn(["-c", "pass"]), iterations, "starts")
+    no_banner = timed(spawn(["cli.py", "--no-banner"]), iterations, "starts")
+    help_page = timed(spawn(["cli.py", "scan", "--help"]), iterations, "starts")
+    overhead = no_banner["p50_ms"] - interpreter["p50_ms"]
+    return {
+        "iterations": iterations,
+        "interpreter_ms": interpreter["p50_ms"],
+        "help_ms": help_page["p50_ms"],
+        "overhead_ms": round(overhead, 3),
+        "budget_ms": STARTUP_BUDGET_MS,
+        "within_budget": overhead <= STARTUP_BUDGET_MS,
+        "starts_per_s": no_banner["starts_per_s"],
+        "p50_ms": no_banner["p50_ms"],
+        "p99_ms": no_banner["p99_ms"]
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+@app.command()
+def run(
+    output: Path = typer.Option(Path("bench_results.json"), help="Where to write the results JSON"),
+    only: Optional[str] = typer.Option(None, help="Comma-separated scenarios to run (default: all)"),
+    iterations: int = typer.Option(50, help="Iterations for request/response scenarios"),
+    rpc_latency_ms: float = typer.Option(1.0, help="Added latency per fake RPC request"),
+    confirm_delay_ms: float = typer.Option(20.0, help="Delay before a sent transaction lands"),
+    portal_latency_ms: float = typer.Option(1.0, help="Added latency per fake PumpPortal request"),
+    event_rate: float = typer.Option(5000.0, help="Firehose events per second"),
+    events: int = typer.Option(5000, help="Firehose events to consume"),
+    agent_latency_ms: float = typer.Option(0.0, help="Added latency per ShadowNet job"),
+    price_latency_ms: float = typer.Option(1.0, help="Added latency per stand-in price refresh"),
+    scan_limit: int = typer.Option(20, help="Signatures per scan"),
+    bundle_tokens: int = typer.Option(8, help="Tokens per benchmark bundle"),
+    transactions: int = typer.Option(500, help="Transactions for the submission scenario")
+):
+    """Run the benchmark scenarios and write a results file."""
+    config = {k: v for k, v in locals().items() if k not in ("output", "only")}
+    selected = set(only.split(",")) if only else None
+    wanted = lambda name: selected is None or name in selected
+    results: Dict[str, Any] = {}
+
+    with FakeSolanaRPC(rpc_latency_ms / 1000, confirm_delay_ms / 1000) as rpc, \
+            FakePumpPortal(portal_latency_ms / 1000, event_rate) as portal:
+        from cli import SHADOWNET_KEY
+        from utils.prices import PriceService, use_price_service
+        # USD columns in the rendered tables are priced by a stand-in, not Jupiter
+        use_price_service(PriceService(price_source_standin(price_latency_ms)))
+        with ShadowAgentStandin(SHADOWNET_KEY, agent_latency_ms / 1000) as agent:
+            scenarios = {
+                "scan": lambda: bench_scan(rpc, iterations, scan_limit),
+                "pumpportal_scan": lambda: bench_pumpportal_scan(portal, iterations),
+                "livefeed": lambda: bench_livefeed(portal, events),
+                "send_job": lambda: bench_send_job(agent, iterations),
+                "bundle": lambda: bench_bundle(iterations, bundle_tokens),
+                "submission": lambda: bench_submission(rpc, transactions),
+                "backfill": lambda: bench_backfill(rpc, transactions * 4),
+                "lookup_tables": lambda: bench_lookup_tables(transactions * 4),
+                "rate_limited": lambda: bench_rate_limited(transactions),
+                "priority_fees": lambda: bench_priority_fees(rpc, iterations),
+                "prices": lambda: bench_prices(iterations * 1000),
+                "metrics_overhead": lambda: bench_metrics_overhead(),
+                "momentum": lambda: bench_momentum(events * 20),
+                "rules": lambda: bench_rules(events * 4),
+                "zk_prover": lambda: bench_zk_prover(iterations),
+                "bundle_stream": lambda: bench_bundle_stream(iterations * 4),
+                "models": lambda: bench_models(events * 4),
+                "startup": lambda: bench_startup(min(iterations, 20)),
+                "daemon_scan": lambda: bench_daemon_scan(rpc, iterations, scan_limit),
+                "daemon_pumpportal_scan": lambda: bench_daemon_pumpportal_scan(portal, iterations),
+                "daemon_send_job": lambda: bench_daemon_send_job(agent, iterations)
+            }
+            for name, scenario in scenarios.items():
+                if not wanted(name):
+                    continue
+                console.print(f"[bold blue]Running {name}...[/bold blue]")
+                try:
+                    results[name] = scenario()
+                except Exception as e:
+                    console.print(f"[red]{name} failed: {e!r}[/red]")
+                    results[name] = {"error": repr(e)}
+
+    document = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": config
+        },
+        "results": results
+    }
+    output.write_text(json.dumps(document, indent=2))
+    show_results(results)
+    console.print(f"[green]Results written to {output}[/green]")
+    startup = results.get("startup", {})
+    if startup.get("within_budget") is False:
+        console.print(f"[bold red]CLI start-up overhead {startup['overhead_ms']}ms exceeds the {STARTUP_BUDGET_MS}ms budget[/bold red]")
+        raise typer.Exit(1)
+
+def show_results(results: Dict[str, Any]) -> None:
+    table = Table(title="Benchmark Results", show_header=True, header_style="bold magenta")
+    table.add_column("Scenario", style="cyan")
+    table.add_column("Throughput", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+    for name, result in results.items():
+        rate_key = next((k for k in reversed(list(result)) if k.endswith("_per_s")), None)
+        throughput = f"{result[rate_key]:,} {rate_key[:-6]}/s" if rate_key and result[rate_key] is not None else "-"
+        table.add_row(name, throughput, str(result.get("p50_ms", "-")), str(result.get("p99_ms", "-")))
+    console.print(table)
+
+@app.command()
+def compare(baseline: Path, candidate: Path):
+    """Compare two results files metric by metric."""
+    old = json.loads(baseline.read_text())
+    new = json.loads(candidate.read_text())
+    table = Table(
+        title=f"{old['meta'].get('commit')} -> {new['meta'].get('commit')}",
+        show_header=True, header_style="bold magenta"
+    )
+    table.add_column("Scenario", style="cyan")
+    table.add_column("Metric")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Candidate", justify="right")
+    table.add_column("Change", justify="right")
+    for name, result in new["results"].items():
+        before = old["results"].get(name, {})
+        for metric, value in result.items():
+            if not metric.endswith(("_per_s", "_ms", "_ns")) or not isinstance(value, (int, float)):
+                continue
+            previous = before.get(metric)
+            if not isinstance(previous, (int, float)) or previous == 0:
+                table.add_row(name, metric, "-", f"{value:,}", "-")
+                continue
+            change = (value / previous - 1) * 100
+            # Higher throughput is better, lower latency is better
+            better = change > 0 if metric.endswith("_per_s") else change < 0
+            color = "green" if better else "red"
+            table.add_row(name, metric, f"{previous:,}", f"{value:,}", f"[{color}]{change:+.1f}%[/{color}]")
+    console.print(table)
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,561 @@
+"""
+Local stand-ins for GrimNode's network dependencies
+Fake Solana JSON-RPC (HTTP + websocket), fake PumpPortal (REST + websocket firehose),
+an in-process ShadowNet agent and a proof worker process, each with configurable
+latency and event rates
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import random
+import struct
+import sys
+import threading
+import time
+
+import base58
+import websockets
+import zmq
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solders.transaction import Transaction
+
+from utils.crypto import encrypt_message, decrypt_message
+
+PUMP_FUN_PROGRAM_ADDRESS = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+CREATE_DISCRIMINATOR = bytes.fromhex("181ec828051c0777")
+SYSTEM_PROGRAM_ADDRESS = "11111111111111111111111111111111"
+
+def _borsh_string(value: str) -> bytes:
+    raw = value.encode()
+    return struct.pack("<I", len(raw)) + raw
+
+class _AsyncThread:
+    """An event loop on a daemon thread, for hosting websocket servers next to blocking code"""
+
+    def __init__(self, name: str):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self.thread.start()
+
+    def run(self, factory):
+        """Create and await an awaitable on the loop thread (websockets binds to the loop it's built on)"""
+        async def wait():
+            return await factory()
+        return asyncio.run_coroutine_threadsafe(wait(), self.loop).result()
+
+    def close_server(self, server) -> None:
+        async def close():
+            server.close()
+            await server.wait_closed()
+        self.run(close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Write headers and body in one segment; otherwise delayed ACKs add ~40ms per request
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    standin: Any = None
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _reply(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class _StandinServer(ThreadingHTTPServer):
+    # Benchmarks open hundreds of concurrent connections; the default backlog of 5 drops them
+    request_queue_size = 1024
+    daemon_threads = True
+
+def _serve_http(handler: type, standin: Any) -> ThreadingHTTPServer:
+    handler_cls = type(handler.__name__, (handler,), {"standin": standin})
+    server = _StandinServer(("127.0.0.1", 0), handler_cls)
+    threading.Thread(target=server.serve_forever, name=handler.__name__, daemon=True).start()
+    return server
+
+class _RpcHandler(_JsonHandler):
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        rpc: "FakeSolanaRPC" = self.standin
+        rpc.sleep()
+        if not rpc.admit():
+            self._reply(429, {"jsonrpc": "2.0", "error": {"code": 429, "message": "Too many requests"}}, {"Retry-After": "1"})
+            return
+        if isinstance(body, list):
+            self._reply(200, [rpc.dispatch(req) for req in body])
+        else:
+            self._reply(200, rpc.dispatch(body))
+
+class FakeSolanaRPC:
+    """
+    Solana JSON-RPC stand-in.
+
+    Serves the calls GrimNode makes (signatures, transactions, blockhashes,
+    accounts, sends) over HTTP, and signature/account subscriptions over a
+    websocket. Sent transactions land with land_probability after confirm_delay.
+    With rate_limit set, requests beyond that many per second get 429 + Retry-After.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        confirm_delay: float = 0.02,
+        land_probability: float = 1.0,
+        create_ratio: float = 0.5,
+        slot_time: float = 0.4,
+        history_size: int = 100_000,
+        rate_limit: Optional[float] = None,
+        lookup_ratio: float = 0.0,
+        inner_ratio: float = 0.0,
+        loaded_addresses: bool = True
+    ):
+        self.latency = latency
+        self.confirm_delay = confirm_delay
+        self.land_probability = land_probability
+        self.create_ratio = create_ratio
+        self.slot_time = slot_time
+        self.history_size = history_size
+        # Share of v0 transactions reaching Pump.fun through a lookup table, and of creates made by CPI;
+        # without loaded_addresses the meta omits them and the tables must be read with getMultipleAccounts
+        self.lookup_ratio = lookup_ratio
+        self.inner_ratio = inner_ratio
+        self.loaded_addresses = loaded_addresses
+        self.lookup_tables = {
+            str(Pubkey(hashlib.sha256(f"table-{t}".encode()).digest())):
+                [str(Pubkey(hashlib.sha256(f"table-{t}-{i}".encode()).digest())) for i in range(7)] + [PUMP_FUN_PROGRAM_ADDRESS]
+            for t in range(4)
+        }
+        self.history_slot = 10_000_000
+        self.history_time = int(time.time())
+        self._history: Dict[str, int] = {}
+        self.rate_limit = rate_limit
+        self.throttled = 0
+        self._tokens = rate_limit or 0.0
+        self._refilled = time.monotonic()
+        self.started_at = time.monotonic()
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._subscription_ids = itertools.count(1)
+        self._signature_subs: Dict[str, List[Any]] = {}
+        self._async = _AsyncThread("fake-rpc-ws")
+
+    def __enter__(self) -> "FakeSolanaRPC":
+        self._http = _serve_http(_RpcHandler, self)
+        self._ws_server = self._async.run(lambda: websockets.serve(self._ws_handler, "127.0.0.1", 0, max_size=None))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._http.shutdown()
+        self._async.close_server(self._ws_server)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._http.server_address[1]}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://127.0.0.1:{self._ws_server.sockets[0].getsockname()[1]}"
+
+    @property
+    def slot(self) -> int:
+        return 1000 + int((time.monotonic() - self.started_at) / self.slot_time)
+
+    def sleep(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def admit(self) -> bool:
+        """Token bucket of rate_limit requests per second; False means answer 429"""
+        if self.rate_limit is None:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled) * self.rate_limit)
+            self._refilled = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            self.throttled += 1
+            return False
+
+    def dispatch(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        method = req["method"]
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+        handler = getattr(self, f"_rpc_{method}", None)
+        if handler is None:
+            return {"jsonrpc": "2.0", "id": req["id"], "error": {"code": -32601, "message": f"Method not found: {method}"}}
+        return {"jsonrpc": "2.0", "id": req["id"], "result": handler(*req.get("params", []))}
+
+    def _context(self, value: Any) -> Dict[str, Any]:
+        return {"context": {"slot": self.slot}, "value": value}
+
+    def _rpc_getLatestBlockhash(self, *params) -> Dict[str, Any]:
+        return self._context({"blockhash": str(Hash.new_unique()), "lastValidBlockHeight": self.slot + 150})
+
+    def _rpc_getBlockHeight(self, *params) -> int:
+        return self.slot
+
+    def _rpc_getSlot(self, *params) -> int:
+        return self.slot
+
+    def _rpc_getBalance(self, *params) -> Dict[str, Any]:
+        return self._context(1_000_000_000)
+
+    def _rpc_getMultipleAccounts(self, keys: List[str], *params) -> Dict[str, Any]:
+        account = {
+            "lamports": 1_000_000_000, "data": ["", "base64"], "owner": SYSTEM_PROGRAM_ADDRESS,
+            "executable": False, "rentEpoch": 0, "space": 0
+        }
+        return self._context([self._lookup_table_account(key) if key in self.lookup_tables else account for key in keys])
+
+    def _lookup_table_account(self, table: str) -> Dict[str, Any]:
+        # Active table meta: type 1, deactivation_slot u64::MAX, last extended slot and index, no authority
+        meta = struct.pack("<IQQBB", 1, 2 ** 64 - 1, 0, 0, 0) + bytes(34)
+        data = meta + b"".join(bytes(Pubkey.from_string(address)) for address in self.lookup_tables[table])
+        return {"lamports": 1_000_000_000, "data": [base64.b64encode(data).decode(), "base64"],
+                "owner": "AddressLookupTab1e1111111111111111111111111", "executable": False, "rentEpoch": 0,
+                "space": len(data)}
+
+    def _rpc_getRecentPrioritizationFees(self, *params) -> List[Dict[str, int]]:
+        return [{"slot": self.slot - i, "prioritizationFee": random.choice([0, 0, 1000, 5000, 20000])} for i in range(150)]
+
+    def _rpc_getSignaturesForAddress(self, address: str, config: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        # The tip is fresh signatures on every call, as if new transactions keep landing;
+        # paging back with before/until walks a fixed history of history_size signatures
+        config = config or {}
+        limit = config.get("limit", 1000)
+        start = self._history_position(config["before"]) + 1 if config.get("before") else 0
+        end = min(start + limit, self.history_size)
+        if config.get("until"):
+            end = min(end, self._history_position(config["until"]))
+        return [{
+            "signature": self._history_signature(i, fresh=not config.get("before")), "slot": self.history_slot - i // 4, "err": None,
+            "memo": None, "blockTime": self.history_time - i // 10, "confirmationStatus": "finalized"
+        } for i in range(start, end)]
+
+    def _history_signature(self, position: int, fresh: bool = False) -> str:
+        seed = random.randbytes(64) if fresh else hashlib.sha512(f"history-{position}".encode()).digest()
+        signature = base58.b58encode(seed).decode()
+        with self._lock:
+            self._history[signature] = position
+        return signature
+
+    def _history_position(self, signature: str) -> int:
+        with self._lock:
+            return self._history.get(signature, self.history_size)
+
+    def _rpc_getTransaction(self, signature: str, *params) -> Dict[str, Any]:
+        # Seeded by the signature, so refetching a transaction returns the same one
+        rng = random.Random(signature)
+        position = self._history.get(signature)
+        creator, mint = str(Pubkey(rng.randbytes(32))), str(Pubkey(rng.randbytes(32)))
+        keys = [creator, mint] + [str(Pubkey(rng.randbytes(32))) for _ in range(8)] + [PUMP_FUN_PROGRAM_ADDRESS]
+        if rng.random() < self.create_ratio:
+            data = CREATE_DISCRIMINATOR + _borsh_string("Bench Token") + _borsh_string("BENCH") + _borsh_string("https://example.invalid/meta.json")
+            # mint first and the creating user eighth, as in the real create instruction
+            accounts = [1, 2, 3, 4, 5, 6, 7, 0, 8, 9]
+        else:
+            data = rng.randbytes(24)
+            accounts = list(range(len(keys) - 1))
+        instruction = {"programIdIndex": len(keys) - 1, "accounts": accounts,
+                       "data": base58.b58encode(data).decode(), "stackHeight": None}
+        lookups, loaded, inner = [], {"writable": [], "readonly": []}, []
+        if self.lookup_ratio and rng.random() < self.lookup_ratio:
+            # The program id comes from a table (its readonly index 7), so it follows the static keys
+            keys.pop()
+            lookups = [{"accountKey": rng.choice(sorted(self.lookup_tables)), "writableIndexes": [], "readonlyIndexes": [7]}]
+            loaded["readonly"] = [PUMP_FUN_PROGRAM_ADDRESS]
+        if self.inner_ratio and rng.random() < self.inner_ratio:
+            # A router program invokes the instruction
+            keys.append(str(Pubkey(rng.randbytes(32))))
+            inner = [{"index": 0, "instructions": [dict(instruction, stackHeight=2)]}]
+            instruction = {"programIdIndex": len(keys) - 1, "accounts": list(range(10)),
+                           "data": base58.b58encode(rng.randbytes(8)).decode(), "stackHeight": None}
+        if lookups:
+            (inner[0]["instructions"][0] if inner else instruction)["programIdIndex"] = len(keys)
+        meta_loaded = {"loadedAddresses": loaded} if self.loaded_addresses else {}
+        return {
+            "slot": self.slot if position is None else self.history_slot - position // 4,
+            "blockTime": int(time.time()) if position is None else self.history_time - position // 10,
+            "version": 0,
+            "meta": {
+                "err": None, "fee": 5000, "preBalances": [0] * len(keys), "postBalances": [0] * len(keys),
+                "innerInstructions": inner, "logMessages": [], "preTokenBalances": [], "postTokenBalances": [],
+                "rewards": [], **meta_loaded, "status": {"Ok": None}, "computeUnitsConsumed": 60_000
+            },
+            "transaction": {
+                "signatures": [signature],
+                "message": {
+                    "accountKeys": keys, "recentBlockhash": str(Hash.default()), "instructions": [instruction],
+                    "header": {"numRequiredSignatures": 2, "numReadonlySignedAccounts": 0, "numReadonlyUnsignedAccounts": 1},
+                    "addressTableLookups": lookups
+                }
+            }
+        }
+
+    def _rpc_sendTransaction(self, encoded: str, *params) -> str:
+        signature = str(Transaction.from_bytes(base64.b64decode(encoded)).signatures[0])
+        if random.random() < self.land_probability:
+            self._async.loop.call_soon_threadsafe(self._schedule_landing, signature)
+        return signature
+
+    def _rpc_getSignatureStatuses(self, signatures: List[str], *params) -> Dict[str, Any]:
+        return self._context([None for _ in signatures])
+
+    def _schedule_landing(self, signature: str) -> None:
+        self._async.loop.call_later(self.confirm_delay, lambda: asyncio.ensure_future(self._land(signature)))
+
+    async def _land(self, signature: str) -> None:
+        for ws, sub_id in self._signature_subs.pop(signature, []):
+            try:
+                await ws.send(json.dumps({
+                    "jsonrpc": "2.0", "method": "signatureNotification",
+                    "params": {"subscription": sub_id, "result": {"context": {"slot": self.slot}, "value": {"err": None}}}
+                }))
+            except websockets.ConnectionClosed:
+                pass
+
+    async def _ws_handler(self, ws, path: str = "/") -> None:
+        async for raw in ws:
+            req = json.loads(raw)
+            sub_id = next(self._subscription_ids)
+            if req["method"] == "signatureSubscribe":
+                self._signature_subs.setdefault(req["params"][0], []).append((ws, sub_id))
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": sub_id}))
+
+def fake_token(i: int) -> Dict[str, Any]:
+    return {
+        "name": f"Bench Token {i}", "symbol": f"B{i % 1000}", "mint": str(Keypair().pubkey()),
+        "creator": str(Keypair().pubkey()), "market_cap": random.uniform(1_000, 5_000_000),
+        "price": random.uniform(1e-8, 1e-4), "volume_24h": random.uniform(0, 1_000_000),
+        "supply": 1_000_000_000, "created_timestamp": int(time.time()) - i, "description": "benchmark token"
+    }
+
+def fake_trade(mint: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "mint": mint or str(Keypair().pubkey()), "trader": str(Keypair().pubkey()),
+        "is_buy": random.random() < 0.6, "sol_amount": random.uniform(0.01, 5),
+        "token_amount": random.uniform(1e3, 1e7), "price": random.uniform(1e-8, 1e-4),
+        "timestamp": int(time.time())
+    }
+
+class _PortalHandler(_JsonHandler):
+    def do_GET(self) -> None:
+        portal: "FakePumpPortal" = self.standin
+        portal.sleep()
+        path = self.path.split("?")[0]
+        if path.startswith("/v1/tokens/"):
+            self._reply(200, {"tokens": portal.tokens[:portal.page_size]})
+        elif path.startswith("/v1/token/"):
+            self._reply(200, {"token": portal.tokens[0]})
+        elif path.startswith("/v1/trades/"):
+            self._reply(200, {"trades": [fake_trade(path.rsplit("/", 1)[-1]) for _ in range(portal.page_size)]})
+        else:
+            self._reply(404, {"error": "not found"})
+
+class FakePumpPortal:
+    """
+    PumpPortal stand-in: the v1 REST API plus a websocket firehose.
+
+    The firehose pushes newToken/tokenTrade events at event_rate per second per
+    client, each stamped with its send time (sent_at) so consumers can measure
+    delivery latency.
+    """
+
+    def __init__(self, latency: float = 0.0, event_rate: float = 5_000.0, page_size: int = 50, trade_ratio: float = 0.8):
+        self.latency = latency
+        self.event_rate = event_rate
+        self.page_size = page_size
+        self.trade_ratio = trade_ratio
+        self.tokens = [fake_token(i) for i in range(page_size)]
+        self._async = _AsyncThread("fake-pumpportal-ws")
+
+    def __enter__(self) -> "FakePumpPortal":
+        self._http = _serve_http(_PortalHandler, self)
+        self._ws_server = self._async.run(lambda: websockets.serve(self._ws_handler, "127.0.0.1", 0))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._http.shutdown()
+        self._async.close_server(self._ws_server)
+
+    @property
+    def api_base(self) -> str:
+        return f"http://127.0.0.1:{self._http.server_address[1]}/v1"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://127.0.0.1:{self._ws_server.sockets[0].getsockname()[1]}"
+
+    def sleep(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _event(self) -> Dict[str, Any]:
+        if random.random() < self.trade_ratio:
+            trade = fake_trade(random.choice(self.tokens)["mint"])
+            trade["txType"] = "buy" if trade["is_buy"] else "sell"
+            return {"method": "tokenTrade", "data": trade, "sent_at": time.time()}
+        token = fake_token(random.randrange(1_000_000))
+        token["txType"] = "create"
+        return {"method": "newToken", "data": token, "sent_at": time.time()}
+
+    async def _ws_handler(self, ws, path: str = "/") -> None:
+        async def ignore_subscriptions():
+            async for _ in ws:
+                pass
+        reader = asyncio.ensure_future(ignore_subscriptions())
+        interval = 1.0 / self.event_rate
+        # Send in small bursts so high rates aren't bounded by timer resolution
+        burst = max(1, int(self.event_rate * 0.005))
+        try:
+            while True:
+                for _ in range(burst):
+                    await ws.send(json.dumps(self._event()))
+                await asyncio.sleep(interval * burst)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            reader.cancel()
+
+class ShadowAgentStandin:
+    """In-process ZeroMQ REP agent speaking the shadow_agent.py protocol, with added latency"""
+
+    def __init__(self, key: bytes, latency: float = 0.0):
+        self.key = key
+        self.latency = latency
+        self.jobs = 0
+        self._context = zmq.Context.instance()
+        self._stop = threading.Event()
+
+    def __enter__(self) -> "ShadowAgentStandin":
+        self._socket = self._context.socket(zmq.REP)
+        port = self._socket.bind_to_random_port("tcp://127.0.0.1")
+        self.address = f"tcp://127.0.0.1:{port}"
+        self._thread = threading.Thread(target=self._serve, name="shadow-agent-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1)
+
+    def _serve(self) -> None:
+        poller = zmq.Poller()
+        poller.register(self._socket, zmq.POLLIN)
+        while not self._stop.is_set():
+            if not poller.poll(50):
+                continue
+            message = decrypt_message(self._socket.recv(), self.key)
+            if self.latency:
+                time.sleep(self.latency)
+            self.jobs += 1
+            self._socket.send(encrypt_message(f"ACK: {message}", self.key))
+        self._socket.close(linger=0)
+
+# Speaks the grimnode-ts/src/prover-worker.ts protocol; loading and proving are simulated with sleeps
+_PROVER_STANDIN = """
+import json, os, sys, time
+load_ms, prove_ms = float(sys.argv[1]), float(sys.argv[2])
+time.sleep(load_ms / 1000)
+out = sys.stdout
+out.write(json.dumps({"ready": True, "pid": os.getpid(), "load_ms": load_ms}) + "\\n")
+out.flush()
+for line in sys.stdin:
+    for request in json.loads(line).get("batch", []):
+        time.sleep(prove_ms / 1000)
+        proof = {"pi_a": ["1", "2", "1"], "pi_b": [["1", "2"], ["3", "4"], ["1", "0"]], "pi_c": ["1", "2", "1"],
+                 "protocol": "groth16", "curve": "bn128"}
+        out.write(json.dumps({"id": request["id"], "proof": proof, "publicSignals": ["1"],
+                              "witness_ms": 0, "prove_ms": prove_ms}) + "\\n")
+        out.flush()
+"""
+
+def prover_standin_command(load_ms: float, prove_ms: float) -> List[str]:
+    """A proof worker command for utils.zk_prover that loads in load_ms and proves in prove_ms"""
+    return [sys.executable, "-c", _PROVER_STANDIN, str(load_ms), str(prove_ms)]
+
+_EXECUTOR_STANDIN = """
+import base64, hashlib, json, os, sys, time
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.system_program import TransferParams, transfer
+from solders.transaction import Transaction
+startup_ms, send_ms = float(sys.argv[1]), float(sys.argv[2])
+time.sleep(startup_ms / 1000)
+blockhash = None
+out = sys.stdout
+out.write(json.dumps({"ready": True, "pid": os.getpid()}) + "\\n")
+out.flush()
+for line in sys.stdin:
+    started = time.perf_counter()
+    request = json.loads(line)
+    result = {"id": request.get("id"), "ok": True, "sent": False, "skipped": []}
+    try:
+        keypairs = [Keypair.from_base58_string(w) for w in request["wallets"]]
+        instructions = []
+        for i, ti in enumerate(request["instructions"]):
+            if ti["from"] >= len(keypairs):
+                result["skipped"].append(f"instruction {i} refers to invalid wallet index {ti['from']}")
+                continue
+            instructions.append(transfer(TransferParams(from_pubkey=keypairs[ti["from"]].pubkey(),
+                                                        to_pubkey=Pubkey.from_string(ti["to_pubkey"]),
+                                                        lamports=ti["lamports"])))
+        message = Message(instructions, keypairs[0].pubkey())
+        result.update(message_hash=str(Hash(hashlib.sha256(bytes(message)).digest())),
+                      signers=message.header.num_required_signatures, instructions=len(instructions))
+        if request.get("blockhash") or request.get("send"):
+            if request.get("blockhash"):
+                recent = Hash.from_string(request["blockhash"])
+            else:
+                # One simulated getLatestBlockhash per process, as the executor caches it
+                if blockhash is None:
+                    time.sleep(send_ms / 1000)
+                    blockhash = Hash.new_unique()
+                recent = blockhash
+            signers = [k for k in keypairs if k.pubkey() in message.account_keys[:message.header.num_required_signatures]]
+            tx = Transaction(signers, message, recent)
+            result.update(signature=str(tx.signatures[0]), blockhash=str(recent))
+            if request.get("send"):
+                time.sleep(send_ms / 1000)
+                result["sent"] = True
+            else:
+                result["transaction"] = base64.b64encode(bytes(tx)).decode()
+    except BaseException as e:
+        # solders panics (a BaseException) on malformed keypairs
+        result.update(ok=False, error=str(e))
+    result["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    out.write(json.dumps(result) + "\\n")
+    out.flush()
+"""
+
+def executor_standin_command(startup_ms: float, send_ms: float) -> List[str]:
+    """A `grim_bundle --stream` stand-in for bundle.streamer: starts in startup_ms, each RPC call takes send_ms"""
+    return [sys.executable, "-c", _EXECUTOR_STANDIN, str(startup_ms), str(send_ms)]
+
+def price_source_standin(latency_ms: float, sol_usd: float = 150.0):
+    """A utils.prices source answering after latency_ms, with SOL near sol_usd and tokens at pump.fun-like prices"""
+    def source(mints: Dict[str, int]) -> Dict[str, float]:
+        time.sleep(latency_ms / 1000)
+        from utils.prices import SOL_MINT
+        return {mint: sol_usd * random.uniform(0.99, 1.01) if mint == SOL_MINT else random.uniform(1e-6, 1e-2)
+                for mint in mints}
+    return source
@@ -5,13 +5,22 @@ Bundle package for GrimBundle
 from .executor import (
     bundle_tokens,
     validate_bundle,
+    bundle_accounts,
     estimate_bundle_cost,
     generate_bundle_summary
 )
+from .simulator import BondingCurve, simulate_bundle
+from .streamer import BundleStreamer, StreamerError, stream_bundles
 
 __all__ = [
     "bundle_tokens",
     "validate_bundle", 
+    "bundle_accounts",
     "estimate_bundle_cost",
-    "generate_bundle_summary"
+    "generate_bundle_summary",
+    "BondingCurve",
+    "simulate_bundle",
+    "BundleStreamer",
+    "StreamerError",
+    "stream_bundles"
 ] 
\ No newline at end of file
@@ -7,6 +7,23 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 import random
 
+from utils.fees import (
+    BASE_FEE_LAMPORTS,
+    DEFAULT_COMPUTE_UNIT_PRICE,
+    DEFAULT_LANDING_PROBABILITY,
+    MICRO_LAMPORTS_PER_LAMPORT,
+    FeeEstimate,
+    priority_fee_lamports
+)
+
+def _is_address(value: str) -> bool:
+    from solders.pubkey import Pubkey
+    try:
+        Pubkey.from_string(value)
+        return True
+    except ValueError:
+        return False
+
 def bundle_tokens(
     tokens: List[str], 
     slippage: float, 
@@ -40,6 +57,8 @@ def bundle_tokens(
         action = {
             "type": "swap",
             "token": token.upper(),
+            # A mint address also names the accounts the swap writes to
+            "mint": token if _is_address(token) else None,
             "amount": amounts[i],
             "slippage": slippage,
             "priority": i + 1,
@@ -48,6 +67,15 @@ def bundle_tokens(
         }
         actions.append(action)
     
+    # Replace the placeholder impact with the local bonding-curve model
+    simulation = None
+    if simulate:
+        from .simulator import simulate_bundle
+        simulation = simulate_bundle(actions)
+        for action, result in zip(actions, simulation["actions"]):
+            action["estimated_price_impact"] = round(result["price_impact_pct"], 2)
+            action["estimated_tokens_out"] = result["tokens_out"]
+    
     # Create bundle metadata
     bundle_data = {
         "actions": actions,
@@ -59,6 +87,8 @@ def bundle_tokens(
         "bundle_type": "token_swaps",
         "simulation_mode": simulate
     }
+    if simulation is not None:
+        bundle_data["simulation"] = simulation["tokens"]
     
     return bundle_data
 
@@ -109,12 +139,34 @@ def validate_bundle(bundle_data: Dict[str, Any]) -> Dict[str, Any]:
     
     return validation
 
-def estimate_bundle_cost(bundle_data: Dict[str, Any]) -> Dict[str, Any]:
+def bundle_accounts(bundle_data: Dict[str, Any]) -> List[str]:
+    """Accounts a bundle writes to, for fee estimates: each action's mint and any accounts it lists"""
+    accounts = set()
+    for action in bundle_data.get("actions", []):
+        if action.get("mint"):
+            accounts.add(action["mint"])
+        accounts.update(action.get("accounts", ()))
+    return sorted(accounts)
+
+def estimate_bundle_cost(
+    bundle_data: Dict[str, Any],
+    fees: Optional[FeeEstimate] = None,
+    landing_probability: float = DEFAULT_LANDING_PROBABILITY,
+    sol_usd: Optional[float] = None
+) -> Dict[str, Any]:
     """
     Estimate the total cost of executing a bundle
     
+    Each action is one transaction with one signature, and its estimated_gas is
+    its compute-unit limit. The priority fee uses the compute-unit price that
+    landed in `landing_probability` of recent slots for the bundle's accounts.
+    
     Args:
         bundle_data: The bundle to estimate
+        fees: Recent priority fees for bundle_accounts(bundle_data) (from
+            utils.fees.FeeEstimator); without them a default price is used
+        landing_probability: Target chance of landing in the next slot
+        sol_usd: SOL price in USD (e.g. from utils.prices); without it there is no USD figure
         
     Returns:
         Dictionary with cost estimates
@@ -122,16 +174,27 @@ def estimate_bundle_cost(bundle_data: Dict[str, Any]) -> Dict[str, Any]:
     actions = bundle_data.get("actions", [])
     
     total_gas = sum(action.get("estimated_gas", 0) for action in actions)
-    gas_price = 5000  # Mock gas price in lamports
-    total_cost_lamports = total_gas * gas_price
+    compute_unit_price = fees.price(landing_probability) if fees is not None else DEFAULT_COMPUTE_UNIT_PRICE
+    base_fee_lamports = BASE_FEE_LAMPORTS * len(actions)
+    priority_fee = sum(
+        priority_fee_lamports(action.get("estimated_gas", 0), compute_unit_price) for action in actions
+    )
+    total_cost_lamports = base_fee_lamports + priority_fee
     total_cost_sol = total_cost_lamports / 1_000_000_000  # Convert to SOL
     
     return {
         "total_gas": total_gas,
-        "gas_price_lamports": gas_price,
+        "gas_price_lamports": compute_unit_price / MICRO_LAMPORTS_PER_LAMPORT,
+        "compute_unit_price_micro_lamports": compute_unit_price,
+        "landing_probability": landing_probability,
+        "fee_source": "recent_fees" if fees is not None and fees.fees else "default",
+        "recommended_prices": fees.recommendations() if fees is not None else None,
+        "base_fee_lamports": base_fee_lamports,
+        "priority_fee_lamports": priority_fee,
         "total_cost_lamports": total_cost_lamports,
-        "total_cost_sol": round(total_cost_sol, 6),
-        "estimated_fee_usd": round(total_cost_sol * 100, 2)  # Mock SOL price
+        "total_cost_sol": round(total_cost_sol, 9),
+        "sol_usd": sol_usd,
+        "estimated_fee_usd": round(total_cost_sol * sol_usd, 6) if sol_usd else None
     }
 
 def generate_bundle_summary(bundle_data: Dict[str, Any]) -> str:
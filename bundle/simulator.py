@@ -0,0 +1,230 @@
+"""
+Bonding curve simulator for GrimBundle
+Local model of Pump.fun's constant-product bonding curve, used to size bundles
+and estimate price impact without calling simulateTransaction
+"""
+
+from typing import List, Dict, Any, Optional, Sequence, Union
+import numpy as np
+
+LAMPORTS_PER_SOL = 1_000_000_000
+TOKEN_DECIMALS = 6
+
+# Pump.fun launch parameters (raw units: lamports and 6-decimal token base units)
+INITIAL_VIRTUAL_SOL_RESERVES = 30 * LAMPORTS_PER_SOL
+INITIAL_VIRTUAL_TOKEN_RESERVES = 1_073_000_000_000_000
+INITIAL_REAL_TOKEN_RESERVES = 793_100_000_000_000
+FEE_BPS = 100
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+class BondingCurve:
+    """
+    Pump.fun bonding curve state.
+
+    Trades move along x * y = k over the virtual reserves; the protocol fee is
+    taken outside the curve, so it never changes k. Buys are additionally capped
+    by the real token reserves left before the curve completes.
+    """
+
+    def __init__(
+        self,
+        virtual_sol_reserves: int = INITIAL_VIRTUAL_SOL_RESERVES,
+        virtual_token_reserves: int = INITIAL_VIRTUAL_TOKEN_RESERVES,
+        real_token_reserves: int = INITIAL_REAL_TOKEN_RESERVES,
+        real_sol_reserves: int = 0,
+        fee_bps: int = FEE_BPS
+    ):
+        self.virtual_sol_reserves = float(virtual_sol_reserves)
+        self.virtual_token_reserves = float(virtual_token_reserves)
+        self.real_token_reserves = float(real_token_reserves)
+        self.real_sol_reserves = float(real_sol_reserves)
+        self.fee_bps = fee_bps
+
+    @property
+    def k(self) -> float:
+        return self.virtual_sol_reserves * self.virtual_token_reserves
+
+    @property
+    def spot_price(self) -> float:
+        """Marginal price in lamports per raw token unit"""
+        return self.virtual_sol_reserves / self.virtual_token_reserves
+
+    @property
+    def spot_price_sol(self) -> float:
+        """Marginal price in SOL per whole token"""
+        return self.spot_price * 10 ** TOKEN_DECIMALS / LAMPORTS_PER_SOL
+
+    def copy(self) -> "BondingCurve":
+        return BondingCurve(
+            self.virtual_sol_reserves, self.virtual_token_reserves,
+            self.real_token_reserves, self.real_sol_reserves, self.fee_bps
+        )
+
+    def sweep_buys(self, sol_amounts: ArrayLike) -> Dict[str, np.ndarray]:
+        """
+        Evaluate independent buys of every size from the current state in one pass
+
+        Args:
+            sol_amounts: Lamports each buy spends, fee included
+
+        Returns:
+            Arrays of tokens out, fee, effective price and price impact per size
+        """
+        sol_in = np.asarray(sol_amounts, dtype=np.float64)
+        fee_rate = self.fee_bps / 10_000
+        net = sol_in / (1 + fee_rate)
+        tokens_out = self.virtual_token_reserves - self.k / (self.virtual_sol_reserves + net)
+        capped = tokens_out > self.real_token_reserves
+        tokens_out = np.minimum(tokens_out, self.real_token_reserves)
+        # A capped buy only pays for the tokens that were left
+        net = np.where(capped, self.k / (self.virtual_token_reserves - tokens_out) - self.virtual_sol_reserves, net)
+        price = np.divide(net, tokens_out, out=np.full_like(net, self.spot_price), where=tokens_out > 0)
+        return {
+            "sol_in": net * (1 + fee_rate),
+            "fee": net * fee_rate,
+            "tokens_out": tokens_out,
+            "effective_price": price,
+            "price_impact": price / self.spot_price - 1,
+            "capped": capped
+        }
+
+    def max_buy_within_impact(self, max_impact: float, sol_amounts: Optional[ArrayLike] = None) -> float:
+        """Largest buy (lamports) in the sweep whose price impact stays within max_impact"""
+        if sol_amounts is None:
+            sol_amounts = np.geomspace(0.001 * LAMPORTS_PER_SOL, 100 * LAMPORTS_PER_SOL, 512)
+        sizes = np.asarray(sol_amounts, dtype=np.float64)
+        impact = self.sweep_buys(sizes)["price_impact"]
+        within = sizes[impact <= max_impact]
+        return float(within.max()) if within.size else 0.0
+
+    def simulate(self, amounts: ArrayLike, is_buy: Optional[ArrayLike] = None, apply: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Run a sequence of trades through the curve, each seeing the previous ones' reserves
+
+        Args:
+            amounts: Lamports spent for buys, raw token units sold for sells. A 2-D
+                array is read as (scenarios, steps) and every scenario is run at once.
+            is_buy: Per-step direction, broadcast like amounts (all buys if omitted)
+            apply: Advance this curve to the end state of the (single) scenario
+
+        Returns:
+            Arrays shaped like amounts: tokens_out, sol_out, fee, price_before,
+            price_after, price_impact and the reserves after every step
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if is_buy is None:
+            result = self._simulate_buys(amounts)
+        else:
+            result = self._simulate_mixed(amounts, np.broadcast_to(np.asarray(is_buy, dtype=bool), amounts.shape))
+        if apply:
+            vs = np.atleast_1d(result["virtual_sol_reserves"])
+            vt = np.atleast_1d(result["virtual_token_reserves"])
+            if vs.size:
+                sold = self.virtual_token_reserves - vt.reshape(-1)[-1]
+                self.real_token_reserves -= sold
+                self.real_sol_reserves += vs.reshape(-1)[-1] - self.virtual_sol_reserves
+                self.virtual_sol_reserves = float(vs.reshape(-1)[-1])
+                self.virtual_token_reserves = float(vt.reshape(-1)[-1])
+        return result
+
+    def _simulate_buys(self, sol_in: np.ndarray) -> Dict[str, np.ndarray]:
+        # Buys only: reserves after step i depend on the running total, so cumsum does it in one pass
+        fee_rate = self.fee_bps / 10_000
+        vs0, vt0, k = self.virtual_sol_reserves, self.virtual_token_reserves, self.k
+        net = sol_in / (1 + fee_rate)
+        bought = np.minimum(vt0 - k / (vs0 + np.cumsum(net, axis=-1)), self.real_token_reserves)
+        vt_after = vt0 - bought
+        vs_after = k / vt_after
+        vs_before = np.concatenate([np.full(vs_after.shape[:-1] + (1,), vs0), vs_after[..., :-1]], axis=-1)
+        vt_before = k / vs_before
+        net = vs_after - vs_before
+        tokens_out = vt_before - vt_after
+        return self._result(vs_before, vt_before, vs_after, vt_after, tokens_out, np.zeros_like(net), net * fee_rate,
+                            np.ones_like(net, dtype=bool), net)
+
+    def _simulate_mixed(self, amounts: np.ndarray, is_buy: np.ndarray) -> Dict[str, np.ndarray]:
+        # Direction changes break the running-total trick, so step through the sequence
+        # while staying vectorized across scenarios
+        fee_rate = self.fee_bps / 10_000
+        k = self.k
+        batch = amounts.shape[:-1]
+        vs = np.full(batch, self.virtual_sol_reserves)
+        vt = np.full(batch, self.virtual_token_reserves)
+        real_left = np.full(batch, self.real_token_reserves)
+        steps = amounts.shape[-1]
+        vs_before = np.empty(amounts.shape)
+        vt_before = np.empty(amounts.shape)
+        vs_after = np.empty(amounts.shape)
+        vt_after = np.empty(amounts.shape)
+        for i in range(steps):
+            amount, buy = amounts[..., i], is_buy[..., i]
+            vs_before[..., i], vt_before[..., i] = vs, vt
+            bought = np.minimum(vt - k / (vs + amount / (1 + fee_rate)), real_left)
+            new_vt = np.where(buy, vt - bought, vt + amount)
+            real_left = np.where(buy, real_left - bought, real_left + amount)
+            vt = new_vt
+            vs = k / vt
+            vs_after[..., i], vt_after[..., i] = vs, vt
+        tokens_out = np.where(is_buy, vt_before - vt_after, 0.0)
+        gross_out = np.where(is_buy, 0.0, vs_before - vs_after)
+        net_in = np.where(is_buy, vs_after - vs_before, 0.0)
+        fee = np.where(is_buy, net_in, gross_out) * fee_rate
+        return self._result(vs_before, vt_before, vs_after, vt_after, tokens_out, np.where(is_buy, 0.0, gross_out - fee), fee,
+                            is_buy, net_in)
+
+    @staticmethod
+    def _result(vs_before, vt_before, vs_after, vt_after, tokens_out, sol_out, fee, is_buy, net_in) -> Dict[str, np.ndarray]:
+        price_before = vs_before / vt_before
+        traded_tokens = np.where(is_buy, tokens_out, vt_after - vt_before)
+        traded_sol = np.where(is_buy, net_in, vs_before - vs_after)
+        effective = np.divide(traded_sol, traded_tokens, out=price_before.copy(), where=traded_tokens > 0)
+        return {
+            "tokens_out": tokens_out,
+            "sol_in": net_in + np.where(is_buy, fee, 0.0),
+            "sol_out": sol_out,
+            "fee": fee,
+            "price_before": price_before,
+            "price_after": vs_after / vt_after,
+            "price_impact": np.where(is_buy, effective / price_before - 1, 1 - effective / price_before),
+            "virtual_sol_reserves": vs_after,
+            "virtual_token_reserves": vt_after
+        }
+
+def simulate_bundle(actions: List[Dict[str, Any]], curves: Optional[Dict[str, BondingCurve]] = None) -> Dict[str, Any]:
+    """
+    Simulate a bundle's actions in order, each token on its own curve
+
+    Args:
+        actions: Bundle actions; "amount" is read as lamports to spend
+        curves: Optional per-token curve state (fresh launch curves otherwise)
+
+    Returns:
+        Per-action price impact and tokens out, plus a per-token summary
+    """
+    curves = curves if curves is not None else {}
+    by_token: Dict[str, List[int]] = {}
+    for i, action in enumerate(actions):
+        by_token.setdefault(action["token"], []).append(i)
+
+    per_action: List[Dict[str, float]] = [{} for _ in actions]
+    tokens: Dict[str, Dict[str, float]] = {}
+    for token, indices in by_token.items():
+        curve = curves.setdefault(token, BondingCurve())
+        start_price = curve.spot_price_sol
+        amounts = np.array([float(actions[i]["amount"]) for i in indices])
+        result = curve.simulate(amounts, apply=True)
+        for j, i in enumerate(indices):
+            per_action[i] = {
+                "tokens_out": float(result["tokens_out"][j]) / 10 ** TOKEN_DECIMALS,
+                "price_impact_pct": round(float(result["price_impact"][j]) * 100, 4),
+                "fee_sol": float(result["fee"][j]) / LAMPORTS_PER_SOL
+            }
+        tokens[token] = {
+            "sol_in": float(result["sol_in"].sum()) / LAMPORTS_PER_SOL,
+            "tokens_out": float(result["tokens_out"].sum()) / 10 ** TOKEN_DECIMALS,
+            "start_price_sol": start_price,
+            "end_price_sol": curve.spot_price_sol,
+            "price_move_pct": round((curve.spot_price_sol / start_price - 1) * 100, 4)
+        }
+    return {"actions": per_action, "tokens": tokens}
@@ -0,0 +1,280 @@
+"""
+Bundle streamer for GrimBundle
+Drives one long-lived `grim_bundle --stream` process from Python, so many
+transfer bundles are built, signed and optionally sent without a process
+launch, RPC client setup and blockhash fetch per bundle
+
+Bundles go to the executor's stdin as NDJSON ({"id", "wallets", "instructions",
+"send", "confirm", "blockhash"}) and each comes back as one result line on
+stdout ({"id", "ok", "signature", "message_hash", "signers", "instructions",
+"skipped", "sent", "error", "elapsed_ms", "transaction"}). Set
+GRIM_BUNDLE_COMMAND to run a different executor that speaks the same protocol.
+
+Only grim_bundle's own input (wallets plus SOL transfers) can be streamed.
+bundle.executor bundles (bundle_tokens()) are Pump.fun buy/sell actions with
+simulated amounts and no wallets or instructions, and grim_bundle has no swap
+support to build them from; submit() rejects them rather than guess.
+"""
+
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Any, Deque, List, Optional
+import json
+import os
+import shlex
+import subprocess
+import threading
+import time
+
+from utils import metrics
+
+GRIM_BUNDLE = Path(__file__).resolve().parent.parent / "grim_bundle"
+START_TIMEOUT = 300.0
+# Recent bundles kept for latency percentiles
+STATS_WINDOW = 4096
+
+class StreamerError(RuntimeError):
+    """The executor failed to start or exited with bundles outstanding"""
+
+def executor_command() -> List[str]:
+    """GRIM_BUNDLE_COMMAND, else a built grim_bundle binary (release first), else `cargo run --release`"""
+    if os.getenv("GRIM_BUNDLE_COMMAND"):
+        return shlex.split(os.environ["GRIM_BUNDLE_COMMAND"])
+    for profile in ("release", "debug"):
+        binary = GRIM_BUNDLE / "target" / profile / "grim_bundle"
+        if binary.exists():
+            return [str(binary)]
+    return ["cargo", "run", "--release", "--quiet", "--manifest-path", str(GRIM_BUNDLE / "Cargo.toml"), "--"]
+
+class BundleStreamer:
+    """
+    One `grim_bundle --stream` process fed bundles over a pipe.
+
+    The executor keeps a single RPC client and a shared blockhash (refreshed
+    after blockhash_max_age seconds, or when a send is rejected for an expired
+    one). Bundles are written as they are submitted and a reader thread
+    resolves each bundle's Future from its result line, so writing the next
+    bundle never waits on the previous result. A bundle that fails to parse,
+    sign or send still resolves, with ok False and an error; only the executor
+    dying raises StreamerError.
+    """
+
+    def __init__(
+        self,
+        rpc_url: Optional[str] = None,
+        blockhash: Optional[str] = None,
+        blockhash_max_age: Optional[int] = None,
+        blockhash_cache: Optional[Any] = None,
+        command: Optional[List[str]] = None
+    ):
+        """
+        Args:
+            rpc_url: RPC endpoint for sending (the executor defaults to devnet)
+            blockhash: Blockhash to seed the executor's shared one with
+            blockhash_max_age: Seconds before the executor fetches a new shared blockhash
+            blockhash_cache: A started utils.blockhash.BlockhashCache; its current
+                blockhash is attached to every bundle that doesn't name one
+            command: Executor command, instead of executor_command()
+        """
+        self.command = (command or executor_command()) + ["--stream"]
+        if rpc_url:
+            self.command += ["--rpc", rpc_url]
+        if blockhash:
+            self.command += ["--blockhash", blockhash]
+        if blockhash_max_age is not None:
+            self.command += ["--blockhash-max-age", str(int(blockhash_max_age))]
+        self.blockhash_cache = blockhash_cache
+        self.process: Optional[subprocess.Popen] = None
+        self.pid: Optional[int] = None
+        self.error: Optional[str] = None
+        self._ready = threading.Event()
+        self._pending: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._next_id = 0
+        self._closed = False
+        self._stderr: Deque[str] = deque(maxlen=20)
+        self._log_thread: Optional[threading.Thread] = None
+        self._latencies: Deque[float] = deque(maxlen=STATS_WINDOW)
+        self._bundles = 0
+        self._failed = 0
+        self._sent = 0
+        self._first_submit: Optional[float] = None
+        self._last_result: Optional[float] = None
+
+    def start(self, timeout: float = START_TIMEOUT) -> "BundleStreamer":
+        """Launch the executor and wait for its ready line (a cargo build may run first)"""
+        if self.process is not None:
+            return self
+        try:
+            self.process = subprocess.Popen(
+                self.command, cwd=str(GRIM_BUNDLE), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE, bufsize=0
+            )
+        except OSError as e:
+            raise StreamerError(f"could not launch {self.command[0]}: {e}")
+        self._log_thread = threading.Thread(target=self._read_stderr, name="grim-bundle-log", daemon=True)
+        self._log_thread.start()
+        threading.Thread(target=self._read, name="grim-bundle", daemon=True).start()
+        if not self._ready.wait(timeout):
+            self.close()
+            raise StreamerError(f"grim_bundle did not start within {timeout:.0f}s")
+        if self.error:
+            raise StreamerError(self.error)
+        return self
+
+    def submit(
+        self,
+        bundle: Dict[str, Any],
+        send: bool = False,
+        confirm: bool = False,
+        blockhash: Optional[str] = None
+    ) -> Future:
+        """
+        Queue one bundle
+
+        Args:
+            bundle: {"wallets": [base58 keypairs], "instructions": [{"from", "to_pubkey", "lamports"}]},
+                the same shape as a grim_bundle input file
+            send: Broadcast the signed transaction
+            confirm: Wait for confirmation when sending
+            blockhash: Sign with this blockhash instead of the shared one
+
+        Returns:
+            A Future resolving to the executor's result for this bundle, plus latency_ms
+        """
+        if "actions" in bundle and "instructions" not in bundle:
+            raise ValueError("bundle.executor action bundles can't be streamed: grim_bundle only builds SOL "
+                             "transfers from {wallets, instructions}")
+        if self.process is None:
+            with self._start_lock:
+                self.start()
+        if blockhash is None and self.blockhash_cache is not None and self.blockhash_cache.snapshot is not None:
+            blockhash = str(self.blockhash_cache.snapshot.blockhash)
+        request = {"wallets": bundle.get("wallets", []), "instructions": bundle.get("instructions", []),
+                   "send": send, "confirm": confirm}
+        if blockhash:
+            request["blockhash"] = blockhash
+        future: Future = Future()
+        with self._lock:
+            if self._closed or self.error:
+                raise StreamerError(self.error or "bundle streamer is closed")
+            self._next_id += 1
+            request["id"] = self._next_id
+            submitted = time.perf_counter()
+            if self._first_submit is None:
+                self._first_submit = submitted
+            self._pending[request["id"]] = (future, submitted)
+        # A separate lock for the pipe: a write blocked on a full pipe must not stop the reader resolving results
+        try:
+            with self._write_lock:
+                self.process.stdin.write(json.dumps(request).encode() + b"\n")
+                self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            with self._lock:
+                self._pending.pop(request["id"], None)
+            raise StreamerError(f"grim_bundle pipe closed: {e}")
+        return future
+
+    def run(self, bundle: Dict[str, Any], send: bool = False, timeout: Optional[float] = None, **options) -> Dict[str, Any]:
+        """Stream one bundle, blocking for its result"""
+        return self.submit(bundle, send, **options).result(timeout)
+
+    def run_many(
+        self,
+        bundles: List[Dict[str, Any]],
+        send: bool = False,
+        timeout: Optional[float] = None,
+        **options
+    ) -> List[Dict[str, Any]]:
+        """Stream several bundles back to back; results in input order"""
+        futures = [self.submit(bundle, send, **options) for bundle in bundles]
+        return [future.result(timeout) for future in futures]
+
+    def stats(self) -> Dict[str, Any]:
+        """Bundle counts, throughput and latency percentiles over the recent window"""
+        latencies = sorted(self._latencies)
+        elapsed = (self._last_result or 0.0) - (self._first_submit or 0.0)
+        pick = lambda values, q: round(values[min(len(values) - 1, int(q * len(values)))], 2) if values else None
+        return {
+            "pid": self.pid,
+            "alive": self.process is not None and self.process.poll() is None and self.error is None,
+            "bundles": self._bundles,
+            "failed": self._failed,
+            "sent": self._sent,
+            "pending": len(self._pending),
+            "bundles_per_s": round(self._bundles / elapsed, 2) if elapsed > 0 else None,
+            "latency_p50_ms": pick(latencies, 0.5),
+            "latency_p99_ms": pick(latencies, 0.99)
+        }
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Let the executor finish outstanding bundles, then stop it"""
+        with self._lock:
+            self._closed = True
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+    def __enter__(self) -> "BundleStreamer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _read(self) -> None:
+        for line in self.process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if "ready" in message:
+                self.pid = message.get("pid")
+                self._ready.set()
+                continue
+            with self._lock:
+                entry = self._pending.pop(message.get("id"), None)
+            if entry is not None:
+                self._result(entry, message)
+        # Let the last of stderr arrive so the failure says why
+        self._log_thread.join(1.0)
+        self._fail(f"grim_bundle exited ({self.process.wait()}): {' | '.join(self._stderr) or 'no output'}")
+
+    def _read_stderr(self) -> None:
+        for line in self.process.stderr:
+            self._stderr.append(line.decode(errors="replace").rstrip())
+
+    def _result(self, entry: tuple, message: Dict[str, Any]) -> None:
+        future, submitted = entry
+        now = time.perf_counter()
+        latency_ms = (now - submitted) * 1000
+        self._bundles += 1
+        self._last_result = now
+        self._latencies.append(latency_ms)
+        if not message.get("ok"):
+            self._failed += 1
+        self._sent += bool(message.get("sent"))
+        metrics.count("grim_bundle", outcome="ok" if message.get("ok") else "error")
+        message["latency_ms"] = round(latency_ms, 2)
+        future.set_result(message)
+
+    def _fail(self, reason: str) -> None:
+        with self._lock:
+            if not self._closed or self._pending:
+                self.error = self.error or reason
+            pending, self._pending = self._pending, {}
+        self._ready.set()
+        for future, _ in pending.values():
+            if not future.done():
+                future.set_exception(StreamerError(reason))
+
+def stream_bundles(bundles: List[Dict[str, Any]], send: bool = False, **options) -> List[Dict[str, Any]]:
+    """Run bundles through one short-lived streamer; options go to BundleStreamer"""
+    with BundleStreamer(**options) as streamer:
+        return streamer.run_many(bundles, send)
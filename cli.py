@@ -1,32 +1,57 @@
 import typer
 from rich.console import Console
-from solana.rpc.api import Client
-from solders.pubkey import Pubkey
-from solders.signature import Signature
-import base58
-import zmq
-from utils.crypto import encrypt_message, decrypt_message, generate_key
-import asyncio
-import websockets
-import json
-import subprocess
+from pathlib import Path
+import os
+import sys
+from typing import Dict, Any, List, Optional
+from utils import metrics
+
+# Solana, ZeroMQ, websockets and crypto imports live inside the commands that use them,
+# so `--help` and scripted invocations don't pay for every dependency at start-up
 
 app = typer.Typer(add_completion=False, rich_markup_mode="rich")
 console = Console()
 
+BANNER_CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "grimnode"
+BANNER_FALLBACK = "\033[1;37mGRIMNODE\033[0m\n"
+# bundle already waits on RPC, so a cold price service gets this long to fetch SOL/USD
+BUNDLE_PRICE_WAIT = 2.0
+
 # Banner boot
-def print_banner():
+def render_banner(width: int) -> str:
+    """Render the banner with cfonts (spawns Node once) and cache it on disk for this terminal width"""
+    import subprocess
     try:
-        subprocess.run([
-            "npx", "cfonts", "GRIMNODE",
+        result = subprocess.run([
+            "npx", "--no-install", "cfonts", "GRIMNODE",
             "--gradient", "grey,white",
             "--font", "block",
             "--align", "center",
             "--space", "true",
             "--transition", "true"
-        ], check=True)
+        ], capture_output=True, check=True, timeout=10, env={**os.environ, "FORCE_COLOR": "3", "COLUMNS": str(width)})
+        banner = result.stdout.decode() or BANNER_FALLBACK
     except Exception:
-        console.print("[bold white]GRIMNODE[/bold white]")
+        # Cache the plain banner too, so a missing cfonts isn't retried on every run
+        banner = BANNER_FALLBACK
+    try:
+        BANNER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (BANNER_CACHE_DIR / f"banner-{width}.txt").write_text(banner)
+    except OSError:
+        pass
+    return banner
+
+def print_banner():
+    # Pipes and scripts get no banner at all
+    if not sys.stdout.isatty():
+        return
+    width = console.width
+    try:
+        banner = (BANNER_CACHE_DIR / f"banner-{width}.txt").read_text()
+    except OSError:
+        banner = render_banner(width)
+    sys.stdout.write(banner)
+    sys.stdout.flush()
 
 # RPC + constants
 SOLANA_RPC_ENDPOINTS = [
@@ -35,84 +60,106 @@ SOLANA_RPC_ENDPOINTS = [
     "https://rpc.ankr.com/solana"
 ]
 PUMP_FUN_PROGRAM_ADDRESS = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
-CREATE_DISCRIMINATOR = "181ec828051c0777"
 SHADOWNET_AGENT_ADDRESS = "tcp://localhost:5555"
+PUMPPORTAL_WS_URI = "wss://pumpportal.fun/api/data"
 SHADOWNET_KEY = b'\x1a\x1b\x1c\x1d\x1e\x1f\x20\x21\x22\x23\x24\x25\x26\x27\x28\x29'
 
 # Welcome handler
 @app.callback(invoke_without_command=True)
-def main(ctx: typer.Context):
-    print_banner()
+def main(
+    ctx: typer.Context,
+    no_banner: bool = typer.Option(False, "--no-banner", help="Skip the startup banner", envvar="GRIMNODE_NO_BANNER")
+):
+    metrics.configure_from_env()
+    if not no_banner:
+        print_banner()
     if ctx.invoked_subcommand is None:
         console.print("[bold magenta]Welcome to GRIMNODE. Autonomy in Chaos.[/bold magenta]")
-        console.print("[white]> Available commands: [cyan]scan[/cyan], [cyan]bundle[/cyan], [cyan]send-job[/cyan], [cyan]grimcast[/cyan], [cyan]livefeed[/cyan][/white]")
+        console.print("[white]> Available commands: [cyan]scan[/cyan], [cyan]bundle[/cyan], [cyan]send-job[/cyan], [cyan]grimcast[/cyan], [cyan]livefeed[/cyan], [cyan]backfill[/cyan], [cyan]creates[/cyan], [cyan]daemon[/cyan][/white]")
         console.print("[dim]Use '--help' after a command to explore its options.[/dim]")
         raise typer.Exit()
 
 @app.command()
 def scan(limit: int = 5):
     """Scans for new tokens on Pump.fun."""
+    from utils import daemon
+    from utils.pumpfun import scan_program
     console.print(f":mag: Scanning for new tokens on Pump.fun...")
     for endpoint in SOLANA_RPC_ENDPOINTS:
+        console.print(f"--> Trying RPC endpoint: [cyan]{endpoint}[/cyan]")
         try:
-            console.print(f"--> Trying RPC endpoint: [cyan]{endpoint}[/cyan]")
-            client = Client(endpoint)
-            program_pubkey = Pubkey.from_string(PUMP_FUN_PROGRAM_ADDRESS)
-            try:
-                signatures = client.get_signatures_for_address(program_pubkey, limit=limit)
-                console.print(f"--> Connected to Solana mainnet via {endpoint}")
-                console.print(f"--> Monitoring Pump.fun program: [cyan]{PUMP_FUN_PROGRAM_ADDRESS}[/cyan]")
-                console.print(f"--> Found {len(signatures.value)} recent transactions:")
-                found_creates = 0
-                for sig_info in signatures.value:
-                    signature = sig_info.signature
-                    console.print(f"    - Processing: [dim]{signature}[/dim]")
-                    try:
-                        tx_response = client.get_transaction(signature, max_supported_transaction_version=0)
-                        if tx_response.value and tx_response.value.transaction and tx_response.value.transaction.transaction:
-                            message = tx_response.value.transaction.transaction.message
-                            for ix in message.instructions:
-                                program_id = message.account_keys[ix.program_id_index]
-                                if str(program_id) == PUMP_FUN_PROGRAM_ADDRESS:
-                                    ix_data_hex = base58.b58decode(ix.data).hex()
-                                    if ix_data_hex.startswith(CREATE_DISCRIMINATOR):
-                                        found_creates += 1
-                                        console.print(f"      [yellow]{signature}[/yellow]")
-                                        console.print("        [bold green]Found 'create' instruction![/bold green]")
-                                        console.print("          [cyan]Token data decoding not yet implemented.[/cyan]")
-                        else:
-                            console.print(f"      [dim]No transaction data for {signature}[/dim]")
-                    except Exception as tx_error:
-                        console.print(f"      [red]Error processing transaction {signature}: {tx_error}[/red]")
-                        continue
-                if found_creates == 0:
-                    console.print("    [yellow]No 'create' instructions found in recent transactions.[/yellow]")
-                else:
-                    console.print(f"    [green]Found {found_creates} 'create' instructions![/green]")
-                return
-            except Exception as sig_error:
-                console.print(f"[red]Error fetching signatures: {sig_error}[/red]")
-                continue
-        except Exception as e:
-            console.print(f"[red]Error connecting to {endpoint}: {e}[/red]")
+            def in_process():
+                from utils import ratelimit
+                return scan_program(ratelimit.solana_client(endpoint), limit)
+            transactions = daemon.via_daemon("scan", in_process, endpoint=endpoint, limit=limit)
+        except Exception as sig_error:
+            console.print(f"[red]Error fetching signatures: {sig_error}[/red]")
             continue
+        console.print(f"--> Connected to Solana mainnet via {endpoint}")
+        console.print(f"--> Monitoring Pump.fun program: [cyan]{PUMP_FUN_PROGRAM_ADDRESS}[/cyan]")
+        console.print(f"--> Found {len(transactions)} recent transactions:")
+        found_creates = 0
+        for tx in transactions:
+            signature = tx["signature"]
+            console.print(f"    - Processing: [dim]{signature}[/dim]")
+            if tx["status"] == "error":
+                console.print(f"      [red]Error processing transaction {signature}: {tx['error']}[/red]")
+            elif tx["status"] == "missing":
+                console.print(f"      [dim]No transaction data for {signature}[/dim]")
+            for create in tx["creates"]:
+                found_creates += 1
+                console.print(f"      [yellow]{signature}[/yellow]")
+                console.print("        [bold green]Found 'create' instruction![/bold green]")
+                console.print(f"          [cyan]{create['symbol'] or '-'}[/cyan] {create['name'] or '-'}")
+                console.print(f"          Mint:    {create['mint'] or '-'}")
+                console.print(f"          Creator: {create['creator'] or '-'}")
+        if found_creates == 0:
+            console.print("    [yellow]No 'create' instructions found in recent transactions.[/yellow]")
+        else:
+            console.print(f"    [green]Found {found_creates} 'create' instructions![/green]")
+        return
     console.print("[bold red]Failed to connect to any Solana RPC endpoint. Check your internet connection.[/bold red]")
 
+def recent_fees(accounts: List[str]) -> Optional[Any]:
+    """Recent priority fees for these accounts, from the daemon's warm estimator when one is running"""
+    from utils import daemon
+    from utils.fees import FeeEstimate, shared_fee_estimator
+    endpoint = SOLANA_RPC_ENDPOINTS[0]
+
+    def in_process() -> Optional[Dict[str, Any]]:
+        estimate = shared_fee_estimator(endpoint).estimate(accounts)
+        return estimate.to_dict() if estimate is not None else None
+
+    result = daemon.via_daemon("priority_fees", in_process, endpoint=endpoint, accounts=accounts)
+    return FeeEstimate.from_dict(result) if result else None
+
 @app.command()
 def bundle(
     tokens: str = typer.Argument(..., help="Comma-separated list of token symbols (e.g. SOL,USDC,ETH)"),
     slippage: float = typer.Option(1.0, help="Slippage tolerance percentage (default: 1.0)"),
-    simulate: bool = typer.Option(False, help="Simulate the bundle instead of executing")
+    simulate: bool = typer.Option(False, help="Simulate the bundle instead of executing"),
+    landing_probability: float = typer.Option(0.75, help="Target chance of landing in the next slot, for the priority fee"),
+    priority_fees: bool = typer.Option(True, help="Price compute units from recent prioritization fees")
 ):
     """Bundle token actions and estimate costs."""
-    from bundle.executor import bundle_tokens, validate_bundle, estimate_bundle_cost, generate_bundle_summary
+    from bundle.executor import bundle_tokens, bundle_accounts, validate_bundle, estimate_bundle_cost, generate_bundle_summary
+    from utils import prices
     token_list = [t.strip() for t in tokens.split(",") if t.strip()]
     bundle_data = bundle_tokens(token_list, slippage, simulate)
     validation = validate_bundle(bundle_data)
     summary = generate_bundle_summary(bundle_data)
-    cost = estimate_bundle_cost(bundle_data)
+    fees = recent_fees(bundle_accounts(bundle_data)) if priority_fees else None
+    sol_price = prices.sol_usd(wait=BUNDLE_PRICE_WAIT)
+    cost = estimate_bundle_cost(bundle_data, fees, landing_probability, sol_price.usd if sol_price else None)
     console.print(f"[bold green]Bundle Summary:[/bold green]\n{summary}")
     console.print(f"[bold blue]Cost Estimate:[/bold blue] {cost}")
+    if sol_price is not None and sol_price.stale:
+        console.print(f"[yellow]SOL price is {sol_price.age:.0f}s old.[/yellow]")
+    for token, sim in bundle_data.get("simulation", {}).items():
+        console.print(
+            f"[magenta]Simulated {token}:[/magenta] {sim['sol_in']:.4f} SOL -> {sim['tokens_out']:,.0f} tokens, "
+            f"price {sim['start_price_sol']:.4e} -> {sim['end_price_sol']:.4e} SOL (+{sim['price_move_pct']}%)"
+        )
     if not validation["valid"]:
         console.print(f"[red]Bundle validation failed: {validation['errors']}[/red]")
     elif validation["warnings"]:
@@ -123,22 +170,68 @@ def bundle(
 @app.command()
 def send_job(job_data: str):
     """Sends an encrypted job to the ShadowNet."""
+    from utils import daemon
+    from utils.crypto import encrypt_message, decrypt_message
     console.print(f":satellite: Sending encrypted job to ShadowNet...")
-    context = zmq.Context()
-    socket = context.socket(zmq.REQ)
-    socket.connect(SHADOWNET_AGENT_ADDRESS)
+
+    def in_process() -> str:
+        import zmq
+        context = zmq.Context()
+        socket = context.socket(zmq.REQ)
+        socket.connect(SHADOWNET_AGENT_ADDRESS)
+        try:
+            with metrics.track("shadownet", "send_job"):
+                socket.send(encrypted_job)
+                console.print("--> Job sent. Waiting for acknowledgment...")
+                return socket.recv().hex()
+        finally:
+            socket.close()
+            context.term()
+
     try:
         encrypted_job = encrypt_message(job_data, SHADOWNET_KEY)
-        socket.send(encrypted_job)
-        console.print("--> Job sent. Waiting for acknowledgment...")
-        encrypted_ack = socket.recv()
+        # The daemon only relays ciphertext over its kept-open agent socket
+        encrypted_ack = bytes.fromhex(daemon.via_daemon(
+            "send_job", in_process, address=SHADOWNET_AGENT_ADDRESS, ciphertext=encrypted_job.hex()
+        ))
         ack_message = decrypt_message(encrypted_ack, SHADOWNET_KEY)
         console.print(f"--> Received acknowledgment: [green]{ack_message}[/green]")
     except Exception as e:
         console.print(f"[bold red]Error sending job: {e}[/bold red]")
-    finally:
-        socket.close()
-        context.term()
+
+@app.command()
+def prove(
+    preimages: List[str] = typer.Argument(..., help="Secret preimages to prove knowledge of"),
+    workers: int = typer.Option(2, help="Node proof workers to run when no daemon is available"),
+    output: Optional[Path] = typer.Option(None, help="Write proofs and public signals to this JSON file")
+):
+    """Generate zk-SNARK preimage proofs on persistent Node workers (the daemon's, when running)."""
+    import json
+    from utils import daemon
+    from utils.zk_prover import PROOF_TIMEOUT, START_TIMEOUT, ProverError, ProverPool
+
+    def in_process():
+        with ProverPool(workers=workers) as pool:
+            return {"proofs": pool.prove_many(preimages), "stats": pool.stats()}
+
+    console.print(f":lock: Proving {len(preimages)} preimage(s)...")
+    try:
+        # A cold daemon pool loads its circuit before the first proof starts
+        timeout = START_TIMEOUT + PROOF_TIMEOUT * len(preimages)
+        result = daemon.via_daemon("prove", in_process, call_timeout=timeout, preimages=preimages, workers=workers)
+    except (ProverError, daemon.DaemonError, OSError) as e:
+        console.print(f"[red]Proof generation failed: {e}[/red]")
+        raise typer.Exit(1)
+    for i, proof in enumerate(result["proofs"]):
+        console.print(f"--> proof {i}: [green]{proof['latency_ms']:.1f} ms[/green] "
+                      f"(witness {proof['witness_ms']} ms, prove {proof['prove_ms']} ms, worker {proof['worker']})")
+    stats = result["stats"]
+    console.print(f"[bold green]{stats['proofs']} proofs[/bold green], {stats['proofs_per_s']} proofs/s, "
+                  f"latency p50 {stats['latency_p50_ms']} ms / p99 {stats['latency_p99_ms']} ms, "
+                  f"worker load {[w['load_ms'] for w in stats['workers']]} ms")
+    if output:
+        output.write_text(json.dumps([{"proof": p["proof"], "publicSignals": p["publicSignals"]} for p in result["proofs"]], indent=2))
+        console.print(f"Proofs written to [cyan]{output}[/cyan]")
 
 @app.command()
 def grimcast(message: str = typer.Argument(..., help="The message to post to Twitter/X")):
@@ -160,16 +253,146 @@ def grimcast(message: str = typer.Argument(..., help="The message to post to Twi
     except Exception as e:
         console.print(f"[red]Error posting to Twitter/X: {e}[/red]")
 
+def parse_time(value: Optional[str]) -> Optional[int]:
+    """Unix seconds from a timestamp, an ISO date/time, or an age such as 30m, 24h or 7d"""
+    if not value:
+        return None
+    import time
+    from datetime import datetime
+    units = {"m": 60, "h": 3600, "d": 86400}
+    if value[-1] in units and value[:-1].isdigit():
+        return int(time.time()) - int(value[:-1]) * units[value[-1]]
+    if value.isdigit():
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except ValueError:
+        raise typer.BadParameter(f"{value!r} is not a unix time, ISO date or age like 24h/7d")
+
 @app.command()
-def livefeed():
+def backfill(
+    since: Optional[str] = typer.Option(None, help="Stop at this age or time, e.g. 24h, 7d or 2026-01-31"),
+    max_signatures: Optional[int] = typer.Option(None, help="Stop after this many signatures in this run"),
+    concurrency: int = typer.Option(8, help="getTransaction calls in flight per endpoint"),
+    endpoint: Optional[List[str]] = typer.Option(None, help="RPC endpoint to use (repeatable; default: all configured)"),
+    db: Optional[Path] = typer.Option(None, help="Create store path (default ~/.cache/grimnode/creates.db)")
+):
+    """Backfill Pump.fun create events into the local store, resuming from the last checkpoint."""
+    from datetime import datetime
+    from utils.backfill import run_backfill
+    from utils.create_store import CreateStore
+    since_time = parse_time(since)
+    endpoints = endpoint or SOLANA_RPC_ENDPOINTS
+
+    def progress(stats):
+        oldest = datetime.fromtimestamp(stats["oldest_time"]).strftime("%Y-%m-%d %H:%M:%S") if stats["oldest_time"] else "-"
+        console.print(f"--> page {stats['pages']}: {stats['signatures']} signatures, "
+                      f"[green]{stats['creates']} creates[/green], {stats['failed']} failed, back to {oldest}")
+
+    with CreateStore(db) as store:
+        console.print(f":hourglass: Backfilling into [cyan]{store.path}[/cyan] from {len(endpoints)} endpoint(s)...")
+        try:
+            stats = run_backfill(endpoints, store, since_time, max_signatures, concurrency, progress)
+        except KeyboardInterrupt:
+            console.print("[yellow]Interrupted; the next run resumes from the last committed page.[/yellow]")
+            return
+        except Exception as e:
+            console.print(f"[red]Backfill stopped: {e}[/red]")
+            raise typer.Exit(1)
+        totals = store.stats()
+    console.print(f"[bold green]Done in {stats['elapsed_s']}s:[/bold green] {stats['signatures']} signatures, "
+                  f"{stats['creates']} creates ({stats['retried']} earlier failures recovered)")
+    console.print(f"Store: {totals['creates']} creates by {totals['creators']} creators, {totals['failures']} unfetched signatures")
+
+@app.command()
+def creates(
+    since: Optional[str] = typer.Option(None, help="Earliest time or age, e.g. 24h or 2026-01-31"),
+    until: Optional[str] = typer.Option(None, help="Latest time or age"),
+    creator: Optional[str] = typer.Option(None, help="Only creates by this wallet"),
+    mint: Optional[str] = typer.Option(None, help="Only this mint"),
+    limit: int = typer.Option(50, help="Maximum rows"),
+    db: Optional[Path] = typer.Option(None, help="Create store path (default ~/.cache/grimnode/creates.db)")
+):
+    """Query backfilled create events locally."""
+    from datetime import datetime
+    from rich.table import Table
+    from utils.create_store import CreateStore
+    with CreateStore(db) as store:
+        rows = store.query(parse_time(since), parse_time(until), creator, mint, limit)
+    if not rows:
+        console.print("[yellow]No matching creates in the local store; run `backfill` first.[/yellow]")
+        return
+    table = Table(title=f"Pump.fun creates ({len(rows)})")
+    for column in ("Time", "Symbol", "Name", "Mint", "Creator"):
+        table.add_column(column)
+    for row in rows:
+        when = datetime.fromtimestamp(row["block_time"]).strftime("%Y-%m-%d %H:%M:%S") if row["block_time"] else "-"
+        table.add_row(when, row["symbol"] or "-", row["name"] or "-", row["mint"] or "-", row["creator"] or "-")
+    console.print(table)
+
+@app.command()
+def livefeed(rules_path: Optional[str] = typer.Option(None, "--rules", help="TOML/JSON rules file; only matching events are shown")):
     """Subscribe to real-time Pump.fun events via WebSocket."""
+    from utils import daemon
+    rules = None
+    if rules_path:
+        from utils.rules import RuleError, load_rules
+        try:
+            rules = load_rules(rules_path)
+        except RuleError as e:
+            console.print(f"[red]Invalid rules file: {e}[/red]")
+            raise typer.Exit(1)
+
+    def handle(event):
+        if rules is None or rules.process(event):
+            console.print(event)
+
+    try:
+        # Share the daemon's upstream connection when one is running
+        for event in daemon.stream("livefeed", uri=PUMPPORTAL_WS_URI, subscriptions=[]):
+            handle(event)
+        return
+    except daemon.DaemonUnavailable:
+        pass
+
+    import asyncio
+    import websockets
+    from utils import models
+
     async def subscribe():
-        uri = "wss://pumpportal.fun/api/data"
+        uri = PUMPPORTAL_WS_URI
         async with websockets.connect(uri) as websocket:
             async for message in websocket:
-                event = json.loads(message)
-                console.print(event)
+                event = models.loads(message)
+                metrics.count("ws_messages", feed="pumpportal", method=event.get("method", "unknown"))
+                handle(event)
     asyncio.run(subscribe())
 
+@app.command("daemon")
+def daemon_command(action: str = typer.Argument("start", help="start (runs in the foreground), status or stop")):
+    """Run the GrimNode daemon that keeps connections and caches warm for other commands."""
+    from utils import daemon
+    if action == "start":
+        console.print(f"[bold blue]GrimNode daemon listening on {daemon.socket_path()}[/bold blue]")
+        try:
+            daemon.GrimDaemon().run()
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            console.print(f"[red]Error running daemon: {e}[/red]")
+        return
+    if action not in ("status", "stop"):
+        console.print(f"[red]Unknown action {action!r}; use start, status or stop.[/red]")
+        raise typer.Exit(1)
+    try:
+        result = daemon.call("ping" if action == "status" else "stop", timeout=5)
+    except daemon.DaemonUnavailable:
+        console.print(f"[yellow]No daemon running on {daemon.socket_path()}[/yellow]")
+        raise typer.Exit(1)
+    if action == "status":
+        console.print(result)
+    else:
+        console.print("[green]Daemon stopped.[/green]")
+
 if __name__ == "__main__":
     app()
@@ -1,11 +1,19 @@
-use solana_sdk::{transaction::Transaction, instruction::Instruction, message::Message, signature::Signer, signer::keypair::Keypair, hash::Hash, pubkey::Pubkey, system_instruction};
-use solana_client::rpc_client::RpcClient;
+use solana_sdk::{transaction::{Transaction, TransactionError}, instruction::Instruction, message::Message, signature::{Signature, Signer}, signer::keypair::Keypair, hash::Hash, pubkey::Pubkey, system_instruction};
+use solana_client::{client_error::Result as ClientResult, rpc_client::RpcClient};
+use base64::{engine::general_purpose::STANDARD as BASE64, Engine};
 use std::env;
 use std::fs;
+use std::io::{self, BufRead, Write};
+use std::time::{Duration, Instant};
 use serde::{Deserialize};
+use serde_json::{json, Value};
 use bs58;
 use std::str::FromStr;
 
+const DEFAULT_RPC: &str = "https://api.devnet.solana.com";
+// A blockhash is valid for ~60s; past this age the stream fetches a new one before sending
+const DEFAULT_BLOCKHASH_MAX_AGE: u64 = 30;
+
 #[derive(Deserialize)]
 struct BundleInput {
     wallets: Vec<String>, // base58-encoded keypairs
@@ -19,53 +27,255 @@ struct TransferInstruction {
     lamports: u64,
 }
 
-fn bundle_trades(wallets: &Vec<Keypair>, instructions: Vec<Instruction>) -> Transaction {
+// One line of --stream input: a bundle plus how to handle it ("id" is echoed back untouched)
+#[derive(Deserialize)]
+struct StreamRequest {
+    #[serde(flatten)]
+    bundle: BundleInput,
+    #[serde(default)]
+    send: bool,
+    #[serde(default)]
+    confirm: bool,
+    blockhash: Option<String>,
+}
+
+fn bundle_trades(wallets: &[Keypair], instructions: Vec<Instruction>) -> Transaction {
     let payer = &wallets[0];
     let message = Message::new(&instructions, Some(&payer.pubkey()));
-    Transaction::new(&[payer], message, Hash::new_unique())
+    // Signed once a blockhash is known, by exactly the wallets the message needs
+    Transaction::new_unsigned(message)
+}
+
+fn parse_keypair(base58_str: &str) -> Result<Keypair, String> {
+    let bytes = bs58::decode(base58_str).into_vec().map_err(|_| "Invalid base58".to_string())?;
+    Keypair::from_bytes(&bytes).map_err(|_| "Invalid keypair bytes".to_string())
+}
+
+// Transfers for the valid instructions, and a note for each one skipped
+fn parse_instructions(keypairs: &[Keypair], transfers: &[TransferInstruction]) -> (Vec<Instruction>, Vec<String>) {
+    let mut instructions: Vec<Instruction> = Vec::new();
+    let mut skipped: Vec<String> = Vec::new();
+    for (i, ti) in transfers.iter().enumerate() {
+        if ti.from >= keypairs.len() {
+            skipped.push(format!("instruction {} refers to invalid wallet index {}", i, ti.from));
+            continue;
+        }
+        match Pubkey::from_str(&ti.to_pubkey) {
+            Ok(to_pubkey) => instructions.push(system_instruction::transfer(&keypairs[ti.from].pubkey(), &to_pubkey, ti.lamports)),
+            Err(_) => skipped.push(format!("instruction {} has invalid to_pubkey {}", i, ti.to_pubkey)),
+        }
+    }
+    (instructions, skipped)
+}
+
+// Sign with the wallets the message requires (the payer and each transfer source), not every wallet given
+fn sign_bundle(tx: &mut Transaction, keypairs: &[Keypair], blockhash: Hash) -> Result<(), String> {
+    let mut signers: Vec<&Keypair> = Vec::new();
+    for key in tx.message.signer_keys() {
+        match keypairs.iter().find(|k| k.pubkey() == *key) {
+            Some(keypair) => signers.push(keypair),
+            None => return Err(format!("No wallet for required signer {}", key)),
+        }
+    }
+    tx.try_sign(&signers, blockhash).map_err(|e| e.to_string())
+}
+
+fn encode_transaction(tx: &Transaction) -> Result<String, String> {
+    bincode::serialize(tx).map(|bytes| BASE64.encode(bytes)).map_err(|e| e.to_string())
+}
+
+fn is_blockhash_expired(error: &solana_client::client_error::ClientError) -> bool {
+    matches!(error.get_transaction_error(), Some(TransactionError::BlockhashNotFound))
+}
+
+// Long-lived state for --stream: one RPC client and one blockhash shared by every bundle
+struct Executor {
+    rpc_url: String,
+    client: Option<RpcClient>,
+    blockhash: Option<(Hash, Instant)>,
+    max_age: Duration,
+}
+
+impl Executor {
+    fn client(&mut self) -> &RpcClient {
+        let url = &self.rpc_url;
+        self.client.get_or_insert_with(|| RpcClient::new(url.clone()))
+    }
+
+    fn cached_blockhash(&self) -> Option<Hash> {
+        match self.blockhash {
+            Some((hash, fetched)) if fetched.elapsed() < self.max_age => Some(hash),
+            _ => None,
+        }
+    }
+
+    fn blockhash(&mut self, refresh: bool) -> Result<Hash, String> {
+        if !refresh {
+            if let Some(hash) = self.cached_blockhash() {
+                return Ok(hash);
+            }
+        }
+        let hash = self.client().get_latest_blockhash().map_err(|e| format!("Failed to get blockhash: {}", e))?;
+        self.blockhash = Some((hash, Instant::now()));
+        Ok(hash)
+    }
+
+    fn submit(&mut self, tx: &Transaction, confirm: bool) -> ClientResult<Signature> {
+        let client = self.client();
+        if confirm {
+            client.send_and_confirm_transaction(tx)
+        } else {
+            client.send_transaction(tx)
+        }
+    }
+
+    fn send(&mut self, tx: &mut Transaction, keypairs: &[Keypair], cached: bool, confirm: bool) -> Result<Signature, String> {
+        match self.submit(tx, confirm) {
+            Err(e) if cached && is_blockhash_expired(&e) => {
+                // The shared blockhash expired between refreshes: fetch a new one and retry once
+                let blockhash = self.blockhash(true)?;
+                sign_bundle(tx, keypairs, blockhash)?;
+                self.submit(tx, confirm).map_err(|e| e.to_string())
+            }
+            result => result.map_err(|e| e.to_string()),
+        }
+    }
+
+    // One result line for one request line; never panics on bad input
+    fn process(&mut self, line: &str) -> Value {
+        let started = Instant::now();
+        let (id, outcome) = match serde_json::from_str::<Value>(line) {
+            Ok(value) => (value.get("id").cloned().unwrap_or(Value::Null), self.execute(value)),
+            Err(e) => (Value::Null, Err(format!("Invalid JSON: {}", e))),
+        };
+        let mut result = outcome.unwrap_or_else(|error| json!({"ok": false, "sent": false, "error": error}));
+        result["id"] = id;
+        result["elapsed_ms"] = json!(started.elapsed().as_secs_f64() * 1000.0);
+        result
+    }
+
+    fn execute(&mut self, value: Value) -> Result<Value, String> {
+        let request: StreamRequest = serde_json::from_value(value).map_err(|e| format!("Invalid bundle: {}", e))?;
+        if request.bundle.wallets.is_empty() {
+            return Err("Bundle has no wallets".to_string());
+        }
+        let keypairs = request.bundle.wallets.iter().enumerate()
+            .map(|(i, s)| parse_keypair(s).map_err(|e| format!("wallet {}: {}", i, e)))
+            .collect::<Result<Vec<Keypair>, String>>()?;
+        let (instructions, skipped) = parse_instructions(&keypairs, &request.bundle.instructions);
+        let mut tx = bundle_trades(&keypairs, instructions);
+        let mut result = json!({
+            "ok": true,
+            "message_hash": tx.message.hash().to_string(),
+            "signers": tx.signatures.len(),
+            "instructions": tx.message.instructions.len(),
+            "skipped": skipped,
+            "sent": false,
+        });
+
+        // The request's own blockhash wins; otherwise the shared one, fetched only when sending
+        let cached = request.blockhash.is_none();
+        let blockhash = match &request.blockhash {
+            Some(hash) => Some(Hash::from_str(hash).map_err(|_| format!("Invalid blockhash {}", hash))?),
+            None if request.send => Some(self.blockhash(false)?),
+            None => self.cached_blockhash(),
+        };
+        let blockhash = match blockhash {
+            Some(hash) => hash,
+            None => return Ok(result),
+        };
+        if let Err(error) = sign_bundle(&mut tx, &keypairs, blockhash) {
+            result["ok"] = json!(false);
+            result["error"] = json!(error);
+            return Ok(result);
+        }
+        if request.send {
+            match self.send(&mut tx, &keypairs, cached, request.confirm) {
+                Ok(_) => result["sent"] = json!(true),
+                Err(error) => {
+                    result["ok"] = json!(false);
+                    result["error"] = json!(error);
+                }
+            }
+        } else {
+            result["transaction"] = json!(encode_transaction(&tx)?);
+        }
+        result["signature"] = json!(tx.signatures[0].to_string());
+        result["blockhash"] = json!(tx.message.recent_blockhash.to_string());
+        Ok(result)
+    }
 }
 
-fn parse_keypair(base58_str: &str) -> Keypair {
-    let bytes = bs58::decode(base58_str).into_vec().expect("Invalid base58");
-    Keypair::from_bytes(&bytes).expect("Invalid keypair bytes")
+fn emit(out: &mut impl Write, message: &Value) {
+    // One line per result, flushed at once so the driver never waits on a buffer
+    if writeln!(out, "{}", message).and_then(|_| out.flush()).is_err() {
+        // The driver has gone away
+        std::process::exit(0);
+    }
+}
+
+// NDJSON bundles on stdin, one result line per bundle on stdout, in input order
+fn run_stream(rpc_url: String, seed_blockhash: Option<Hash>, max_age: Duration) {
+    let mut executor = Executor {
+        rpc_url,
+        client: None,
+        blockhash: seed_blockhash.map(|hash| (hash, Instant::now())),
+        max_age,
+    };
+    let stdin = io::stdin();
+    let stdout = io::stdout();
+    let mut out = stdout.lock();
+    emit(&mut out, &json!({"ready": true, "pid": std::process::id()}));
+    for line in stdin.lock().lines() {
+        let line = match line {
+            Ok(line) => line,
+            Err(e) => {
+                eprintln!("Failed to read stdin: {}", e);
+                break;
+            }
+        };
+        if line.trim().is_empty() {
+            continue;
+        }
+        let result = executor.process(&line);
+        emit(&mut out, &result);
+    }
 }
 
 fn main() {
     let args: Vec<String> = env::args().collect();
     if args.len() < 2 {
-        println!("Usage: grim_bundle <input_json> [--send] [--rpc <url>]");
+        println!("Usage: grim_bundle <input_json> [--send] [--rpc <url>] [--blockhash <hash>]");
+        println!("       grim_bundle --stream [--rpc <url>] [--blockhash <hash>] [--blockhash-max-age <secs>]");
         return;
     }
-    let input_path = &args[1];
     let send = args.contains(&"--send".to_string());
-    let rpc_url = args.iter().position(|x| x == "--rpc").and_then(|i| args.get(i+1)).cloned().unwrap_or_else(|| "https://api.devnet.solana.com".to_string());
+    let rpc_url = args.iter().position(|x| x == "--rpc").and_then(|i| args.get(i+1)).cloned().unwrap_or_else(|| DEFAULT_RPC.to_string());
+    // A prefetched blockhash (e.g. from the Python BlockhashCache) saves a round-trip before sending
+    let cached_blockhash = args.iter().position(|x| x == "--blockhash").and_then(|i| args.get(i+1)).map(|s| Hash::from_str(s).expect("Invalid blockhash"));
+
+    if args.contains(&"--stream".to_string()) {
+        let max_age = args.iter().position(|x| x == "--blockhash-max-age").and_then(|i| args.get(i+1))
+            .map(|s| s.parse::<u64>().expect("Invalid --blockhash-max-age"))
+            .unwrap_or(DEFAULT_BLOCKHASH_MAX_AGE);
+        run_stream(rpc_url, cached_blockhash, Duration::from_secs(max_age));
+        return;
+    }
 
+    let input_path = &args[1];
     let input_data = fs::read_to_string(input_path).expect("Failed to read input file");
     let bundle_input: BundleInput = serde_json::from_str(&input_data).expect("Invalid JSON");
     println!("Loaded wallets: {}", bundle_input.wallets.len());
     println!("Loaded instructions: {}", bundle_input.instructions.len());
 
     // Parse keypairs
-    let keypairs: Vec<Keypair> = bundle_input.wallets.iter().map(|s| parse_keypair(s)).collect();
+    let keypairs: Vec<Keypair> = bundle_input.wallets.iter().map(|s| parse_keypair(s).unwrap_or_else(|e| panic!("{}", e))).collect();
     println!("Parsed {} keypairs.", keypairs.len());
 
     // Parse transfer instructions
-    let mut instructions: Vec<Instruction> = Vec::new();
-    for (i, ti) in bundle_input.instructions.iter().enumerate() {
-        if ti.from >= keypairs.len() {
-            println!("Error: instruction {} refers to invalid wallet index {}", i, ti.from);
-            continue;
-        }
-        let from_pubkey = keypairs[ti.from].pubkey();
-        let to_pubkey = match Pubkey::from_str(&ti.to_pubkey) {
-            Ok(pk) => pk,
-            Err(_) => {
-                println!("Error: instruction {} has invalid to_pubkey {}", i, ti.to_pubkey);
-                continue;
-            }
-        };
-        let ix = system_instruction::transfer(&from_pubkey, &to_pubkey, ti.lamports);
-        instructions.push(ix);
+    let (instructions, skipped) = parse_instructions(&keypairs, &bundle_input.instructions);
+    for note in &skipped {
+        println!("Error: {}", note);
     }
 
     let mut tx = bundle_trades(&keypairs, instructions);
@@ -75,10 +285,11 @@ fn main() {
     if send {
         println!("Sending transaction to {}...", rpc_url);
         let client = RpcClient::new(rpc_url);
-        let recent_blockhash = client.get_latest_blockhash().expect("Failed to get blockhash");
-        // Prepare a vector of references
-        let keypair_refs: Vec<&Keypair> = keypairs.iter().collect();
-        tx.sign(&keypair_refs, recent_blockhash);
+        let recent_blockhash = match cached_blockhash {
+            Some(hash) => hash,
+            None => client.get_latest_blockhash().expect("Failed to get blockhash"),
+        };
+        sign_bundle(&mut tx, &keypairs, recent_blockhash).expect("Failed to sign transaction");
         match client.send_and_confirm_transaction(&tx) {
             Ok(sig) => println!("Transaction sent! Signature: {}", sig),
             Err(e) => println!("Error sending transaction: {}", e),
@@ -86,4 +297,4 @@ fn main() {
     } else {
         println!("Not sending transaction. Use --send to broadcast.");
     }
-}
\ No newline at end of file
+}
@@ -2,39 +2,12 @@ import { program } from "commander";
 const snarkjs = require("snarkjs");
 import { createHash } from "crypto";
 import fs from "fs";
+import { bufferToFieldElements, stringToBits } from "./proof-input";
 
 program
   .name("GrimBundle CLI")
   .description("CLI for GrimBundle zk-SNARK operations");
 
-// Helper: Convert string to 256-bit array
-function stringToBits(str: string, length: number): number[] {
-  const bits: number[] = [];
-  for (let i = 0; i < str.length && bits.length < length; i++) {
-    const charCode = str.charCodeAt(i);
-    for (let j = 7; j >= 0 && bits.length < length; j--) {
-      bits.push((charCode >> j) & 1);
-    }
-  }
-  while (bits.length < length) bits.push(0);
-  return bits.slice(0, length);
-}
-
-// Helper: Convert Buffer to 8 field elements (32 bytes total)
-function bufferToFieldElements(buffer: Buffer): number[] {
-  const elements: number[] = [];
-  // SHA-256 produces 32 bytes, we need 8 field elements of 4 bytes each
-  for (let i = 0; i < 8; i++) {
-    const start = i * 4;
-    const end = start + 4;
-    const bytes = buffer.slice(start, end);
-    // Convert 4 bytes to a 32-bit integer
-    const element = bytes.readUInt32BE(0);
-    elements.push(element);
-  }
-  return elements;
-}
-
 program
   .command("generate-proof")
   .description("Generate a zk-SNARK proof for knowledge of preimage")
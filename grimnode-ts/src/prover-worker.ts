@@ -0,0 +1,90 @@
+/// <reference path="./snarkjs.d.ts" />
+// Long-lived Groth16 proof worker, driven from Python by utils/zk_prover.py.
+//
+// The circuit wasm (compiled once into a witness calculator), the zkey and the
+// bn128 curve are loaded at startup and kept for the life of the process, so a
+// proof costs only witness generation and proving. Requests arrive as JSON lines
+// on stdin, {"batch": [{"id", "preimage"} | {"id", "input"}, ...]}; each proof is
+// answered as soon as it is done with {"id", "proof", "publicSignals",
+// "witness_ms", "prove_ms"} or {"id", "error"} on stdout. The first line out is
+// {"ready": true, "pid", "load_ms"}.
+import * as fs from "fs";
+import * as path from "path";
+import * as readline from "readline";
+import { preimageInput } from "./proof-input";
+const snarkjs = require("snarkjs");
+
+interface ProofRequest {
+  id: number | string;
+  preimage?: string;
+  input?: Record<string, unknown>;
+}
+
+function option(name: string, fallback: string): string {
+  const i = process.argv.indexOf(`--${name}`);
+  return i >= 0 && i + 1 < process.argv.length ? process.argv[i + 1] : fallback;
+}
+
+const wasmPath = option("wasm", "src/circuits/preimage_js/preimage.wasm");
+const zkeyPath = option("zkey", "preimage_0000.zkey");
+
+// stdout carries the protocol; the circuit's log() output and anything else go to stderr
+console.log = (...args: unknown[]) => console.error(...args);
+
+function send(message: object): void {
+  process.stdout.write(JSON.stringify(message) + "\n");
+}
+
+async function main(): Promise<void> {
+  const started = Date.now();
+  const builder = require(path.resolve(path.dirname(wasmPath), "witness_calculator.js"));
+  const witnessCalculator = await builder(fs.readFileSync(wasmPath));
+  const zkey = new Uint8Array(fs.readFileSync(zkeyPath));
+  // Builds the curve and its thread pool once; snarkjs reuses it for every proof
+  await snarkjs.curves.getCurveFromName("bn128");
+  send({ ready: true, pid: process.pid, load_ms: Date.now() - started });
+
+  async function prove(request: ProofRequest): Promise<void> {
+    try {
+      const input = request.input ?? preimageInput(request.preimage ?? "");
+      const witnessStarted = Date.now();
+      const witness = await witnessCalculator.calculateWTNSBin(input, 0);
+      const proveStarted = Date.now();
+      const { proof, publicSignals } = await snarkjs.groth16.prove(zkey, witness);
+      send({
+        id: request.id,
+        proof,
+        publicSignals,
+        witness_ms: proveStarted - witnessStarted,
+        prove_ms: Date.now() - proveStarted
+      });
+    } catch (error) {
+      send({ id: request.id, error: String(error instanceof Error ? error.message : error) });
+    }
+  }
+
+  // One proof at a time: snarkjs already spreads each proof over the curve's thread pool
+  let queue: Promise<void> = Promise.resolve();
+  const lines = readline.createInterface({ input: process.stdin });
+  lines.on("line", (line: string) => {
+    if (!line.trim()) return;
+    let batch: ProofRequest[];
+    try {
+      batch = JSON.parse(line).batch ?? [];
+    } catch (error) {
+      console.error(`Ignoring malformed request: ${line}`);
+      return;
+    }
+    for (const request of batch) {
+      queue = queue.then(() => prove(request));
+    }
+  });
+  lines.on("close", () => {
+    queue.then(() => process.exit(0));
+  });
+}
+
+main().catch((error) => {
+  send({ ready: false, error: String(error instanceof Error ? error.message : error) });
+  process.exit(1);
+});
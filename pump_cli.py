@@ -11,6 +11,10 @@ import time
 import asyncio
 import websockets
 
+from utils import daemon, metrics, models, prices, ratelimit
+from utils.models import LiveEvent, Token, Trade
+from utils.prices import PricePoint
+
 app = typer.Typer()
 console = Console()
 
@@ -20,75 +24,92 @@ PUMPPORTAL_TRENDING_API = f"{PUMPPORTAL_API_BASE}/tokens/trending"
 PUMPPORTAL_NEW_API = f"{PUMPPORTAL_API_BASE}/tokens/new"
 PUMPPORTAL_TOKEN_API = f"{PUMPPORTAL_API_BASE}/token"
 PUMPPORTAL_TRADES_API = f"{PUMPPORTAL_API_BASE}/trades"
+PUMPPORTAL_WS_URI = "wss://pumpportal.fun/api/data"
 
 class PumpPortalScanner:
     def __init__(self):
-        self.session = requests.Session()
+        # Shares per-host pacing and 429 back-off with every other client in the process
+        self.session = ratelimit.limited_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'application/json',
             'Content-Type': 'application/json'
         })
     
-    def get_new_tokens(self, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_new_tokens(self, limit: int = 50) -> List[Token]:
         """Fetch new tokens from PumpPortal."""
         try:
             url = f"{PUMPPORTAL_NEW_API}?limit={limit}"
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('tokens', [])
+            with metrics.track("pumpportal", "get_new_tokens"):
+                response = self.session.get(url, timeout=15)
+                response.raise_for_status()
+            return models.decode_tokens(response.content)
         except Exception as e:
             console.print(f"[red]Error fetching new tokens: {e}[/red]")
             return []
     
-    def get_trending_tokens(self, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_trending_tokens(self, limit: int = 50) -> List[Token]:
         """Fetch trending tokens from PumpPortal."""
         try:
             url = f"{PUMPPORTAL_TRENDING_API}?limit={limit}"
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('tokens', [])
+            with metrics.track("pumpportal", "get_trending_tokens"):
+                response = self.session.get(url, timeout=15)
+                response.raise_for_status()
+            return models.decode_tokens(response.content)
         except Exception as e:
             console.print(f"[red]Error fetching trending tokens: {e}[/red]")
             return []
     
-    def get_token_by_address(self, mint_address: str) -> Optional[Dict[str, Any]]:
+    def get_token_by_address(self, mint_address: str) -> Optional[Token]:
         """Get token details by mint address."""
         try:
             url = f"{PUMPPORTAL_TOKEN_API}/{mint_address}"
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            return response.json().get('token', {})
+            with metrics.track("pumpportal", "get_token"):
+                response = self.session.get(url, timeout=15)
+                response.raise_for_status()
+            return models.decode_token(response.content)
         except Exception as e:
             console.print(f"[red]Error fetching token {mint_address}: {e}[/red]")
             return None
     
-    def search_tokens(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+    def search_tokens(self, query: str, limit: int = 20) -> List[Token]:
         """Search tokens by name or symbol."""
         try:
             url = f"{PUMPPORTAL_TRENDING_API}?q={query}&limit={limit}"
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('tokens', [])
+            with metrics.track("pumpportal", "search_tokens"):
+                response = self.session.get(url, timeout=15)
+                response.raise_for_status()
+            return models.decode_tokens(response.content)
         except Exception as e:
             console.print(f"[red]Error searching tokens: {e}[/red]")
             return []
     
-    def get_token_trades(self, mint_address: str, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_token_trades(self, mint_address: str, limit: int = 50) -> List[Trade]:
         """Get recent trades for a token."""
         try:
             url = f"{PUMPPORTAL_TRADES_API}/{mint_address}?limit={limit}"
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('trades', [])
+            with metrics.track("pumpportal", "get_token_trades"):
+                response = self.session.get(url, timeout=15)
+                response.raise_for_status()
+            return models.decode_trades(response.content)
         except Exception as e:
             console.print(f"[red]Error fetching trades for {mint_address}: {e}[/red]")
             return []
 
+# Model each scanner method returns, for reviving a daemon's JSON reply
+SCANNER_MODELS = {
+    "get_new_tokens": Token,
+    "get_trending_tokens": Token,
+    "get_token_by_address": Token,
+    "search_tokens": Token,
+    "get_token_trades": Trade
+}
+
+def scanner_call(scanner: PumpPortalScanner, method: str, *args: Any) -> Any:
+    """Run a scanner method on the GrimNode daemon when one is running, otherwise on this scanner."""
+    result = daemon.via_daemon(f"pumpportal.{method}", lambda: getattr(scanner, method)(*args), args=list(args))
+    return models.revive(result, SCANNER_MODELS[method])
+
 def format_number(num: float) -> str:
     """Format large numbers with appropriate suffixes."""
     if num >= 1_000_000_000:
@@ -110,6 +131,21 @@ def format_market_cap(market_cap: float) -> str:
     else:
         return f"[red]{formatted}[/red]"
 
+def format_usd(value: Optional[float]) -> str:
+    """Format a USD amount, or N/A when there is no SOL price."""
+    if value is None:
+        return "N/A"
+    if value >= 1_000:
+        return f"${format_number(value)}"
+    return f"${value:.6f}" if value < 0.01 else f"${value:.2f}"
+
+def sol_price_caption(point: Optional[PricePoint]) -> Optional[str]:
+    """Table caption with the SOL price used for USD columns and its age."""
+    if point is None:
+        return "USD prices unavailable"
+    caption = f"SOL ${point.usd:,.2f} ({point.age:.0f}s ago)"
+    return f"[yellow]{caption} - stale[/yellow]" if point.stale else caption
+
 def format_timestamp(timestamp: int) -> str:
     """Format Unix timestamp to readable date."""
     try:
@@ -118,35 +154,38 @@ def format_timestamp(timestamp: int) -> str:
     except:
         return "N/A"
 
-def display_token_table(tokens: List[Dict[str, Any]], title: str = "Tokens"):
+def display_token_table(tokens: List[Token], title: str = "Tokens"):
     """Display tokens in a formatted table."""
     if not tokens:
         console.print("[yellow]No tokens found.[/yellow]")
         return
     
-    table = Table(title=title, show_header=True, header_style="bold magenta")
+    sol = prices.sol_usd()
+    table = Table(title=title, show_header=True, header_style="bold magenta", caption=sol_price_caption(sol))
     table.add_column("Name", style="cyan", no_wrap=True, min_width=15)
     table.add_column("Symbol", style="green", no_wrap=True, min_width=8)
     table.add_column("Market Cap", justify="right", min_width=12)
     table.add_column("Price (SOL)", justify="right", min_width=12)
+    table.add_column("Price (USD)", justify="right", min_width=12)
     table.add_column("24h Volume", justify="right", min_width=12)
     table.add_column("Mint Address", style="dim", no_wrap=True, min_width=20)
     table.add_column("Created", style="dim", min_width=10)
     
     for token in tokens:
-        name = token.get('name', 'N/A')[:15]
-        symbol = token.get('symbol', 'N/A')[:8]
-        market_cap = token.get('market_cap', 0)
-        price = token.get('price', 0)
-        volume_24h = token.get('volume_24h', 0)
-        mint = token.get('mint', 'N/A')
-        created_timestamp = token.get('created_timestamp', 0)
+        name = (token.name or 'N/A')[:15]
+        symbol = (token.symbol or 'N/A')[:8]
+        market_cap = token.market_cap
+        price = token.price
+        volume_24h = token.volume_24h
+        mint = token.mint or 'N/A'
+        created_timestamp = token.created_timestamp
         
         table.add_row(
             name,
             symbol,
             format_market_cap(market_cap),
             f"{price:.8f}" if price > 0 else "0",
+            format_usd(price * sol.usd if sol and price > 0 else None),
             format_number(volume_24h) if volume_24h > 0 else "0",
             mint[:20] + "..." if len(mint) > 20 else mint,
             format_timestamp(created_timestamp)
@@ -154,21 +193,22 @@ def display_token_table(tokens: List[Dict[str, Any]], title: str = "Tokens"):
     
     console.print(table)
 
-def display_token_details(token: Dict[str, Any]):
+def display_token_details(token: Token):
     """Display detailed information about a single token."""
-    name = token.get('name', 'N/A')
-    symbol = token.get('symbol', 'N/A')
-    description = token.get('description', 'No description available')
-    mint = token.get('mint', 'N/A')
-    creator = token.get('creator', 'N/A')
-    market_cap = token.get('market_cap', 0)
-    price = token.get('price', 0)
-    volume_24h = token.get('volume_24h', 0)
-    supply = token.get('supply', 0)
-    website = token.get('website', 'N/A')
-    twitter = token.get('twitter', 'N/A')
-    telegram = token.get('telegram', 'N/A')
-    created_timestamp = token.get('created_timestamp', 0)
+    name = token.name or 'N/A'
+    symbol = token.symbol or 'N/A'
+    description = token.description or 'No description available'
+    mint = token.mint or 'N/A'
+    creator = token.creator or 'N/A'
+    market_cap = token.market_cap
+    price = token.price
+    volume_24h = token.volume_24h
+    supply = token.supply
+    website = token.website or 'N/A'
+    twitter = token.twitter or 'N/A'
+    telegram = token.telegram or 'N/A'
+    created_timestamp = token.created_timestamp
+    sol = prices.sol_usd()
     
     # Create token info panel
     info_text = f"""
@@ -178,7 +218,7 @@ def display_token_details(token: Dict[str, Any]):
 
 [bold green]Financial Data:[/bold green]
 ├─ Market Cap: {format_market_cap(market_cap)}
-├─ Price: {price:.8f} SOL
+├─ Price: {price:.8f} SOL ({format_usd(price * sol.usd if sol else None)})
 ├─ 24h Volume: {format_number(volume_24h)}
 └─ Supply: {format_number(supply)}
 
@@ -205,7 +245,7 @@ def scan(limit: int = 20, trending: bool = False):
         console.print(f"[bold blue]:mag: Scanning for {limit} newest tokens on Pump.fun...[/bold blue]")
     
     scanner = PumpPortalScanner()
-    tokens = scanner.get_trending_tokens(limit) if trending else scanner.get_new_tokens(limit)
+    tokens = scanner_call(scanner, "get_trending_tokens" if trending else "get_new_tokens", limit)
     
     if tokens:
         display_token_table(tokens, f"{'Trending' if trending else 'Latest'} {len(tokens)} Tokens")
@@ -219,7 +259,7 @@ def token(mint_address: str):
     console.print(f"[bold blue]:mag: Fetching token details for: {mint_address}[/bold blue]")
     
     scanner = PumpPortalScanner()
-    token_data = scanner.get_token_by_address(mint_address)
+    token_data = scanner_call(scanner, "get_token_by_address", mint_address)
     
     if token_data:
         display_token_details(token_data)
@@ -232,7 +272,7 @@ def search(query: str, limit: int = 10):
     console.print(f"[bold blue]:mag: Searching for tokens matching: '{query}'[/bold blue]")
     
     scanner = PumpPortalScanner()
-    tokens = scanner.search_tokens(query, limit)
+    tokens = scanner_call(scanner, "search_tokens", query, limit)
     
     if tokens:
         display_token_table(tokens, f"Search Results for '{query}'")
@@ -245,28 +285,32 @@ def trades(mint_address: str, limit: int = 20):
     console.print(f"[bold blue]:chart_with_upwards_trend: Fetching {limit} recent trades for: {mint_address}[/bold blue]")
     
     scanner = PumpPortalScanner()
-    trades_data = scanner.get_token_trades(mint_address, limit)
+    trades_data = scanner_call(scanner, "get_token_trades", mint_address, limit)
     
     if trades_data:
-        table = Table(title=f"Recent Trades for {mint_address[:20]}...", show_header=True, header_style="bold magenta")
+        sol = prices.sol_usd()
+        table = Table(title=f"Recent Trades for {mint_address[:20]}...", show_header=True, header_style="bold magenta",
+                      caption=sol_price_caption(sol))
         table.add_column("Type", style="cyan", no_wrap=True)
         table.add_column("Amount (SOL)", justify="right")
+        table.add_column("Value (USD)", justify="right")
         table.add_column("Tokens", justify="right")
         table.add_column("Price", justify="right")
         table.add_column("Trader", style="dim", no_wrap=True)
         table.add_column("Time", style="dim")
         
         for trade in trades_data:
-            trade_type = "🟢 BUY" if trade.get('is_buy', False) else "🔴 SELL"
-            sol_amount = trade.get('sol_amount', 0)
-            token_amount = trade.get('token_amount', 0)
-            price = trade.get('price', 0)
-            trader = trade.get('trader', 'N/A')
-            timestamp = trade.get('timestamp', 0)
+            trade_type = "🟢 BUY" if trade.is_buy else "🔴 SELL"
+            sol_amount = trade.sol_amount
+            token_amount = trade.token_amount
+            price = trade.price
+            trader = trade.trader or 'N/A'
+            timestamp = trade.timestamp
             
             table.add_row(
                 trade_type,
                 f"{sol_amount:.4f}",
+                format_usd(sol_amount * sol.usd if sol else None),
                 format_number(token_amount),
                 f"{price:.8f}",
                 trader[:20] + "..." if len(trader) > 20 else trader,
@@ -277,9 +321,25 @@ def trades(mint_address: str, limit: int = 20):
     else:
         console.print(f"[red]No trades found for {mint_address}[/red]")
 
+def load_rule_set(path: Optional[str]):
+    """Compile a --rules file, exiting with the error if it doesn't compile."""
+    if not path:
+        return None
+    from utils.rules import RuleError, load_rules
+    try:
+        rules = load_rules(path)
+    except RuleError as e:
+        console.print(f"[red]Invalid rules file: {e}[/red]")
+        raise typer.Exit(code=1)
+    console.print(f"[dim]Loaded {len(rules.rules)} rule(s) from {path}[/dim]")
+    return rules
+
+RULES_OPTION = typer.Option(None, "--rules", help="TOML/JSON rules file; only matching events are shown")
+
 @app.command()
-def monitor(interval: int = 30):
+def monitor(interval: int = 30, rules_path: Optional[str] = RULES_OPTION):
     """Monitor for new tokens continuously."""
+    rules = load_rule_set(rules_path)
     console.print(f"[bold blue]:satellite: Monitoring for new tokens every {interval} seconds...[/bold blue]")
     console.print("[dim]Press Ctrl+C to stop monitoring[/dim]")
     
@@ -288,15 +348,19 @@ def monitor(interval: int = 30):
     
     try:
         while True:
-            tokens = scanner.get_new_tokens(10)
+            tokens = scanner_call(scanner, "get_new_tokens", 10)
             new_tokens = []
             
             for token in tokens:
-                mint = token.get('mint', '')
+                mint = token.mint
                 if mint and mint not in seen_tokens:
                     seen_tokens.add(mint)
                     new_tokens.append(token)
             
+            if rules and new_tokens:
+                matched = rules.process_batch(new_tokens)
+                new_tokens = [token for token, hits in zip(new_tokens, matched) if hits]
+            
             if new_tokens:
                 console.print(f"\n[green]🚨 {len(new_tokens)} NEW TOKEN(S) DETECTED![green]")
                 display_token_table(new_tokens, "New Tokens Detected")
@@ -307,6 +371,125 @@ def monitor(interval: int = 30):
             
     except KeyboardInterrupt:
         console.print("\n[yellow]Monitoring stopped by user.[/yellow]")
+    finally:
+        if rules:
+            rules.close()
+
+# Launches whose trades `trending --local` follows at once; the oldest are unsubscribed first
+MAX_TRADE_SUBSCRIPTIONS = 5000
+
+def momentum_table(
+    ranked: List[Dict[str, Any]],
+    window: float,
+    tracked: int,
+    events: int,
+    sol: Optional[PricePoint] = None
+) -> Table:
+    """Build the local trending table."""
+    table = Table(
+        title=f"Local Momentum - top {len(ranked)} of {tracked} active mints ({window:.0f}s window, {events:,} events)",
+        show_header=True, header_style="bold magenta", caption=sol_price_caption(sol)
+    )
+    table.add_column("#", justify="right", style="dim")
+    table.add_column("Symbol", style="green", no_wrap=True, min_width=8)
+    table.add_column("Score", justify="right")
+    table.add_column("Volume (SOL)", justify="right")
+    table.add_column("Volume (USD)", justify="right")
+    table.add_column("Trades/min", justify="right")
+    table.add_column("Traders", justify="right")
+    table.add_column("Buys/Sells", justify="right")
+    table.add_column("Mint Address", style="dim", no_wrap=True, min_width=20)
+    for rank, row in enumerate(ranked, 1):
+        mint = row['mint']
+        table.add_row(
+            str(rank),
+            (row['symbol'] or 'N/A')[:8],
+            f"{row['score']:.2f}",
+            format_number(row['volume_sol']),
+            format_usd(row['volume_sol'] * sol.usd if sol else None),
+            f"{row['trades_per_min']:.1f}",
+            str(row['unique_traders']),
+            f"[green]{row['buys']}[/green]/[red]{row['sells']}[/red]",
+            mint[:20] + "..." if len(mint) > 20 else mint
+        )
+    return table
+
+@app.command()
+def trending(
+    limit: int = 20,
+    local: bool = typer.Option(False, "--local", help="Rank mints locally from the live trade feed"),
+    window: float = typer.Option(300.0, help="Sliding window in seconds for --local"),
+    refresh: float = typer.Option(1.0, help="Seconds between table refreshes for --local")
+):
+    """Show trending tokens, from PumpPortal or ranked locally in real time."""
+    if not local:
+        scan(limit=limit, trending=True)
+        return
+
+    from collections import OrderedDict
+    from rich.live import Live
+    from utils.momentum import MomentumRanker
+
+    ranker = MomentumRanker(window=window)
+    # Refreshed in the background; each redraw reads the latest snapshot without waiting
+    price_service = prices.shared_price_service()
+    subscribed: "OrderedDict[str, None]" = OrderedDict()
+    pending: List[str] = []
+
+    async def follow_trades(websocket):
+        # Batch new launches into one subscribe message per tick
+        while True:
+            await asyncio.sleep(refresh)
+            if pending:
+                keys = pending[:]
+                pending.clear()
+                await websocket.send(json.dumps({"method": "subscribeTokenTrade", "keys": keys}))
+                for mint in keys:
+                    subscribed[mint] = None
+                stale = []
+                while len(subscribed) > MAX_TRADE_SUBSCRIPTIONS:
+                    stale.append(subscribed.popitem(last=False)[0])
+                if stale:
+                    await websocket.send(json.dumps({"method": "unsubscribeTokenTrade", "keys": stale}))
+
+    async def redraw(live):
+        while True:
+            await asyncio.sleep(refresh)
+            ranker.advance(time.time())
+            live.update(momentum_table(ranker.top(limit), window, len(ranker.heap), ranker.events,
+                                       price_service.point()), refresh=True)
+
+    async def subscribe():
+        uri = PUMPPORTAL_WS_URI
+        with Live(momentum_table([], window, 0, 0), console=console, auto_refresh=False) as live:
+            while True:
+                tasks = []
+                try:
+                    async with websockets.connect(uri) as websocket:
+                        await websocket.send(json.dumps({"method": "subscribeNewToken"}))
+                        if subscribed:
+                            await websocket.send(json.dumps({"method": "subscribeTokenTrade", "keys": list(subscribed)}))
+                        tasks = [asyncio.create_task(follow_trades(websocket)), asyncio.create_task(redraw(live))]
+                        async for message in websocket:
+                            event = models.decode_event(message)
+                            metrics.count("ws_messages", feed="pumpportal", method=event.method)
+                            if event.kind == 'new_token' and event.data.mint:
+                                pending.append(event.data.mint)
+                            ranker.observe(event, now=time.time())
+                except Exception as e:
+                    metrics.count("ws_errors", feed="pumpportal", kind="connection")
+                    console.print(f"[red]WebSocket error: {e}. Reconnecting in 5 seconds...[/red]")
+                    await asyncio.sleep(5)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+
+    console.print(f"[bold blue]:chart_with_upwards_trend: Ranking live Pump.fun momentum over a {window:.0f}s window...[/bold blue]")
+    console.print("[dim]Press Ctrl+C to stop[/dim]")
+    try:
+        asyncio.run(subscribe())
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Stopped.[/yellow]")
 
 # Legacy commands for compatibility
 @app.command()
@@ -324,67 +507,80 @@ def grimcast():
     """Posts to Twitter/X."""
     console.print("[yellow]Twitter/X posting feature not yet implemented.[/yellow]")
 
+def pretty_print_event(event: LiveEvent):
+    """Render one PumpPortal websocket event."""
+    data = event.data
+    ts = datetime.now().strftime('%H:%M:%S')
+    if event.kind == 'new_token':
+        name = data.name or 'N/A'
+        symbol = data.symbol or 'N/A'
+        mint = data.mint or 'N/A'
+        console.print(Panel(f"[bold green]NEW TOKEN[/bold green] [cyan]{name}[/cyan] ([magenta]{symbol}[/magenta])\nMint: {mint}", title=f"{ts} New Token"))
+    elif event.kind == 'migration':
+        console.print(Panel(f"[yellow]Migration event:[/yellow] {data}", title=f"{ts} Migration"))
+    elif event.method == 'accountTrade':
+        trader = data.trader or 'N/A'
+        console.print(Panel(f"[blue]Account Trade[/blue] Trader: {trader} | SOL: {data.sol_amount} | Token: {data.token_amount}", title=f"{ts} Account Trade"))
+    elif event.kind == 'trade':
+        mint = data.mint or 'N/A'
+        console.print(Panel(f"[magenta]Token Trade[/magenta] Mint: {mint} | SOL: {data.sol_amount} | Token: {data.token_amount}", title=f"{ts} Token Trade"))
+    else:
+        console.print(Panel(f"[dim]{json.dumps(event.to_dict(), indent=2)}[/dim]", title=f"{ts} Event"))
+
+LIVEFEED_SUBSCRIPTIONS = [
+    # Token creation events
+    {"method": "subscribeNewToken"},
+    # Migration events
+    {"method": "subscribeMigration"},
+    # Example: trades by account (customize as needed)
+    {"method": "subscribeAccountTrade", "keys": ["AArPXm8JatJiuyEffuC1un2Sc835SULa4uQqDcaGpAjV"]},
+    # Example: trades on tokens (customize as needed)
+    {"method": "subscribeTokenTrade", "keys": ["91WNez8D22NwBssQbkzjy4s2ipFrzpmn5hfvWVe2aY5p"]}
+]
+
 @app.command()
-def livefeed():
+def livefeed(rules_path: Optional[str] = RULES_OPTION):
     """Subscribe to real-time Pump.fun events via WebSocket."""
+    rules = load_rule_set(rules_path)
+
+    def handle(event: LiveEvent):
+        if rules is None or rules.process(event):
+            pretty_print_event(event)
+
+    try:
+        # Share the daemon's upstream connection when one is running
+        for event in daemon.stream("livefeed", uri=PUMPPORTAL_WS_URI, subscriptions=LIVEFEED_SUBSCRIPTIONS):
+            handle(LiveEvent.from_dict(event))
+        return
+    except daemon.DaemonUnavailable:
+        pass
+
     async def subscribe():
-        uri = "wss://pumpportal.fun/api/data"
+        uri = PUMPPORTAL_WS_URI
         while True:
             try:
                 console.print("[bold blue]Connecting to PumpPortal WebSocket...[/bold blue]")
                 async with websockets.connect(uri) as websocket:
-                    # Subscribing to token creation events
-                    await websocket.send(json.dumps({"method": "subscribeNewToken"}))
-                    # Subscribing to migration events
-                    await websocket.send(json.dumps({"method": "subscribeMigration"}))
-                    # Example: subscribe to trades by account (customize as needed)
-                    await websocket.send(json.dumps({
-                        "method": "subscribeAccountTrade",
-                        "keys": ["AArPXm8JatJiuyEffuC1un2Sc835SULa4uQqDcaGpAjV"]
-                    }))
-                    # Example: subscribe to trades on tokens (customize as needed)
-                    await websocket.send(json.dumps({
-                        "method": "subscribeTokenTrade",
-                        "keys": ["91WNez8D22NwBssQbkzjy4s2ipFrzpmn5hfvWVe2aY5p"]
-                    }))
+                    for subscription in LIVEFEED_SUBSCRIPTIONS:
+                        await websocket.send(json.dumps(subscription))
                     console.print("[green]Subscribed to real-time events![/green]")
                     async for message in websocket:
                         try:
-                            event = json.loads(message)
-                            pretty_print_event(event)
+                            event = models.decode_event(message)
+                            metrics.count("ws_messages", feed="pumpportal", method=event.method)
+                            handle(event)
                         except Exception as e:
+                            metrics.count("ws_errors", feed="pumpportal", kind="parse")
                             console.print(f"[red]Error parsing event: {e}[/red]")
             except Exception as e:
+                metrics.count("ws_errors", feed="pumpportal", kind="connection")
                 console.print(f"[red]WebSocket error: {e}. Reconnecting in 5 seconds...[/red]")
                 await asyncio.sleep(5)
-    
-    def pretty_print_event(event: dict):
-        event_type = event.get('method', 'unknown')
-        data = event.get('data', event)
-        ts = datetime.now().strftime('%H:%M:%S')
-        if event_type == 'newToken':
-            name = data.get('name', 'N/A')
-            symbol = data.get('symbol', 'N/A')
-            mint = data.get('mint', 'N/A')
-            console.print(Panel(f"[bold green]NEW TOKEN[/bold green] [cyan]{name}[/cyan] ([magenta]{symbol}[/magenta])\nMint: {mint}", title=f"{ts} New Token"))
-        elif event_type == 'migration':
-            console.print(Panel(f"[yellow]Migration event:[/yellow] {data}", title=f"{ts} Migration"))
-        elif event_type == 'accountTrade':
-            trader = data.get('trader', 'N/A')
-            sol = data.get('sol_amount', 0)
-            token = data.get('token_amount', 0)
-            console.print(Panel(f"[blue]Account Trade[/blue] Trader: {trader} | SOL: {sol} | Token: {token}", title=f"{ts} Account Trade"))
-        elif event_type == 'tokenTrade':
-            mint = data.get('mint', 'N/A')
-            sol = data.get('sol_amount', 0)
-            token = data.get('token_amount', 0)
-            console.print(Panel(f"[magenta]Token Trade[/magenta] Mint: {mint} | SOL: {sol} | Token: {token}", title=f"{ts} Token Trade"))
-        else:
-            console.print(Panel(f"[dim]{json.dumps(event, indent=2)}[/dim]", title=f"{ts} Event"))
 
     asyncio.run(subscribe())
 
 if __name__ == "__main__":
+    metrics.configure_from_env()
     console.print("[bold cyan]🚀 Pump.fun Token Scanner with PumpPortal API[/bold cyan]")
     console.print("[dim]Available commands: scan, token, search, trades, monitor, livefeed[/dim]\n")
     app() 
\ No newline at end of file
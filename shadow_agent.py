@@ -1,6 +1,7 @@
 import zmq
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad, unpad
+from utils import metrics
 
 # In a real scenario, keys would be managed securely (e.g., distributed via a secure channel)
 # For demonstration, a fixed key is used.
@@ -26,10 +27,12 @@ def start_shadow_agent(port: int):
 
     while True:
         encrypted_message = socket.recv()
-        message = decrypt_message(encrypted_message, SHADOWNET_KEY)
-        print(f"Received request: {message}")
-        encrypted_ack = encrypt_message(f"ACK: {message}", SHADOWNET_KEY)
-        socket.send(encrypted_ack)
+        with metrics.track("shadownet_agent", "handle_job"):
+            message = decrypt_message(encrypted_message, SHADOWNET_KEY)
+            print(f"Received request: {message}")
+            encrypted_ack = encrypt_message(f"ACK: {message}", SHADOWNET_KEY)
+            socket.send(encrypted_ack)
 
 if __name__ == "__main__":
+    metrics.configure_from_env()
     start_shadow_agent(5555) # Default port
\ No newline at end of file
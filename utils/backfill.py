@@ -0,0 +1,273 @@
+"""
+Backfill utility for GrimBundle
+Pages backwards through the Pump.fun program's signature history and fetches
+transactions in parallel across RPC endpoints into the local create store,
+checkpointing after every page so an interrupted run resumes where it stopped
+"""
+
+from typing import Callable, Dict, Any, List, Optional
+import asyncio
+import time
+
+from utils import lookup_tables, metrics, ratelimit
+from utils.create_store import CreateStore
+from utils.lookup_tables import LookupTableError
+from utils.pumpfun import PUMP_FUN_PROGRAM_ADDRESS, decode_creates
+
+# getSignaturesForAddress returns at most this many per call
+PAGE_SIZE = 1000
+# Consecutive errors before an endpoint is rested, and for how long
+ENDPOINT_MAX_ERRORS = 5
+ENDPOINT_COOLDOWN = 10.0
+
+class _Endpoint:
+    def __init__(self, url: str, concurrency: int):
+        self.url = url
+        self.client = ratelimit.async_solana_client(url)
+        self.slots = asyncio.Semaphore(concurrency)
+        self.in_flight = 0
+        self.errors = 0
+        self.down_until = 0.0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def succeeded(self) -> None:
+        self.errors = 0
+
+    def failed(self) -> None:
+        self.errors += 1
+        if self.errors >= ENDPOINT_MAX_ERRORS:
+            self.down_until = time.monotonic() + ENDPOINT_COOLDOWN
+            self.errors = 0
+
+class Backfill:
+    """
+    One backfill run against a set of RPC endpoints.
+
+    Each page of signatures has its transactions fetched concurrently, spread
+    over the endpoints (least busy first, with failover), while the next page
+    of signatures is already being requested. A page's creates, failures and
+    cursor are committed together.
+
+    Checkpoints:
+        newest: newest signature covered; later runs first catch up from the tip down to it
+        head_tip: tip of a catch-up still in progress; becomes newest once it reaches newest
+        head_before: oldest signature that catch-up has covered; the next run resumes below it
+        oldest: oldest signature covered; the backwards crawl continues from here
+        complete: set once the start of the program's history has been reached
+    """
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        store: CreateStore,
+        concurrency: int = 8,
+        page_size: int = PAGE_SIZE,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        if not endpoints:
+            raise ValueError("backfill needs at least one RPC endpoint")
+        self.endpoint_urls = endpoints
+        self.store = store
+        self.concurrency = concurrency
+        self.page_size = min(page_size, PAGE_SIZE)
+        self.progress = progress
+        self.stats = {"pages": 0, "signatures": 0, "skipped": 0, "fetched": 0, "creates": 0, "failed": 0,
+                      "retried": 0, "oldest_time": None, "elapsed_s": 0.0}
+
+    async def run(self, since: Optional[int] = None, max_signatures: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Catch up from the tip, then crawl backwards
+
+        Args:
+            since: Stop once signatures are older than this unix time
+            max_signatures: Stop after this many new signatures in this run
+
+        Returns:
+            Counters for the run
+        """
+        started = time.perf_counter()
+        self._endpoints = [_Endpoint(url, self.concurrency) for url in self.endpoint_urls]
+        try:
+            await self._retry_failures()
+            newest = self.store.checkpoint("newest")
+            if newest is not None:
+                # A catch-up cut short by the budget or an interruption resumes below its last page
+                before = self.store.checkpoint("head_before")
+                await self._crawl(before=before, until=newest, since=None, max_signatures=max_signatures, head=True)
+            if not self.store.checkpoint("complete"):
+                before = self.store.checkpoint("oldest")
+                await self._crawl(before=before, until=None, since=since, max_signatures=max_signatures, head=False)
+        finally:
+            for endpoint in self._endpoints:
+                await endpoint.client.close()
+            self.stats["elapsed_s"] = round(time.perf_counter() - started, 3)
+        return self.stats
+
+    def _budget(self, max_signatures: Optional[int]) -> Optional[int]:
+        return None if max_signatures is None else max_signatures - self.stats["signatures"]
+
+    async def _crawl(
+        self,
+        before: Optional[str],
+        until: Optional[str],
+        since: Optional[int],
+        max_signatures: Optional[int],
+        head: bool
+    ) -> None:
+        # In head mode the tip is only recorded as newest once the gap down to `until`
+        # is fully covered; until then head_tip/head_before let the next run resume the gap
+        if self._budget(max_signatures) == 0:
+            return
+        first_signature = self.store.checkpoint("head_tip") if head else None
+        next_page = asyncio.ensure_future(self._signatures(before, until, self._page_limit(max_signatures)))
+        while True:
+            page = await next_page
+            if not page:
+                # Reached `until`, or the start of the program's history
+                if not head:
+                    self.store.commit_page([], {"complete": "1"})
+                elif first_signature:
+                    self.store.commit_page([], {"newest": first_signature, "head_tip": None, "head_before": None})
+                return
+            budget = self._budget(max_signatures)
+            page = page if budget is None else page[:budget]
+            reached_since = False
+            if since is not None:
+                kept = [info for info in page if info.block_time is None or info.block_time >= since]
+                reached_since = len(kept) < len(page)
+                page = kept
+            if not page:
+                return
+            cursor = str(page[-1].signature)
+            first_signature = first_signature or str(page[0].signature)
+            more = not reached_since and (budget is None or len(page) < budget)
+            if more:
+                next_page = asyncio.ensure_future(self._signatures(cursor, until, self._page_limit(max_signatures, len(page))))
+            creates, failures = await self._fetch_page(page)
+            checkpoints: Dict[str, Optional[str]] = {}
+            if head:
+                checkpoints["head_tip"] = first_signature
+                checkpoints["head_before"] = cursor
+            else:
+                checkpoints["oldest"] = cursor
+                if self.store.checkpoint("newest") is None:
+                    checkpoints["newest"] = first_signature
+            self.store.commit_page(creates, checkpoints, failures)
+            self._page_done(page, creates, failures)
+            if not more:
+                return
+
+    def _page_limit(self, max_signatures: Optional[int], pending: int = 0) -> int:
+        budget = self._budget(max_signatures)
+        return self.page_size if budget is None else max(1, min(self.page_size, budget - pending))
+
+    def _page_done(self, page: List[Any], creates: List[Dict[str, Any]], failures: List[Dict[str, Any]]) -> None:
+        stats = self.stats
+        stats["pages"] += 1
+        stats["signatures"] += len(page)
+        stats["creates"] += len(creates)
+        stats["failed"] += len(failures)
+        times = [info.block_time for info in page if info.block_time is not None]
+        if times:
+            stats["oldest_time"] = min(times) if stats["oldest_time"] is None else min(stats["oldest_time"], min(times))
+        if self.progress:
+            self.progress(stats)
+
+    async def _retry_failures(self) -> None:
+        failed = self.store.failures()
+        if not failed:
+            return
+        from solders.signature import Signature
+        resolved, still_failed, creates = [], [], []
+        results = await asyncio.gather(*(self._transaction(Signature.from_string(f["signature"])) for f in failed))
+        for failure, (result, error) in zip(failed, results):
+            if error is None:
+                resolved.append(failure["signature"])
+                creates.extend(result or [])
+            else:
+                still_failed.append({**failure, "error": error})
+        self.store.commit_page(creates, failures=still_failed, resolved=resolved)
+        self.stats["retried"] += len(resolved)
+        self.stats["creates"] += len(creates)
+
+    async def _signatures(self, before: Optional[str], until: Optional[str], limit: int) -> List[Any]:
+        """One page of signature infos, newest first, trying each endpoint in turn"""
+        from solders.pubkey import Pubkey
+        from solders.signature import Signature
+        program = Pubkey.from_string(PUMP_FUN_PROGRAM_ADDRESS)
+        last_error: Optional[Exception] = None
+        for endpoint in sorted(self._endpoints, key=lambda e: (not e.available(), e.in_flight)):
+            try:
+                with metrics.track("solana_rpc", "getSignaturesForAddress"):
+                    response = await endpoint.client.get_signatures_for_address(
+                        program,
+                        before=Signature.from_string(before) if before else None,
+                        until=Signature.from_string(until) if until else None,
+                        limit=limit
+                    )
+                endpoint.succeeded()
+                return response.value
+            except Exception as e:
+                endpoint.failed()
+                last_error = e
+        raise RuntimeError(f"every endpoint failed to list signatures: {last_error}")
+
+    async def _fetch_page(self, page: List[Any]) -> tuple:
+        wanted = [info for info in page if info.err is None]
+        # Failed transactions can't have created anything
+        self.stats["skipped"] += len(page) - len(wanted)
+        results = await asyncio.gather(*(self._transaction(info.signature) for info in wanted))
+        creates, failures = [], []
+        for info, (result, error) in zip(wanted, results):
+            if error is not None:
+                failures.append({"signature": str(info.signature), "slot": info.slot, "block_time": info.block_time, "error": error})
+            else:
+                self.stats["fetched"] += 1
+                creates.extend(result or [])
+        return creates, failures
+
+    async def _transaction(self, signature: Any) -> tuple:
+        """(decoded creates, None) or (None, error message) after trying every endpoint once"""
+        tried = set()
+        last_error = "no endpoint available"
+        while len(tried) < len(self._endpoints):
+            candidates = [e for e in self._endpoints if e.url not in tried]
+            endpoint = min(candidates, key=lambda e: (not e.available(), e.in_flight))
+            tried.add(endpoint.url)
+            endpoint.in_flight += 1
+            try:
+                async with endpoint.slots:
+                    with metrics.track("solana_rpc", "getTransaction"):
+                        response = await endpoint.client.get_transaction(signature, max_supported_transaction_version=0)
+                    # Only when the meta lacks loaded addresses; tables are cached across the run
+                    await lookup_tables.prepare_async(endpoint.client, [response])
+                creates = decode_creates(response)
+                if creates is None:
+                    # Not served by this node (pruned history or not yet indexed); another may have it
+                    last_error = f"{endpoint.url} returned no transaction"
+                    continue
+                endpoint.succeeded()
+                return creates, None
+            except LookupTableError as e:
+                # The transaction was served; its tables weren't, so it's kept as a failure to retry
+                endpoint.succeeded()
+                return None, str(e)
+            except Exception as e:
+                endpoint.failed()
+                last_error = f"{endpoint.url}: {e}"
+            finally:
+                endpoint.in_flight -= 1
+        return None, last_error
+
+def run_backfill(
+    endpoints: List[str],
+    store: CreateStore,
+    since: Optional[int] = None,
+    max_signatures: Optional[int] = None,
+    concurrency: int = 8,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """Blocking wrapper around Backfill.run()"""
+    return asyncio.run(Backfill(endpoints, store, concurrency, progress=progress).run(since, max_signatures))
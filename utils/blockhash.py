@@ -0,0 +1,119 @@
+"""
+Blockhash cache for GrimBundle
+Keeps a recent blockhash warm in the background so transaction builders and
+senders never wait on an RPC round-trip for one
+"""
+
+from solders.hash import Hash
+from typing import Dict, NamedTuple, Optional
+import threading
+import time
+
+from utils import metrics, ratelimit
+
+# A blockhash stays valid for 150 slots; refreshing every ~20 keeps plenty of headroom
+REFRESH_SLOTS = 20
+DEFAULT_SLOT_TIME = 0.4
+MAX_SNAPSHOT_AGE = 30.0
+
+class BlockhashSnapshot(NamedTuple):
+    blockhash: Hash
+    last_valid_block_height: int
+    slot: int
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+class BlockhashCache:
+    """
+    Background-refreshed blockhash with its lastValidBlockHeight.
+
+    The refresh interval follows the observed slot rate: every fetch records the
+    context slot, and the time between fetches divided by the slots elapsed gives
+    the current slot time. Readers get an immutable snapshot with a plain attribute
+    read, so no lock sits on the hot path.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        commitment: str = "confirmed",
+        refresh_slots: int = REFRESH_SLOTS,
+        min_interval: float = 1.0,
+        max_interval: float = 20.0
+    ):
+        self.endpoint = endpoint
+        self.commitment = commitment
+        self.refresh_slots = refresh_slots
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.slot_time = DEFAULT_SLOT_TIME
+        self.snapshot: Optional[BlockhashSnapshot] = None
+        self._client = ratelimit.solana_client(endpoint)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "BlockhashCache":
+        """Start the refresh thread (no-op if already running)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="blockhash-cache", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def refresh(self) -> Optional[BlockhashSnapshot]:
+        """Fetch a new blockhash now and publish it"""
+        try:
+            with metrics.track("solana_rpc", "getLatestBlockhash"):
+                resp = self._client.get_latest_blockhash(self.commitment)
+        except Exception as e:
+            print(f"Error refreshing blockhash: {e}")
+            return None
+        snapshot = BlockhashSnapshot(
+            resp.value.blockhash,
+            resp.value.last_valid_block_height,
+            resp.context.slot,
+            time.monotonic()
+        )
+        previous = self.snapshot
+        if previous is not None and snapshot.slot > previous.slot:
+            observed = (snapshot.fetched_at - previous.fetched_at) / (snapshot.slot - previous.slot)
+            self.slot_time = 0.8 * self.slot_time + 0.2 * observed
+        self.snapshot = snapshot
+        return snapshot
+
+    def current(self) -> Optional[BlockhashSnapshot]:
+        """Latest snapshot without any network access (None until the first fetch)"""
+        return self.snapshot
+
+    def get(self, max_age: float = MAX_SNAPSHOT_AGE) -> Optional[BlockhashSnapshot]:
+        """Latest snapshot, fetching synchronously only if there is none or it is too old"""
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.age > max_age:
+            snapshot = self.refresh() or snapshot
+        return snapshot
+
+    def next_interval(self) -> float:
+        return min(self.max_interval, max(self.min_interval, self.refresh_slots * self.slot_time))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.next_interval())
+
+_shared: Dict[str, BlockhashCache] = {}
+_shared_lock = threading.Lock()
+
+def shared_blockhash_cache(endpoint: str, commitment: str = "confirmed") -> BlockhashCache:
+    """Process-wide running cache for an endpoint, shared by every builder and sender"""
+    key = f"{endpoint}#{commitment}"
+    with _shared_lock:
+        cache = _shared.get(key)
+        if cache is None:
+            cache = _shared[key] = BlockhashCache(endpoint, commitment)
+        return cache.start()
@@ -0,0 +1,195 @@
+"""
+Bonding curve state for GrimBundle
+Bulk-loads Pump.fun bonding-curve accounts and keeps them current over accountSubscribe
+"""
+
+from solders.pubkey import Pubkey
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional
+import asyncio
+import base64
+import itertools
+import json
+import struct
+import threading
+import websockets
+
+from utils import metrics
+from utils.solana_client import DEVNET_URL, SolanaClient, ws_url
+
+PUMP_FUN_PROGRAM = Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P")
+BONDING_CURVE_SEED = b"bonding-curve"
+BONDING_CURVE_DISCRIMINATOR = bytes([23, 183, 248, 55, 96, 216, 172, 96])
+
+# discriminator | virtual_token | virtual_sol | real_token | real_sol | total_supply | complete
+BONDING_CURVE_LAYOUT = struct.Struct("<8sQQQQQ?")
+
+class BondingCurveState(NamedTuple):
+    mint: str
+    bonding_curve: str
+    virtual_token_reserves: int
+    virtual_sol_reserves: int
+    real_token_reserves: int
+    real_sol_reserves: int
+    token_total_supply: int
+    complete: bool
+    slot: int
+
+    def to_curve(self):
+        """Simulator curve seeded with these reserves"""
+        from bundle.simulator import BondingCurve
+        return BondingCurve(
+            self.virtual_sol_reserves, self.virtual_token_reserves,
+            self.real_token_reserves, self.real_sol_reserves
+        )
+
+def bonding_curve_address(mint: str) -> Pubkey:
+    """PDA of a mint's bonding curve (same seeds as grimnode-ts/src/grimbundle.ts)"""
+    return Pubkey.find_program_address([BONDING_CURVE_SEED, bytes(Pubkey.from_string(mint))], PUMP_FUN_PROGRAM)[0]
+
+def decode_bonding_curve(mint: str, address: str, data: bytes, slot: int = 0) -> Optional[BondingCurveState]:
+    """Decode raw bonding-curve account data; None if it isn't one"""
+    if len(data) < BONDING_CURVE_LAYOUT.size:
+        return None
+    discriminator, *fields = BONDING_CURVE_LAYOUT.unpack_from(data)
+    if discriminator != BONDING_CURVE_DISCRIMINATOR:
+        return None
+    return BondingCurveState(mint, address, *fields, slot)
+
+class BondingCurveWatcher:
+    """
+    In-memory snapshot of bonding-curve reserves keyed by mint.
+
+    Curves are loaded in chunked getMultipleAccounts calls and then kept current
+    by accountSubscribe notifications on one websocket, so readers never touch
+    the network. Run it inside an event loop with watch(), or on a background
+    thread with start().
+    """
+
+    def __init__(self, endpoint: str = DEVNET_URL, ws_endpoint: Optional[str] = None, commitment: str = "confirmed"):
+        self.endpoint = endpoint
+        self.ws_endpoint = ws_endpoint or ws_url(endpoint)
+        self.commitment = commitment
+        self.states: Dict[str, BondingCurveState] = {}
+        self._addresses: Dict[str, str] = {}
+        self._ids = itertools.count(1)
+        self._requests: Dict[int, str] = {}
+        self._subscriptions: Dict[int, str] = {}
+        self._ws = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self, mint: str) -> Optional[BondingCurveState]:
+        return self.states.get(mint)
+
+    def snapshot(self) -> Dict[str, BondingCurveState]:
+        return dict(self.states)
+
+    def curve(self, mint: str):
+        """Simulator curve for a mint from the latest reserves, or None if untracked"""
+        state = self.states.get(mint)
+        return state.to_curve() if state is not None else None
+
+    def load(self, mints: Iterable[str]) -> Dict[str, BondingCurveState]:
+        """Fetch curves for many mints at once; a state from a later slot is never overwritten"""
+        addresses = {mint: str(bonding_curve_address(mint)) for mint in mints}
+        self._addresses.update(addresses)
+        accounts = SolanaClient(self.endpoint).get_multiple_accounts_with_slot(addresses.values())
+        for mint, address in addresses.items():
+            account, slot = accounts.get(address, (None, 0))
+            if account is None or self._is_stale(mint, slot):
+                continue
+            state = decode_bonding_curve(mint, address, bytes(account.data), slot)
+            if state is not None:
+                self.states[mint] = state
+        return {mint: self.states[mint] for mint in addresses if mint in self.states}
+
+    async def watch(self, mints: Iterable[str]) -> None:
+        """Subscribe to the curves, bulk-load them and apply updates until cancelled"""
+        mints = list(mints)
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                async with websockets.connect(self.ws_endpoint, max_size=None) as ws:
+                    self._ws = ws
+                    self._subscriptions.clear()
+                    # Subscribe before loading so no change can slip in between the two
+                    await self._subscribe(list(dict.fromkeys(mints + list(self._addresses))))
+                    await loop.run_in_executor(None, self.load, mints)
+                    async for raw in ws:
+                        metrics.count("ws_messages", feed="account_subscribe")
+                        self._handle(json.loads(raw))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.count("ws_errors", feed="account_subscribe", kind="connection")
+                print(f"Bonding curve subscription error: {e}. Reconnecting in 2 seconds...")
+                await asyncio.sleep(2)
+            finally:
+                self._ws = None
+
+    async def track(self, mints: Iterable[str]) -> None:
+        """Start following more mints on a running watcher"""
+        mints = [mint for mint in mints if mint not in self._addresses]
+        if not mints:
+            return
+        await self._subscribe(mints)
+        await asyncio.get_running_loop().run_in_executor(None, self.load, mints)
+
+    def start(self, mints: Iterable[str]) -> "BondingCurveWatcher":
+        """Run watch() on a daemon thread with its own event loop"""
+        mints = list(mints)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_until_complete, args=(self.watch(mints),), name="bonding-curves", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def track_threadsafe(self, mints: Iterable[str]) -> None:
+        """track() for a watcher started with start()"""
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self.track(list(mints)), self._loop)
+
+    async def _subscribe(self, mints: List[str]) -> None:
+        for mint in mints:
+            address = self._addresses.get(mint) or str(bonding_curve_address(mint))
+            self._addresses[mint] = address
+            if self._ws is None:
+                continue
+            request_id = next(self._ids)
+            self._requests[request_id] = mint
+            await self._ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "accountSubscribe",
+                "params": [address, {"encoding": "base64", "commitment": self.commitment}]
+            }))
+
+    def _handle(self, msg: Dict[str, Any]) -> None:
+        if "id" in msg:
+            mint = self._requests.pop(msg["id"], None)
+            if mint is not None and "result" in msg:
+                self._subscriptions[msg["result"]] = mint
+            elif mint is not None:
+                print(f"accountSubscribe failed for {mint}: {msg.get('error')}")
+            return
+        if msg.get("method") != "accountNotification":
+            return
+        params = msg["params"]
+        mint = self._subscriptions.get(params["subscription"])
+        if mint is None:
+            return
+        result = params["result"]
+        value = result.get("value") or {}
+        data = value.get("data") or [""]
+        slot = result.get("context", {}).get("slot", 0)
+        if self._is_stale(mint, slot):
+            return
+        state = decode_bonding_curve(mint, self._addresses[mint], base64.b64decode(data[0]), slot)
+        if state is not None:
+            self.states[mint] = state
+
+    def _is_stale(self, mint: str, slot: int) -> bool:
+        """True if the stored state for mint was read at a later slot than slot"""
+        state = self.states.get(mint)
+        return state is not None and state.slot > slot
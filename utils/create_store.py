@@ -0,0 +1,154 @@
+"""
+Create store utility for GrimBundle
+Local SQLite index of decoded Pump.fun create events, filled by backfill and
+queried by time range, creator or mint without going back to the chain
+"""
+
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+import os
+import sqlite3
+import threading
+
+DEFAULT_DB_PATH = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "grimnode" / "creates.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS creates (
+    signature TEXT NOT NULL,
+    ix_index INTEGER NOT NULL,
+    mint TEXT,
+    creator TEXT,
+    name TEXT,
+    symbol TEXT,
+    uri TEXT,
+    slot INTEGER,
+    block_time INTEGER,
+    PRIMARY KEY (signature, ix_index)
+);
+CREATE INDEX IF NOT EXISTS creates_time ON creates (block_time);
+CREATE INDEX IF NOT EXISTS creates_creator_time ON creates (creator, block_time);
+CREATE INDEX IF NOT EXISTS creates_mint ON creates (mint);
+CREATE TABLE IF NOT EXISTS failures (
+    signature TEXT PRIMARY KEY,
+    slot INTEGER,
+    block_time INTEGER,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+CREATE_COLUMNS = ("signature", "ix_index", "mint", "creator", "name", "symbol", "uri", "slot", "block_time")
+
+class CreateStore:
+    """
+    SQLite-backed store of create events.
+
+    Pages are written in one transaction together with the checkpoint that
+    covers them, so an interrupted backfill resumes exactly where its last
+    committed page ended. Inserts are idempotent, so re-crawling overlaps is safe.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else DEFAULT_DB_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "CreateStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def checkpoint(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM checkpoints WHERE name = ?", (name,)).fetchone()
+        return row["value"] if row else None
+
+    def commit_page(
+        self,
+        creates: Iterable[Dict[str, Any]],
+        checkpoints: Optional[Dict[str, Optional[str]]] = None,
+        failures: Iterable[Dict[str, Any]] = (),
+        resolved: Iterable[str] = ()
+    ) -> None:
+        """
+        Store one page of results atomically
+
+        Args:
+            creates: Decoded creates (as from utils.pumpfun.decode_creates)
+            checkpoints: Checkpoint values to set alongside them; None deletes one
+            failures: Signatures that couldn't be fetched ({signature, slot, block_time, error})
+            resolved: Previously failed signatures that have now been fetched
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO creates ({', '.join(CREATE_COLUMNS)}) VALUES ({', '.join('?' * len(CREATE_COLUMNS))})",
+                [(c["signature"], c["index"], c["mint"], c["creator"], c["name"], c["symbol"], c["uri"],
+                  c["slot"], c["block_time"]) for c in creates]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO failures (signature, slot, block_time, error) VALUES (?, ?, ?, ?)",
+                [(f["signature"], f.get("slot"), f.get("block_time"), f.get("error")) for f in failures]
+            )
+            self._conn.executemany("DELETE FROM failures WHERE signature = ?", [(s,) for s in resolved])
+            for name, value in (checkpoints or {}).items():
+                if value is None:
+                    self._conn.execute("DELETE FROM checkpoints WHERE name = ?", (name,))
+                else:
+                    self._conn.execute("INSERT OR REPLACE INTO checkpoints (name, value) VALUES (?, ?)", (name, value))
+
+    def failures(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        rows = self._conn.execute("SELECT * FROM failures ORDER BY slot DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def query(
+        self,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        creator: Optional[str] = None,
+        mint: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Creates matching every given filter, newest first
+
+        Args:
+            since: Earliest block time (unix seconds, inclusive)
+            until: Latest block time (unix seconds, exclusive)
+            creator: Creating wallet
+            mint: Token mint
+            limit: Maximum rows returned
+
+        Returns:
+            Matching creates as dicts
+        """
+        clauses, params = [], []
+        for clause, value in (("block_time >= ?", since), ("block_time < ?", until), ("creator = ?", creator), ("mint = ?", mint)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn.execute(
+            f"SELECT {', '.join(CREATE_COLUMNS)} FROM creates {where} ORDER BY block_time DESC, slot DESC LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        row = self._conn.execute(
+            "SELECT COUNT(*) AS creates, COUNT(DISTINCT creator) AS creators, MIN(block_time) AS oldest, "
+            "MAX(block_time) AS newest FROM creates"
+        ).fetchone()
+        failures = self._conn.execute("SELECT COUNT(*) FROM failures").fetchone()[0]
+        return {**dict(row), "failures": failures}
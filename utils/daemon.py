@@ -0,0 +1,486 @@
+"""
+Daemon utility for GrimBundle
+Long-running process that keeps RPC clients, HTTP sessions, the blockhash cache,
+token caches and live subscriptions warm, plus the thin client the CLI commands
+use to reach it over a local Unix socket
+
+Requests and responses are JSON lines: {"id", "method", "params"} in,
+{"id", "result"} or {"id", "error"} out. Streaming methods answer with one
+{"id", "event"} line per event until the client disconnects. Set
+GRIMNODE_DAEMON=0 to make every command run in-process.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+
+from utils import lookup_tables, metrics, models, prices, ratelimit
+
+# Bounded so a long-running daemon doesn't grow without limit
+TRANSACTION_CACHE_SIZE = 20_000
+# How long PumpPortal answers are reused, by scanner method
+PUMPPORTAL_TTLS = {
+    "get_new_tokens": 2.0,
+    "get_trending_tokens": 10.0,
+    "search_tokens": 10.0,
+    "get_token_by_address": 30.0,
+    "get_token_trades": 2.0
+}
+# Events a slow livefeed client may fall behind before old ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 1024
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening (or use of one is disabled)"""
+
+class DaemonError(RuntimeError):
+    """The daemon ran the request and it failed"""
+
+def socket_path() -> Path:
+    """GRIMNODE_SOCKET, else a socket in $XDG_RUNTIME_DIR or ~/.cache/grimnode"""
+    if os.getenv("GRIMNODE_SOCKET"):
+        return Path(os.environ["GRIMNODE_SOCKET"])
+    if os.getenv("XDG_RUNTIME_DIR"):
+        return Path(os.environ["XDG_RUNTIME_DIR"]) / "grimnode.sock"
+    return Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "grimnode" / "daemon.sock"
+
+def daemon_enabled() -> bool:
+    return os.getenv("GRIMNODE_DAEMON", "auto").lower() not in ("0", "off", "false", "no")
+
+def _connect(timeout: Optional[float]) -> socket.socket:
+    if not daemon_enabled():
+        raise DaemonUnavailable("daemon disabled by GRIMNODE_DAEMON")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(socket_path()))
+    except OSError as e:
+        sock.close()
+        raise DaemonUnavailable(str(e)) from e
+    return sock
+
+def _request(sock: socket.socket, method: str, params: Dict[str, Any]) -> None:
+    sock.sendall(json.dumps({"id": 1, "method": method, "params": params}).encode() + b"\n")
+
+def call(method: str, timeout: Optional[float] = 60.0, **params: Any) -> Any:
+    """
+    Run one request on the daemon
+
+    Args:
+        method: Daemon method, e.g. "scan" or "pumpportal.get_new_tokens"
+        timeout: Seconds to wait for the answer
+        **params: JSON-serializable method parameters
+
+    Returns:
+        The method's result; raises DaemonUnavailable if no daemon is listening
+        and DaemonError if the request failed on the daemon
+    """
+    sock = _connect(timeout)
+    with metrics.track("daemon", method), sock:
+        _request(sock, method, params)
+        line = sock.makefile("rb").readline()
+    if not line:
+        raise DaemonError(f"daemon closed the connection during {method}")
+    msg = models.loads(line)
+    if "error" in msg:
+        raise DaemonError(msg["error"])
+    return msg.get("result")
+
+def stream(method: str, **params: Any) -> Iterator[Any]:
+    """Iterate over the events of a streaming method; connecting happens on the first next()"""
+    sock = _connect(None)
+    with sock:
+        _request(sock, method, params)
+        for line in sock.makefile("rb"):
+            msg = models.loads(line)
+            if "error" in msg:
+                raise DaemonError(msg["error"])
+            yield msg.get("event")
+
+def via_daemon(method: str, fallback: Callable[[], Any], *, call_timeout: Optional[float] = 60.0, **params: Any) -> Any:
+    """call() (waiting up to call_timeout seconds) when a daemon is running, otherwise run fallback() in-process"""
+    try:
+        return call(method, call_timeout, **params)
+    except DaemonUnavailable:
+        return fallback()
+
+class _TTLCache:
+    """
+    Results by key for a fixed time; concurrent misses for one key share a single fetch.
+
+    Keys carry per-request arguments, so expired entries are swept on insert
+    whenever the cache has doubled since the last sweep.
+    """
+
+    def __init__(self, min_sweep: int = 256):
+        self._entries: Dict[Tuple, Tuple[float, asyncio.Future]] = {}
+        self._min_sweep = min_sweep
+        self._sweep_at = min_sweep
+
+    async def get(self, key: Tuple, ttl: float, fetch: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and (entry[0] > now or not entry[1].done()):
+            return await asyncio.shield(entry[1])
+        future = asyncio.ensure_future(fetch())
+        self._entries[key] = (now + ttl, future)
+        if len(self._entries) >= self._sweep_at:
+            self._sweep(now)
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            self._entries.pop(key, None)
+            raise
+
+    def _sweep(self, now: float) -> None:
+        expired = [key for key, (expires, future) in self._entries.items() if expires <= now and future.done()]
+        for key in expired:
+            del self._entries[key]
+        self._sweep_at = max(self._min_sweep, 2 * len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class _Feed:
+    """One upstream websocket shared by every livefeed client of the same URI"""
+
+    def __init__(self, uri: str):
+        self.uri = uri
+        self.subscriptions: Dict[str, Dict[str, Any]] = {}
+        self.subscribers: List[asyncio.Queue] = []
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def add(self, subscriptions: List[Dict[str, Any]]) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.append(queue)
+        for subscription in subscriptions:
+            key = json.dumps(subscription, sort_keys=True)
+            if key not in self.subscriptions:
+                self.subscriptions[key] = subscription
+                if self._ws is not None:
+                    await self._ws.send(json.dumps(subscription))
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def remove(self, queue: asyncio.Queue) -> None:
+        if queue in self.subscribers:
+            self.subscribers.remove(queue)
+
+    async def _run(self) -> None:
+        import websockets
+        while True:
+            try:
+                async with websockets.connect(self.uri) as ws:
+                    self._ws = ws
+                    for subscription in list(self.subscriptions.values()):
+                        await ws.send(json.dumps(subscription))
+                    async for raw in ws:
+                        event = models.loads(raw)
+                        metrics.count("ws_messages", feed="daemon", method=event.get("method", "unknown"))
+                        for queue in self.subscribers:
+                            if queue.full():
+                                queue.get_nowait()
+                            queue.put_nowait(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.count("ws_errors", feed="daemon", kind="connection")
+                print(f"Livefeed upstream error on {self.uri}: {e}. Reconnecting in 5 seconds...")
+                await asyncio.sleep(5)
+            finally:
+                self._ws = None
+
+class GrimDaemon:
+    """
+    Serves CLI requests from warm, shared resources.
+
+    Keeps one AsyncClient (and its connection pool) per RPC endpoint, a
+    keep-alive PumpPortal session, the shared blockhash caches, one ZeroMQ
+    socket per ShadowNet agent, one upstream websocket per live feed and,
+    once proofs are requested, a pool of Node proof workers.
+    Inspected transactions are cached by signature, so repeated scans only
+    fetch what is new.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else socket_path()
+        self.started_at = time.time()
+        self.ready = threading.Event()
+        self.transactions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._rpc: Dict[str, Any] = {}
+        self._scanner = None
+        self._responses = _TTLCache()
+        self._agents: Dict[str, Any] = {}
+        self._agent_locks: Dict[str, threading.Lock] = {}
+        self._feeds: Dict[str, _Feed] = {}
+        self._prover = None
+        self._prover_lock = asyncio.Lock()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handlers = {
+            "ping": self.ping,
+            "scan": self.scan,
+            "blockhash": self.blockhash,
+            "priority_fees": self.priority_fees,
+            "prices": self.prices,
+            "send_job": self.send_job,
+            "prove": self.prove,
+            "stop": self.stop
+        }
+
+    async def serve(self) -> None:
+        """Listen on the Unix socket until stop() is called"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            probe.connect(str(self.path))
+            probe.close()
+            raise RuntimeError(f"a daemon is already listening on {self.path}")
+        except (FileNotFoundError, ConnectionRefusedError):
+            # Nothing listening; clear a socket left behind by a crashed daemon
+            if self.path.exists():
+                self.path.unlink()
+        self._loop = asyncio.get_running_loop()
+        # Priced from startup, so clients find SOL/USD cached instead of waiting on a quote
+        prices.shared_price_service()
+        self._server = await asyncio.start_unix_server(self._client, sock=self._bind())
+        self.ready.set()
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self._shutdown()
+
+    def _bind(self) -> socket.socket:
+        # The socket accepts send_job, prove and stop, so it must be owner-only from the
+        # moment it is reachable: bind it inside a private 0700 directory, tighten it,
+        # then move it into place. (Changing the umask would affect every thread.)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        private = tempfile.mkdtemp(prefix=".grimnode-", dir=str(self.path.parent))
+        staging = os.path.join(private, "d.sock")
+        try:
+            sock.bind(staging)
+            os.chmod(staging, 0o600)
+            os.replace(staging, self.path)
+        except OSError:
+            sock.close()
+            raise
+        finally:
+            if os.path.exists(staging):
+                os.unlink(staging)
+            os.rmdir(private)
+        return sock
+
+    def run(self) -> None:
+        asyncio.run(self.serve())
+
+    def stop_threadsafe(self) -> None:
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+
+    async def _shutdown(self) -> None:
+        for feed in self._feeds.values():
+            if feed._task is not None:
+                feed._task.cancel()
+        for client in self._rpc.values():
+            await client.close()
+        for agent in self._agents.values():
+            agent.close(linger=0)
+        if self._prover is not None:
+            self._prover.close()
+        if self.path.exists():
+            self.path.unlink()
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                msg = models.loads(line)
+                method, params = msg.get("method"), msg.get("params") or {}
+                if method == "livefeed":
+                    await self._livefeed(msg.get("id"), params, reader, writer)
+                    break
+                try:
+                    with metrics.track("daemon_server", method or "unknown"):
+                        result = await self._dispatch(method, params)
+                    response = {"id": msg.get("id"), "result": result}
+                except Exception as e:
+                    response = {"id": msg.get("id"), "error": f"{type(e).__name__}: {e}"}
+                # Scanner results are models; models.dumps serializes them as dicts
+                writer.write(models.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Clients hanging up, or the daemon shutting down underneath them
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: Optional[str], params: Dict[str, Any]) -> Any:
+        if method in self._handlers:
+            return await self._handlers[method](**params)
+        if method and method.startswith("pumpportal."):
+            return await self.pumpportal(method.split(".", 1)[1], **params)
+        raise ValueError(f"unknown method {method!r}")
+
+    async def ping(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "rpc_endpoints": list(self._rpc),
+            "cached_transactions": len(self.transactions),
+            "lookup_tables": lookup_tables.shared_cache().stats(),
+            "prices": prices.shared_price_service().stats(),
+            "feeds": {uri: len(feed.subscribers) for uri, feed in self._feeds.items()},
+            "rate_limits": ratelimit.snapshot(),
+            "prover": self._prover.stats() if self._prover is not None else None
+        }
+
+    async def stop(self) -> bool:
+        asyncio.get_running_loop().call_soon(self._server.close)
+        return True
+
+    def _rpc_client(self, endpoint: str) -> Any:
+        client = self._rpc.get(endpoint)
+        if client is None:
+            client = self._rpc[endpoint] = ratelimit.async_solana_client(endpoint)
+        return client
+
+    async def scan(self, endpoint: str, limit: int = 5) -> List[Dict[str, Any]]:
+        from utils.pumpfun import scan_program_async
+        results = await scan_program_async(self._rpc_client(endpoint), limit, self.transactions)
+        while len(self.transactions) > TRANSACTION_CACHE_SIZE:
+            self.transactions.popitem(last=False)
+        return results
+
+    async def blockhash(self, endpoint: str, commitment: str = "confirmed") -> Optional[Dict[str, Any]]:
+        from utils.blockhash import shared_blockhash_cache
+        cache = shared_blockhash_cache(endpoint, commitment)
+        snapshot = cache.current() or await asyncio.get_running_loop().run_in_executor(None, cache.get)
+        if snapshot is None:
+            return None
+        return {"blockhash": str(snapshot.blockhash), "last_valid_block_height": snapshot.last_valid_block_height,
+                "slot": snapshot.slot, "age_s": round(snapshot.age, 3)}
+
+    async def priority_fees(self, endpoint: str, accounts: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        from utils.fees import shared_fee_estimator
+        estimator = shared_fee_estimator(endpoint)
+        estimate = await asyncio.get_running_loop().run_in_executor(None, estimator.estimate, accounts)
+        return estimate.to_dict() if estimate is not None else None
+
+    async def prices(self, mint: Optional[str] = None, wait: float = 0.0) -> Optional[Dict[str, Any]]:
+        """One mint's cached USD price and age (default SOL); the mint stays watched from then on"""
+        service = prices.shared_price_service()
+        mint = mint or prices.SOL_MINT
+        service.watch(mint)
+        snapshot = service.snapshot
+        if mint not in snapshot.prices and wait > 0:
+            snapshot = await asyncio.get_running_loop().run_in_executor(None, service.wait, wait)
+        return snapshot.to_dict().get(mint)
+
+    async def pumpportal(self, method: str, args: Optional[List[Any]] = None) -> Any:
+        if method not in PUMPPORTAL_TTLS:
+            raise ValueError(f"unknown PumpPortal method {method!r}")
+        if self._scanner is None:
+            from pump_cli import PumpPortalScanner
+            self._scanner = PumpPortalScanner()
+        args = list(args or [])
+        loop = asyncio.get_running_loop()
+        fetch = lambda: loop.run_in_executor(None, lambda: getattr(self._scanner, method)(*args))
+        return await self._responses.get((method, *args), PUMPPORTAL_TTLS[method], fetch)
+
+    async def send_job(self, address: str, ciphertext: str, timeout: float = 10.0) -> str:
+        """Relay an already-encrypted job (hex) over a kept-open REQ socket; returns the encrypted ack (hex)"""
+        import zmq
+        lock = self._agent_locks.setdefault(address, threading.Lock())
+
+        def exchange() -> bytes:
+            with lock:
+                agent = self._agents.get(address)
+                if agent is None:
+                    agent = zmq.Context.instance().socket(zmq.REQ)
+                    agent.setsockopt(zmq.RCVTIMEO, int(timeout * 1000))
+                    agent.connect(address)
+                    self._agents[address] = agent
+                try:
+                    agent.send(bytes.fromhex(ciphertext))
+                    return agent.recv()
+                except Exception:
+                    # A REQ socket is stuck after a failed exchange; start over next time
+                    self._agents.pop(address, None)
+                    agent.close(linger=0)
+                    raise
+
+        return (await asyncio.get_running_loop().run_in_executor(None, exchange)).hex()
+
+    async def prove(self, preimages: List[str], workers: int = 2) -> Dict[str, Any]:
+        """
+        Proofs from a pool of Node workers started on first use and kept with their circuit loaded.
+        The pool is rebuilt when every worker has exited (crashed, OOM-killed), or at another
+        size when `workers` changes while it is idle.
+        """
+        from utils.zk_prover import ProverPool
+        loop = asyncio.get_running_loop()
+        async with self._prover_lock:
+            prover = self._prover
+            if prover is not None:
+                stats = prover.stats()
+                dead = not any(w["alive"] for w in stats["workers"])
+                idle = not stats["queued"] and not any(w["pending"] for w in stats["workers"])
+                if dead or (prover.size != max(1, workers) and idle):
+                    self._prover = None
+                    await loop.run_in_executor(None, prover.close)
+            if self._prover is None:
+                prover = ProverPool(workers=workers)
+                await loop.run_in_executor(None, prover.start)
+                self._prover = prover
+            prover = self._prover
+        futures = [asyncio.wrap_future(prover.submit(preimage)) for preimage in preimages]
+        return {"proofs": await asyncio.gather(*futures), "stats": prover.stats()}
+
+    async def _livefeed(
+        self,
+        request_id: Any,
+        params: Dict[str, Any],
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        uri = params["uri"]
+        feed = self._feeds.get(uri)
+        if feed is None:
+            feed = self._feeds[uri] = _Feed(uri)
+        queue = await feed.add(params.get("subscriptions") or [])
+        # Stop as soon as the client hangs up rather than on the next failed write
+        streaming = asyncio.current_task()
+        hangup = asyncio.ensure_future(reader.read())
+        stop = lambda _: streaming.cancel()
+        hangup.add_done_callback(stop)
+        try:
+            while True:
+                event = await queue.get()
+                writer.write(models.dumps({"id": request_id, "event": event}).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            hangup.remove_done_callback(stop)
+            hangup.cancel()
+            feed.remove(queue)
+
+def start_daemon_thread(path: Optional[Path] = None, timeout: float = 10.0) -> GrimDaemon:
+    """Run a daemon on a background thread (for embedding and benchmarks)"""
+    daemon = GrimDaemon(path)
+    threading.Thread(target=daemon.run, name="grimnode-daemon", daemon=True).start()
+    if not daemon.ready.wait(timeout):
+        raise RuntimeError("daemon did not start")
+    return daemon
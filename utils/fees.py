@@ -0,0 +1,213 @@
+"""
+Fees utility for GrimBundle
+Priority-fee estimates from getRecentPrioritizationFees, kept per set of accounts
+a bundle writes to and turned into compute-unit price recommendations for a
+target landing probability
+
+Each sample is, for one recent slot, the lowest compute-unit price (micro-lamports)
+that landed a transaction locking those accounts. Paying the p-th percentile of
+recent samples would have been enough in a fraction p of recent slots, so that
+percentile is the price recommended for landing probability p.
+"""
+
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple
+import bisect
+import math
+import threading
+import time
+
+from utils import metrics, ratelimit
+
+# A slot's fee is charged per signature on top of the priority fee
+BASE_FEE_LAMPORTS = 5000
+MICRO_LAMPORTS_PER_LAMPORT = 1_000_000
+# Used when no recent fees are available
+DEFAULT_COMPUTE_UNIT_PRICE = 5000
+# The runtime's default per-instruction limit; what a transaction without a limit is budgeted
+DEFAULT_COMPUTE_UNIT_LIMIT = 200_000
+# Never recommend more than this (micro-lamports per compute unit)
+MAX_COMPUTE_UNIT_PRICE = 5_000_000
+DEFAULT_LANDING_PROBABILITY = 0.75
+# Recommendations published with every estimate
+LANDING_TARGETS = (0.5, 0.75, 0.9, 0.99)
+# The RPC keeps fees for the last 150 slots and takes at most 128 accounts
+WINDOW_SLOTS = 150
+MAX_ACCOUNTS = 128
+# Estimates are reused this long before new slots are fetched
+DEFAULT_TTL = 2.0
+# Account sets tracked before the estimator starts over
+MAX_ACCOUNT_SETS = 1024
+
+class FeeEstimate(NamedTuple):
+    accounts: Tuple[str, ...]
+    fees: Tuple[int, ...]  # per-slot samples, sorted
+    newest_slot: int
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def price(self, probability: float = DEFAULT_LANDING_PROBABILITY) -> int:
+        """Compute-unit price (micro-lamports) that landed in `probability` of recent slots"""
+        if not self.fees:
+            return DEFAULT_COMPUTE_UNIT_PRICE
+        probability = min(1.0, max(0.0, probability))
+        rank = min(len(self.fees) - 1, max(0, math.ceil(probability * len(self.fees)) - 1))
+        return min(MAX_COMPUTE_UNIT_PRICE, self.fees[rank])
+
+    def recommendations(self) -> Dict[str, int]:
+        return {f"p{round(p * 100)}": self.price(p) for p in LANDING_TARGETS}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"accounts": list(self.accounts), "fees": list(self.fees), "newest_slot": self.newest_slot,
+                "slots": len(self.fees), "age_s": round(self.age, 3), "recommended": self.recommendations()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FeeEstimate":
+        """Revive an estimate from to_dict() (e.g. a daemon's reply), keeping its age"""
+        return cls(tuple(data.get("accounts", ())), tuple(data.get("fees", ())), data.get("newest_slot", 0),
+                   time.monotonic() - data.get("age_s", 0.0))
+
+class _FeeSeries:
+    """Recent per-slot fees for one account set, kept sorted as slots arrive and age out"""
+
+    def __init__(self, accounts: Tuple[str, ...]):
+        self.accounts = accounts
+        self.by_slot: Dict[int, int] = {}
+        self.ordered: List[int] = []
+        self.newest_slot = 0
+        self.fetched_at = 0.0
+
+    def update(self, samples: Iterable[Tuple[int, int]]) -> None:
+        for slot, fee in samples:
+            if slot in self.by_slot:
+                continue
+            self.by_slot[slot] = fee
+            bisect.insort(self.ordered, fee)
+            self.newest_slot = max(self.newest_slot, slot)
+        oldest = self.newest_slot - WINDOW_SLOTS
+        for slot in [s for s in self.by_slot if s <= oldest]:
+            fee = self.by_slot.pop(slot)
+            del self.ordered[bisect.bisect_left(self.ordered, fee)]
+        self.fetched_at = time.monotonic()
+
+    def snapshot(self) -> FeeEstimate:
+        return FeeEstimate(self.accounts, tuple(self.ordered), self.newest_slot, self.fetched_at)
+
+def _account_key(accounts: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    return tuple(sorted(set(accounts or ())))[:MAX_ACCOUNTS]
+
+class FeeEstimator:
+    """
+    Recent priority fees for an RPC endpoint, one series per account set.
+
+    An estimate younger than ttl is served from memory; after that only the
+    new slots are merged into the series (older ones age out), so each account
+    set's sorted samples are updated incrementally rather than rebuilt.
+    """
+
+    def __init__(self, endpoint: str, ttl: float = DEFAULT_TTL, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.ttl = ttl
+        self.timeout = timeout
+        self._series: Dict[Tuple[str, ...], _FeeSeries] = {}
+        self._lock = threading.Lock()
+
+    def estimate(self, accounts: Optional[Iterable[str]] = None) -> Optional[FeeEstimate]:
+        """
+        Fee estimate for transactions writing to these accounts
+
+        Args:
+            accounts: Writable accounts the transactions lock (none: the global fee market)
+
+        Returns:
+            The current estimate, refreshed if older than ttl; the last one (or None)
+            if the RPC call fails
+        """
+        key = _account_key(accounts)
+        series = self._series.get(key)
+        if series is not None and time.monotonic() - series.fetched_at < self.ttl:
+            return series.snapshot()
+        samples = self._fetch(key)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if len(self._series) >= MAX_ACCOUNT_SETS:
+                    self._series.clear()
+                series = self._series[key] = _FeeSeries(key)
+            if samples is None:
+                return series.snapshot() if series.fetched_at else None
+            series.update(samples)
+            return series.snapshot()
+
+    def recommend(
+        self,
+        accounts: Optional[Iterable[str]] = None,
+        probability: float = DEFAULT_LANDING_PROBABILITY
+    ) -> int:
+        """Compute-unit price (micro-lamports) for a target landing probability"""
+        estimate = self.estimate(accounts)
+        return estimate.price(probability) if estimate is not None else DEFAULT_COMPUTE_UNIT_PRICE
+
+    def _fetch(self, accounts: Tuple[str, ...]) -> Optional[List[Tuple[int, int]]]:
+        payload = {"jsonrpc": "2.0", "id": 1, "method": "getRecentPrioritizationFees", "params": [list(accounts)]}
+        try:
+            with metrics.track("solana_rpc", "getRecentPrioritizationFees"):
+                resp = ratelimit.session().post(self.endpoint, json=payload, timeout=self.timeout)
+                resp.raise_for_status()
+                data = resp.json()
+            if "error" in data:
+                raise RuntimeError(data["error"].get("message", data["error"]))
+            return [(row["slot"], row["prioritizationFee"]) for row in data.get("result") or ()]
+        except Exception as e:
+            print(f"Error fetching prioritization fees: {e}")
+            return None
+
+_shared: Dict[str, FeeEstimator] = {}
+_shared_lock = threading.Lock()
+
+def shared_fee_estimator(endpoint: str) -> FeeEstimator:
+    """Process-wide estimator for an endpoint"""
+    with _shared_lock:
+        estimator = _shared.get(endpoint)
+        if estimator is None:
+            estimator = _shared[endpoint] = FeeEstimator(endpoint)
+        return estimator
+
+def priority_fee_lamports(compute_units: int, compute_unit_price: int) -> int:
+    """Priority fee for a compute-unit limit at a price in micro-lamports, rounded up as the runtime does"""
+    return -(-compute_units * compute_unit_price // MICRO_LAMPORTS_PER_LAMPORT)
+
+def compute_budget_instructions(compute_units: int, compute_unit_price: int) -> List[Any]:
+    """SetComputeUnitLimit and SetComputeUnitPrice instructions to put first in a transaction"""
+    from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+    return [set_compute_unit_limit(compute_units), set_compute_unit_price(compute_unit_price)]
+
+def contended_accounts(messages: Iterable[Any]) -> List[str]:
+    """Writable, non-signer accounts of these messages: the locks priority fees compete for"""
+    accounts = []
+    for message in messages:
+        keys = message.account_keys
+        accounts.extend(str(keys[i]) for i in range(len(keys)) if message.is_writable(i) and not message.is_signer(i))
+    return list(dict.fromkeys(accounts))
+
+def with_compute_budget(message: Any, compute_units: int, compute_unit_price: int) -> Any:
+    """
+    A legacy message rebuilt with SetComputeUnitLimit and SetComputeUnitPrice first
+
+    Compute budget instructions already in the message are replaced; the fee payer,
+    signers and blockhash stay the same, so the same keypairs sign the result.
+    """
+    from solders.compute_budget import ID as COMPUTE_BUDGET_PROGRAM
+    from solders.instruction import AccountMeta, Instruction
+    from solders.message import Message
+    keys = message.account_keys
+    instructions = [
+        Instruction(keys[ix.program_id_index], bytes(ix.data),
+                    [AccountMeta(keys[i], message.is_signer(i), message.is_writable(i)) for i in ix.accounts])
+        for ix in message.instructions if keys[ix.program_id_index] != COMPUTE_BUDGET_PROGRAM
+    ]
+    return Message.new_with_blockhash(
+        compute_budget_instructions(compute_units, compute_unit_price) + instructions, keys[0], message.recent_blockhash
+    )
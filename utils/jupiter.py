@@ -3,11 +3,13 @@ Jupiter Aggregator API utility for GrimBundle
 Fetches swap routes and builds transactions for Solana swaps
 """
 
-import requests
 from typing import Dict, Any, List, Optional
 
+from utils import metrics, ratelimit
+
 JUPITER_API = "https://quote-api.jup.ag/v6/quote"
 JUPITER_SWAP_API = "https://quote-api.jup.ag/v6/swap"
+JUPITER_PRICE_API = "https://api.jup.ag/price/v2"
 
 # Fetch swap routes from Jupiter
 
@@ -29,9 +31,10 @@ def fetch_jupiter_routes(
     if user_public_key:
         params["userPublicKey"] = user_public_key
     try:
-        resp = requests.get(JUPITER_API, params=params)
-        resp.raise_for_status()
-        data = resp.json()
+        with metrics.track("jupiter", "quote"):
+            resp = ratelimit.session().get(JUPITER_API, params=params)
+            resp.raise_for_status()
+            data = resp.json()
         return data.get("data", [])
     except Exception as e:
         print(f"Error fetching Jupiter routes: {e}")
@@ -45,14 +48,63 @@ def build_jupiter_swap_tx(
 ) -> Optional[Dict[str, Any]]:
     """Build a swap transaction using Jupiter Aggregator API"""
     try:
-        resp = requests.post(JUPITER_SWAP_API, json={
-            "route": route,
-            "userPublicKey": user_public_key,
-            "wrapUnwrapSOL": True,
-            "asLegacyTransaction": True
-        })
+        with metrics.track("jupiter", "swap"):
+            resp = ratelimit.session().post(JUPITER_SWAP_API, json={
+                "route": route,
+                "userPublicKey": user_public_key,
+                "wrapUnwrapSOL": True,
+                "asLegacyTransaction": True
+            })
+            resp.raise_for_status()
+            return resp.json()
+    except Exception as e:
+        print(f"Error building Jupiter swap transaction: {e}")
+        return None
+
+# Fetch a single best quote from Jupiter
+
+def get_jupiter_quote(
+    input_mint: str,
+    output_mint: str,
+    amount: int,
+    slippage_bps: int = 50,
+    timeout: float = 5.0
+) -> Dict[str, Any]:
+    """fetch_jupiter_quote() that raises on failure, for callers that handle errors themselves"""
+    params = {"inputMint": input_mint, "outputMint": output_mint, "amount": amount, "slippageBps": slippage_bps}
+    with metrics.track("jupiter", "quote"):
+        resp = ratelimit.session().get(JUPITER_API, params=params, timeout=timeout)
         resp.raise_for_status()
         return resp.json()
+
+def fetch_jupiter_quote(
+    input_mint: str,
+    output_mint: str,
+    amount: int,
+    slippage_bps: int = 50,
+    timeout: float = 5.0
+) -> Optional[Dict[str, Any]]:
+    """Best quote for swapping `amount` base units of input_mint (inAmount, outAmount, routePlan, ...)"""
+    try:
+        return get_jupiter_quote(input_mint, output_mint, amount, slippage_bps, timeout)
     except Exception as e:
-        print(f"Error building Jupiter swap transaction: {e}")
-        return None 
\ No newline at end of file
+        print(f"Error fetching Jupiter quote: {e}")
+        return None
+
+# Fetch USD prices for several mints in one call
+
+def get_jupiter_prices(mints: List[str], timeout: float = 5.0) -> Dict[str, float]:
+    """fetch_jupiter_prices() that raises on failure"""
+    with metrics.track("jupiter", "price"):
+        resp = ratelimit.session().get(JUPITER_PRICE_API, params={"ids": ",".join(mints)}, timeout=timeout)
+        resp.raise_for_status()
+        data = resp.json().get("data") or {}
+    return {mint: float(row["price"]) for mint, row in data.items() if row and row.get("price") is not None}
+
+def fetch_jupiter_prices(mints: List[str], timeout: float = 5.0) -> Dict[str, float]:
+    """USD price per whole token for each mint the Price API knows"""
+    try:
+        return get_jupiter_prices(mints, timeout)
+    except Exception as e:
+        print(f"Error fetching Jupiter prices: {e}")
+        return {}
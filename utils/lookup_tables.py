@@ -0,0 +1,197 @@
+"""
+Lookup tables utility for GrimBundle
+Resolves the full account key list of versioned (v0) transactions: static keys,
+then addresses loaded from address lookup tables (writable, then readonly),
+which is the index space used by both top-level and inner instructions
+
+getTransaction responses normally carry the loaded addresses in their meta, so
+resolution costs nothing. When a response has lookups but no loaded addresses,
+table contents come from a process-wide cache. Lookup tables are append-only,
+so a cached table stays correct for every index it holds. An entry is only
+refetched when a transaction from a later slot than the fetch uses an index
+past the cached end, i.e. the table has since been extended.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import threading
+
+from utils import metrics
+
+# Tables kept before the cache starts over
+MAX_TABLES = 4096
+# getMultipleAccounts takes at most this many keys per call
+FETCH_BATCH = 100
+
+class LookupTableError(ValueError):
+    """A transaction's lookups can't be resolved against the table contents"""
+
+class LookupTableCache:
+    """
+    Address lookup table contents by table address, each with the slot it was read at.
+
+    Readers only touch the dict; fetch()/fetch_async() fill in the tables that
+    missing() reports, with one getMultipleAccounts call per FETCH_BATCH tables.
+    """
+
+    def __init__(self, max_tables: int = MAX_TABLES):
+        self.max_tables = max_tables
+        self._tables: Dict[str, Tuple[Tuple[str, ...], int]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.fetched = 0
+
+    def addresses(self, table: str) -> Optional[Tuple[str, ...]]:
+        entry = self._tables.get(table)
+        return entry[0] if entry else None
+
+    def store(self, table: str, addresses: Iterable[str], slot: int) -> None:
+        with self._lock:
+            current = self._tables.get(table)
+            # A response from an older slot can't shrink what a newer one returned
+            if current is not None and current[1] > slot:
+                return
+            if current is None and len(self._tables) >= self.max_tables:
+                self._tables.clear()
+            self._tables[table] = (tuple(addresses), slot)
+
+    def missing(self, lookups: Optional[List[Any]], slot: Optional[int]) -> List[str]:
+        """Tables some of these lookups (message.address_table_lookups) can't be resolved from yet"""
+        wanted = []
+        for lookup in lookups or ():
+            table = str(lookup.account_key)
+            entry = self._tables.get(table)
+            highest = max([*lookup.writable_indexes, *lookup.readonly_indexes], default=-1)
+            if entry is None or (highest >= len(entry[0]) and (slot is None or entry[1] < slot)):
+                wanted.append(table)
+        return wanted
+
+    def resolve(self, lookups: Optional[List[Any]], slot: Optional[int] = None) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Loaded (writable, readonly) addresses for a message's lookups
+
+        Returns:
+            The two address lists, or None if a table still has to be fetched;
+            raises LookupTableError if a fresh enough table lacks an index
+        """
+        writable: List[str] = []
+        readonly: List[str] = []
+        for lookup in lookups or ():
+            entry = self._tables.get(str(lookup.account_key))
+            if entry is None:
+                return None
+            addresses, fetched_at = entry
+            try:
+                writable.extend(addresses[i] for i in lookup.writable_indexes)
+                readonly.extend(addresses[i] for i in lookup.readonly_indexes)
+            except IndexError:
+                if slot is None or fetched_at < slot:
+                    return None
+                raise LookupTableError(f"lookup table {lookup.account_key} has no such index at slot {slot}")
+        self.hits += 1
+        return writable, readonly
+
+    def fetch(self, client: Any, tables: List[str]) -> None:
+        """Read tables with a sync solana Client"""
+        from solders.pubkey import Pubkey
+        for start in range(0, len(tables), FETCH_BATCH):
+            batch = tables[start:start + FETCH_BATCH]
+            with metrics.track("solana_rpc", "getMultipleAccounts"):
+                response = client.get_multiple_accounts([Pubkey.from_string(t) for t in batch])
+            self._store_accounts(batch, response)
+
+    async def fetch_async(self, client: Any, tables: List[str]) -> None:
+        """fetch() with an AsyncClient"""
+        from solders.pubkey import Pubkey
+        for start in range(0, len(tables), FETCH_BATCH):
+            batch = tables[start:start + FETCH_BATCH]
+            with metrics.track("solana_rpc", "getMultipleAccounts"):
+                response = await client.get_multiple_accounts([Pubkey.from_string(t) for t in batch])
+            self._store_accounts(batch, response)
+
+    def _store_accounts(self, tables: List[str], response: Any) -> None:
+        from solders.address_lookup_table_account import AddressLookupTable
+        slot = response.context.slot
+        for table, account in zip(tables, response.value):
+            if account is None:
+                # Closed, or never existed; leave it unresolved
+                continue
+            try:
+                parsed = AddressLookupTable.deserialize(bytes(account.data))
+            except Exception:
+                continue
+            self.store(table, (str(address) for address in parsed.addresses), slot)
+            self.fetched += 1
+            metrics.count("lookup_tables", outcome="fetched")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+        self.hits = self.fetched = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tables": len(self._tables), "hits": self.hits, "fetched": self.fetched}
+
+_shared = LookupTableCache()
+
+def shared_cache() -> LookupTableCache:
+    """The process-wide cache used when callers don't pass their own"""
+    return _shared
+
+def _parts(tx_response: Any) -> Optional[Tuple[Any, Any, Any]]:
+    value = tx_response.value
+    if not (value and value.transaction and value.transaction.transaction):
+        return None
+    return value, value.transaction.transaction.message, value.transaction.meta
+
+def account_keys(tx_response: Any, cache: Optional[LookupTableCache] = None) -> Optional[List[str]]:
+    """
+    Every account key an instruction index of this transaction can refer to
+
+    Args:
+        tx_response: Response of get_transaction(..., max_supported_transaction_version=0)
+        cache: Lookup table cache for responses without loaded addresses (default: shared_cache())
+
+    Returns:
+        Static keys, then loaded writable, then loaded readonly addresses, or None if
+        the response carried no transaction or a lookup table still has to be fetched
+    """
+    parts = _parts(tx_response)
+    if parts is None:
+        return None
+    value, message, meta = parts
+    keys = [str(key) for key in message.account_keys]
+    lookups = getattr(message, "address_table_lookups", None)
+    if not lookups:
+        return keys
+    loaded = meta.loaded_addresses if meta is not None else None
+    if loaded is not None:
+        return keys + [str(key) for key in loaded.writable] + [str(key) for key in loaded.readonly]
+    resolved = (cache or _shared).resolve(lookups, value.slot)
+    if resolved is None:
+        return None
+    return keys + resolved[0] + resolved[1]
+
+def tables_to_fetch(tx_response: Any, cache: Optional[LookupTableCache] = None) -> List[str]:
+    """Lookup tables account_keys() would need fetched first (none when the meta has loaded addresses)"""
+    parts = _parts(tx_response)
+    if parts is None:
+        return []
+    value, message, meta = parts
+    lookups = getattr(message, "address_table_lookups", None)
+    if not lookups or (meta is not None and meta.loaded_addresses is not None):
+        return []
+    return (cache or _shared).missing(lookups, value.slot)
+
+def prepare(client: Any, tx_responses: Iterable[Any], cache: Optional[LookupTableCache] = None) -> None:
+    """Fetch, in one pass, every table these responses need (sync Client)"""
+    cache = cache or _shared
+    wanted = {table for response in tx_responses for table in tables_to_fetch(response, cache)}
+    if wanted:
+        cache.fetch(client, sorted(wanted))
+
+async def prepare_async(client: Any, tx_responses: Iterable[Any], cache: Optional[LookupTableCache] = None) -> None:
+    """prepare() with an AsyncClient"""
+    cache = cache or _shared
+    wanted = {table for response in tx_responses for table in tables_to_fetch(response, cache)}
+    if wanted:
+        await cache.fetch_async(client, sorted(wanted))
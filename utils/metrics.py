@@ -0,0 +1,268 @@
+"""
+Metrics utility for GrimBundle
+Per-call latency histograms, error counters and in-flight gauges for every
+outbound call, exported as Prometheus text over HTTP or as a periodic JSON dump
+
+Instrumentation is off unless enabled (GRIMNODE_METRICS=1, or one of the
+exporter variables below); while off, track() hands back a shared no-op
+context manager and count() returns immediately.
+
+    GRIMNODE_METRICS_PORT=9464           serve /metrics on this port
+    GRIMNODE_METRICS_FILE=metrics.json   rewrite this file every interval
+    GRIMNODE_METRICS_INTERVAL=10         seconds between JSON dumps
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+
+# Upper bounds in seconds, from a local ZeroMQ hop to a slow RPC page
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+ENABLED = False
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+class CallSeries:
+    """Latency, errors and in-flight count for one (client, operation) pair"""
+
+    def __init__(self, client: str, operation: str):
+        self.client = client
+        self.operation = operation
+        self.latency = Histogram()
+        self.errors = 0
+        self.in_flight = 0
+        self.lock = threading.Lock()
+
+class _Call:
+    __slots__ = ("series", "started")
+
+    def __init__(self, series: CallSeries):
+        self.series = series
+
+    def __enter__(self) -> "_Call":
+        with self.series.lock:
+            self.series.in_flight += 1
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        elapsed = time.perf_counter() - self.started
+        series = self.series
+        with series.lock:
+            series.in_flight -= 1
+            series.latency.observe(elapsed)
+            if exc_type is not None:
+                series.errors += 1
+        return False
+
+class _NoopCall:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopCall":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+_NOOP = _NoopCall()
+_calls: Dict[Tuple[str, str], CallSeries] = {}
+_counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], int] = {}
+_registry_lock = threading.Lock()
+
+def track(client: str, operation: str):
+    """
+    Context manager timing one outbound call
+
+    Args:
+        client: Remote service, e.g. "pumpportal" or "solana_rpc"
+        operation: API method or endpoint being called
+
+    Returns:
+        A context manager; an exception escaping it counts as an error
+    """
+    if not ENABLED:
+        return _NOOP
+    series = _calls.get((client, operation))
+    if series is None:
+        with _registry_lock:
+            series = _calls.setdefault((client, operation), CallSeries(client, operation))
+    return _Call(series)
+
+def count(name: str, value: int = 1, **labels: str) -> None:
+    """Add to a labelled counter, e.g. websocket messages per feed and event type"""
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _registry_lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def enable() -> None:
+    global ENABLED
+    ENABLED = True
+
+def disable() -> None:
+    global ENABLED
+    ENABLED = False
+
+def reset() -> None:
+    """Drop every recorded series"""
+    with _registry_lock:
+        _calls.clear()
+        _counters.clear()
+
+def snapshot() -> Dict[str, Any]:
+    """Current values of every metric as plain data"""
+    with _registry_lock:
+        calls = list(_calls.values())
+        counters = dict(_counters)
+    result: List[Dict[str, Any]] = []
+    for series in calls:
+        with series.lock:
+            latency = series.latency
+            result.append({
+                "client": series.client,
+                "operation": series.operation,
+                "count": latency.count,
+                "errors": series.errors,
+                "in_flight": series.in_flight,
+                "sum_s": round(latency.sum, 6),
+                "mean_ms": round(latency.sum / latency.count * 1000, 3) if latency.count else None,
+                "p50_ms": _ms(latency.quantile(0.50)),
+                "p99_ms": _ms(latency.quantile(0.99)),
+                "buckets": dict(zip([str(b) for b in latency.buckets] + ["+Inf"], latency.counts))
+            })
+    return {
+        "timestamp": time.time(),
+        "calls": result,
+        "counters": [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in counters.items()]
+    }
+
+def prometheus_text() -> str:
+    """Every metric in the Prometheus text exposition format"""
+    with _registry_lock:
+        calls = list(_calls.values())
+        counters = dict(_counters)
+    lines = [
+        "# HELP grimnode_call_duration_seconds Outbound call latency",
+        "# TYPE grimnode_call_duration_seconds histogram"
+    ]
+    errors, in_flight = [], []
+    for series in calls:
+        labels = f'client="{_escape(series.client)}",operation="{_escape(series.operation)}"'
+        with series.lock:
+            latency = series.latency
+            cumulative = 0
+            for bound, n in zip(list(latency.buckets) + ["+Inf"], latency.counts):
+                cumulative += n
+                lines.append(f'grimnode_call_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"grimnode_call_duration_seconds_sum{{{labels}}} {latency.sum}")
+            lines.append(f"grimnode_call_duration_seconds_count{{{labels}}} {latency.count}")
+            errors.append(f"grimnode_call_errors_total{{{labels}}} {series.errors}")
+            in_flight.append(f"grimnode_calls_in_flight{{{labels}}} {series.in_flight}")
+    lines += ["# HELP grimnode_call_errors_total Outbound calls that raised", "# TYPE grimnode_call_errors_total counter"]
+    lines += errors
+    lines += ["# HELP grimnode_calls_in_flight Outbound calls currently running", "# TYPE grimnode_calls_in_flight gauge"]
+    lines += in_flight
+    for name in sorted({name for name, _ in counters}):
+        lines.append(f"# TYPE grimnode_{name}_total counter")
+        for (counter, labels), value in counters.items():
+            if counter == name:
+                rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"grimnode_{name}_total{{{rendered}}} {value}")
+    return "\n".join(lines) + "\n"
+
+def serve_http(port: int, host: str = "127.0.0.1"):
+    """Enable metrics and serve /metrics in Prometheus text format from a daemon thread"""
+    # Imported here so CLI start-up doesn't pay for http.server when no exporter runs
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    enable()
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+def dump_json(path: str) -> None:
+    """Write the current snapshot to path atomically"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(snapshot(), f, indent=2)
+    os.replace(tmp, path)
+
+def start_json_dump(path: str, interval: float = 10.0) -> threading.Event:
+    """Enable metrics and rewrite path every interval seconds (and once more at exit); set the event to stop"""
+    enable()
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                dump_json(path)
+            except Exception as e:
+                print(f"Error writing metrics to {path}: {e}")
+
+    threading.Thread(target=run, name="metrics-dump", daemon=True).start()
+    atexit.register(dump_json, path)
+    return stop
+
+def configure_from_env() -> None:
+    """Turn on instrumentation and exporters as requested by GRIMNODE_METRICS* variables"""
+    port = os.getenv("GRIMNODE_METRICS_PORT")
+    path = os.getenv("GRIMNODE_METRICS_FILE")
+    if os.getenv("GRIMNODE_METRICS", "").lower() in ("1", "true", "yes"):
+        enable()
+    try:
+        if port:
+            serve_http(int(port), os.getenv("GRIMNODE_METRICS_HOST", "127.0.0.1"))
+        if path:
+            start_json_dump(path, float(os.getenv("GRIMNODE_METRICS_INTERVAL", "10")))
+    except Exception as e:
+        print(f"Error starting metrics exporter: {e}")
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,315 @@
+"""
+Models utility for GrimBundle
+Compact __slots__ models for PumpPortal tokens, trades and livefeed events,
+built by schema-specific decoders on the fastest available JSON backend
+(orjson when installed, the standard library otherwise)
+
+Decoders accept both the REST field names (market_cap, sol_amount, ...) and the
+websocket ones (marketCapSol, solAmount, traderPublicKey, txType, ...) and fill
+in defaults, so consumers read attributes instead of repeating .get() fallbacks.
+Each model's decoder is generated once per payload key layout (a given API or
+feed always sends the same keys), so decoding is straight-line attribute
+assignment with no per-field lookups of alternative names.
+"""
+
+from typing import Dict, Any, List, Optional, Union
+import sys
+
+try:
+    import orjson
+
+    BACKEND = "orjson"
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=plain, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    import json
+
+    BACKEND = "json"
+    loads = json.loads
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, default=plain)
+
+# Livefeed methods (or flat-event txTypes) by the kind of payload they carry
+EVENT_KINDS = {
+    "newToken": "new_token",
+    "create": "new_token",
+    "tokenTrade": "trade",
+    "accountTrade": "trade",
+    "buy": "trade",
+    "sell": "trade",
+    "migration": "migration",
+    "migrate": "migration"
+}
+
+# Generated decoders are cached per (model, key layout); past this many the cache starts over
+MAX_LAYOUTS = 512
+
+_intern = sys.intern
+
+def _num(value: Any) -> float:
+    if value.__class__ is float:
+        return value
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def _str(value: Any) -> str:
+    if value.__class__ is str:
+        return value
+    return "" if value is None else str(value)
+
+_decoders: Dict[tuple, Any] = {}
+
+_CONVERSIONS = {
+    "str": "v if v.__class__ is str else _str(v)",
+    "intern": "_intern(v if v.__class__ is str else _str(v))",
+    "num": "v if v.__class__ is float else _num(v)"
+}
+
+def _compile_decoder(model: type, layout: tuple) -> Any:
+    """
+    Straight-line decoder for one model and one payload key layout
+
+    Each schema entry is (slot, conversion, source keys in priority order, default);
+    the first source key present in the layout feeds the slot, else the default is used.
+    A conversion of "side" reads txType == "buy", falling back to is_buy.
+    """
+    present = set(layout)
+    lines = ["def _decode(d):", "    self = _new(_model)"]
+    for slot, conversion, keys, default in model._schema:
+        key = next((k for k in keys if k in present), None)
+        if conversion == "side":
+            if "txType" in present:
+                lines.append(f"    self.{slot} = d['txType'] == 'buy'")
+            else:
+                lines.append(f"    self.{slot} = bool(d['is_buy'])" if "is_buy" in present else f"    self.{slot} = {default!r}")
+        elif key is None:
+            lines.append(f"    self.{slot} = {default!r}")
+        else:
+            lines.append(f"    v = d[{key!r}]")
+            lines.append(f"    self.{slot} = {_CONVERSIONS[conversion]}")
+    lines.append("    return self")
+    namespace = {"_new": object.__new__, "_model": model, "_intern": _intern, "_str": _str, "_num": _num}
+    exec(compile("\n".join(lines), f"<decode:{model.__name__}>", "exec"), namespace)
+    return namespace["_decode"]
+
+def _decode(model: type, data: Dict[str, Any]) -> Any:
+    cache_key = (model, tuple(data))
+    decoder = _decoders.get(cache_key)
+    if decoder is None:
+        if len(_decoders) >= MAX_LAYOUTS:
+            _decoders.clear()
+        decoder = _decoders[cache_key] = _compile_decoder(model, cache_key[1])
+    return decoder(data)
+
+class Token:
+    """One token, from the REST API or a newToken/create websocket event"""
+
+    __slots__ = ("mint", "name", "symbol", "creator", "description", "uri", "market_cap", "price", "volume_24h",
+                 "supply", "created_timestamp", "initial_buy_sol", "initial_buy_tokens", "website", "twitter",
+                 "telegram")
+
+    def __init__(
+        self,
+        mint: str = "",
+        name: str = "",
+        symbol: str = "",
+        creator: str = "",
+        description: str = "",
+        uri: str = "",
+        market_cap: float = 0.0,
+        price: float = 0.0,
+        volume_24h: float = 0.0,
+        supply: float = 0.0,
+        created_timestamp: float = 0.0,
+        initial_buy_sol: float = 0.0,
+        initial_buy_tokens: float = 0.0,
+        website: str = "",
+        twitter: str = "",
+        telegram: str = ""
+    ):
+        self.mint = mint
+        self.name = name
+        self.symbol = symbol
+        self.creator = creator
+        self.description = description
+        self.uri = uri
+        self.market_cap = market_cap
+        self.price = price
+        self.volume_24h = volume_24h
+        self.supply = supply
+        self.created_timestamp = created_timestamp
+        self.initial_buy_sol = initial_buy_sol
+        self.initial_buy_tokens = initial_buy_tokens
+        self.website = website
+        self.twitter = twitter
+        self.telegram = telegram
+
+    _schema = (
+        ("mint", "intern", ("mint",), ""),
+        ("name", "str", ("name",), ""),
+        ("symbol", "str", ("symbol",), ""),
+        # A websocket create event's trader is the creator
+        ("creator", "str", ("creator", "traderPublicKey"), ""),
+        ("description", "str", ("description",), ""),
+        ("uri", "str", ("uri",), ""),
+        ("market_cap", "num", ("market_cap", "marketCapSol"), 0.0),
+        ("price", "num", ("price",), 0.0),
+        ("volume_24h", "num", ("volume_24h",), 0.0),
+        ("supply", "num", ("supply", "totalSupply"), 0.0),
+        ("created_timestamp", "num", ("created_timestamp", "timestamp"), 0.0),
+        ("initial_buy_sol", "num", ("initial_buy_sol", "solAmount"), 0.0),
+        ("initial_buy_tokens", "num", ("initial_buy_tokens", "tokenAmount"), 0.0),
+        ("website", "str", ("website",), ""),
+        ("twitter", "str", ("twitter",), ""),
+        ("telegram", "str", ("telegram",), "")
+    )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Token":
+        return _decode(cls, data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Token) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"Token(mint={self.mint!r}, symbol={self.symbol!r}, market_cap={self.market_cap})"
+
+class Trade:
+    """One trade, from the REST API or a tokenTrade/accountTrade websocket event"""
+
+    __slots__ = ("mint", "trader", "is_buy", "sol_amount", "token_amount", "price", "market_cap", "timestamp",
+                 "signature")
+
+    def __init__(
+        self,
+        mint: str = "",
+        trader: str = "",
+        is_buy: bool = True,
+        sol_amount: float = 0.0,
+        token_amount: float = 0.0,
+        price: float = 0.0,
+        market_cap: float = 0.0,
+        timestamp: float = 0.0,
+        signature: str = ""
+    ):
+        self.mint = mint
+        self.trader = trader
+        self.is_buy = is_buy
+        self.sol_amount = sol_amount
+        self.token_amount = token_amount
+        self.price = price
+        self.market_cap = market_cap
+        self.timestamp = timestamp
+        self.signature = signature
+
+    _schema = (
+        # The same few mints and wallets recur across thousands of trades
+        ("mint", "intern", ("mint",), ""),
+        ("trader", "intern", ("trader", "traderPublicKey"), ""),
+        ("is_buy", "side", (), True),
+        ("sol_amount", "num", ("sol_amount", "solAmount"), 0.0),
+        ("token_amount", "num", ("token_amount", "tokenAmount"), 0.0),
+        ("price", "num", ("price",), 0.0),
+        ("market_cap", "num", ("market_cap", "marketCapSol"), 0.0),
+        ("timestamp", "num", ("timestamp",), 0.0),
+        ("signature", "str", ("signature",), "")
+    )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Trade":
+        return _decode(cls, data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Trade) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        side = "buy" if self.is_buy else "sell"
+        return f"Trade(mint={self.mint!r}, {side} {self.sol_amount} SOL)"
+
+class LiveEvent:
+    """
+    One livefeed event.
+
+    kind is "new_token" (data is a Token), "trade" (data is a Trade),
+    "migration" or "other" (data is the event's raw payload dict).
+    """
+
+    __slots__ = ("method", "kind", "data")
+
+    def __init__(self, method: str, kind: str, data: Union[Token, Trade, Dict[str, Any]]):
+        self.method = method
+        self.kind = kind
+        self.data = data
+
+    @classmethod
+    def from_dict(cls, event: Dict[str, Any]) -> "LiveEvent":
+        data = event.get("data", event)
+        if not isinstance(data, dict):
+            return cls(_str(event.get("method")) or "unknown", "other", event)
+        method = event.get("method") or data.get("txType") or "unknown"
+        kind = EVENT_KINDS.get(method, "other")
+        if kind == "new_token":
+            return cls(method, kind, Token.from_dict(data))
+        if kind == "trade":
+            return cls(method, kind, Trade.from_dict(data))
+        return cls(method, kind, data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"method": self.method, "data": plain(self.data)}
+
+    def __repr__(self) -> str:
+        return f"LiveEvent({self.method!r}, {self.data!r})"
+
+Model = Union[Token, Trade, LiveEvent]
+
+def plain(obj: Any) -> Any:
+    """A model as JSON-ready dicts; also the `default` hook for json.dumps"""
+    if isinstance(obj, (Token, Trade, LiveEvent)):
+        return obj.to_dict()
+    if isinstance(obj, (list, tuple)):
+        # Covers NamedTuples, which orjson hands to this hook rather than encoding as arrays
+        return [plain(item) for item in obj]
+    if isinstance(obj, dict):
+        return obj
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+def decode_tokens(payload: Union[bytes, str], key: str = "tokens") -> List[Token]:
+    """Tokens from a REST response body ({"tokens": [...]} or a bare list)"""
+    data = loads(payload)
+    rows = data.get(key, []) if isinstance(data, dict) else data
+    return [Token.from_dict(row) for row in rows or ()]
+
+def decode_token(payload: Union[bytes, str], key: str = "token") -> Optional[Token]:
+    """The token of a single-token REST response, or None if it carries none"""
+    data = loads(payload)
+    row = data.get(key) if isinstance(data, dict) else None
+    return Token.from_dict(row) if row else None
+
+def decode_trades(payload: Union[bytes, str], key: str = "trades") -> List[Trade]:
+    """Trades from a REST response body ({"trades": [...]} or a bare list)"""
+    data = loads(payload)
+    rows = data.get(key, []) if isinstance(data, dict) else data
+    return [Trade.from_dict(row) for row in rows or ()]
+
+def decode_event(message: Union[bytes, str]) -> LiveEvent:
+    """One websocket message as a LiveEvent"""
+    return LiveEvent.from_dict(loads(message))
+
+def revive(result: Any, model: type) -> Any:
+    """Turn dicts (e.g. a daemon's JSON reply) back into models; models and None pass through"""
+    if isinstance(result, list):
+        return [revive(item, model) for item in result]
+    if isinstance(result, dict):
+        return model.from_dict(result)
+    return result
@@ -0,0 +1,304 @@
+"""
+Momentum ranking utility for GrimBundle
+Ranks mints locally from livefeed trade and new-token events using sliding-window
+volume, trade velocity and unique-trader counts, with an incrementally updated top-K
+"""
+
+from collections import OrderedDict, deque
+from typing import Dict, Any, Deque, List, NamedTuple, Optional, Tuple, Union
+import time
+
+from utils.models import LiveEvent
+
+DEFAULT_WINDOW = 300.0
+# Names and symbols of recently launched mints kept for display
+NAME_CACHE_SIZE = 100_000
+
+class MomentumWeights(NamedTuple):
+    """Score = volume * SOL traded + velocity * trades per minute + traders * unique traders (all in-window)"""
+    volume: float = 1.0
+    velocity: float = 0.2
+    traders: float = 0.5
+
+class IndexedMaxHeap:
+    """
+    Binary max-heap of (score, key) with a key -> position index.
+
+    push/update/remove are O(log n) because the index finds a key's slot
+    directly; top(k) walks the heap best-first in O(k log k) without
+    disturbing it.
+    """
+
+    def __init__(self):
+        self._heap: List[List[Any]] = []
+        self._pos: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._pos
+
+    def score(self, key: str) -> Optional[float]:
+        i = self._pos.get(key)
+        return None if i is None else self._heap[i][0]
+
+    def update(self, key: str, score: float) -> None:
+        """Insert key or move it to its new score"""
+        i = self._pos.get(key)
+        if i is None:
+            self._heap.append([score, key])
+            self._pos[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+        old = self._heap[i][0]
+        self._heap[i][0] = score
+        if score > old:
+            self._sift_up(i)
+        elif score < old:
+            self._sift_down(i)
+
+    def remove(self, key: str) -> None:
+        i = self._pos.pop(key, None)
+        if i is None:
+            return
+        last = self._heap.pop()
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._pos[last[1]] = i
+            self._sift_up(i)
+            self._sift_down(self._pos[last[1]])
+
+    def top(self, k: int) -> List[Tuple[float, str]]:
+        """The k highest (score, key) pairs, best first"""
+        import heapq
+        heap = self._heap
+        result: List[Tuple[float, str]] = []
+        frontier = [(-heap[0][0], 0)] if heap else []
+        while frontier and len(result) < k:
+            _, i = heapq.heappop(frontier)
+            result.append((heap[i][0], heap[i][1]))
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (-heap[child][0], child))
+        return result
+
+    def _swap(self, i: int, j: int) -> None:
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i][1]] = i
+        self._pos[heap[j][1]] = j
+
+    def _sift_up(self, i: int) -> None:
+        heap = self._heap
+        while i > 0:
+            parent = (i - 1) >> 1
+            if heap[parent][0] >= heap[i][0]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int) -> None:
+        heap = self._heap
+        n = len(heap)
+        while True:
+            best = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and heap[child][0] > heap[best][0]:
+                    best = child
+            if best == i:
+                break
+            self._swap(i, best)
+            i = best
+
+class MintWindow:
+    """Sliding-window aggregates for one mint"""
+
+    __slots__ = ("mint", "volume", "buys", "sells", "trades", "traders", "last_trade")
+
+    def __init__(self, mint: str):
+        self.mint = mint
+        self.volume = 0.0
+        self.buys = 0
+        self.sells = 0
+        self.trades: Deque[Tuple[float, float, str, bool]] = deque()
+        self.traders: Dict[str, int] = {}
+        self.last_trade = 0.0
+
+    def add(self, ts: float, sol: float, trader: str, is_buy: bool) -> None:
+        self.trades.append((ts, sol, trader, is_buy))
+        self.volume += sol
+        if is_buy:
+            self.buys += 1
+        else:
+            self.sells += 1
+        self.traders[trader] = self.traders.get(trader, 0) + 1
+        self.last_trade = max(self.last_trade, ts)
+
+    def expire(self, cutoff: float) -> None:
+        trades = self.trades
+        while trades and trades[0][0] < cutoff:
+            _, sol, trader, is_buy = trades.popleft()
+            self.volume -= sol
+            if is_buy:
+                self.buys -= 1
+            else:
+                self.sells -= 1
+            remaining = self.traders[trader] - 1
+            if remaining:
+                self.traders[trader] = remaining
+            else:
+                del self.traders[trader]
+        if not trades:
+            # Re-zero so float error can't accumulate across idle periods
+            self.volume = 0.0
+
+class MomentumRanker:
+    """
+    Local trending list built from PumpPortal livefeed events.
+
+    observe() folds each newToken/tokenTrade event into its mint's window and
+    re-scores that mint in an indexed heap (O(log n)). Trades leave the window
+    through one global arrival-ordered queue, so every trade is expired exactly
+    once and only the mints it touched are re-scored. Mints with an empty
+    window drop out of the ranking entirely.
+    """
+
+    def __init__(self, window: float = DEFAULT_WINDOW, weights: MomentumWeights = MomentumWeights()):
+        self.window = window
+        self.weights = weights
+        self.mints: Dict[str, MintWindow] = {}
+        self.names: "OrderedDict[str, Tuple[Optional[str], Optional[str]]]" = OrderedDict()
+        self.heap = IndexedMaxHeap()
+        self.events = 0
+        self._arrivals: Deque[Tuple[float, str]] = deque()
+        self._clock = 0.0
+
+    def observe(self, event: Union[LiveEvent, Dict[str, Any]], now: Optional[float] = None) -> Optional[str]:
+        """
+        Fold one livefeed event into the ranking
+
+        Args:
+            event: A LiveEvent, or a raw PumpPortal event ({"method", "data"} wrapped or flat with txType)
+            now: Event time; defaults to the event's timestamp, else the wall clock
+
+        Returns:
+            The mint the event touched, or None if it wasn't a token or trade event
+        """
+        if isinstance(event, LiveEvent):
+            return self._observe_model(event, now)
+        data = event.get("data", event)
+        method = event.get("method") or data.get("txType")
+        mint = data.get("mint")
+        if not mint:
+            return None
+        ts = now if now is not None else float(data.get("timestamp") or time.time())
+        # Keep every window's deque in time order even if the feed reorders slightly
+        ts = max(ts, self._clock)
+        if method in ("newToken", "create"):
+            self.names[mint] = (data.get("name"), data.get("symbol"))
+            if len(self.names) > NAME_CACHE_SIZE:
+                self.names.popitem(last=False)
+            # A launch usually carries the creator's initial buy
+            sol = _sol_amount(data)
+            if not sol:
+                self.events += 1
+                return mint
+            trader, is_buy = data.get("traderPublicKey") or data.get("creator") or "", True
+        elif method in ("tokenTrade", "accountTrade", "buy", "sell"):
+            sol = _sol_amount(data)
+            trader = data.get("traderPublicKey") or data.get("trader") or ""
+            is_buy = data.get("txType") == "buy" if "txType" in data else bool(data.get("is_buy", True))
+        else:
+            return None
+        self._add(mint, ts, sol, trader, is_buy)
+        return mint
+
+    def _observe_model(self, event: LiveEvent, now: Optional[float]) -> Optional[str]:
+        data = event.data
+        if event.kind == "new_token":
+            mint, sol, trader, is_buy, stamp = data.mint, data.initial_buy_sol, data.creator, True, data.created_timestamp
+        elif event.kind == "trade":
+            mint, sol, trader, is_buy, stamp = data.mint, data.sol_amount, data.trader, data.is_buy, data.timestamp
+        else:
+            return None
+        if not mint:
+            return None
+        ts = max(now if now is not None else (stamp or time.time()), self._clock)
+        if event.kind == "new_token":
+            self.names[mint] = (data.name or None, data.symbol or None)
+            if len(self.names) > NAME_CACHE_SIZE:
+                self.names.popitem(last=False)
+            if not sol:
+                self.events += 1
+                return mint
+        self._add(mint, ts, sol, trader, is_buy)
+        return mint
+
+    def _add(self, mint: str, ts: float, sol: float, trader: str, is_buy: bool) -> None:
+        self.events += 1
+        entry = self._entry(mint)
+        entry.add(ts, sol, trader, is_buy)
+        self._arrivals.append((ts, mint))
+        self.advance(ts)
+        self._rescore(entry)
+
+    def advance(self, now: Optional[float] = None) -> None:
+        """Expire trades older than the window; call periodically when the feed is quiet"""
+        now = now if now is not None else time.time()
+        self._clock = max(self._clock, now)
+        cutoff = self._clock - self.window
+        arrivals = self._arrivals
+        touched = set()
+        while arrivals and arrivals[0][0] < cutoff:
+            touched.add(arrivals.popleft()[1])
+        for mint in touched:
+            entry = self.mints.get(mint)
+            if entry is None:
+                continue
+            entry.expire(cutoff)
+            self._rescore(entry)
+
+    def score(self, entry: MintWindow) -> float:
+        weights = self.weights
+        velocity = len(entry.trades) * 60.0 / self.window
+        return weights.volume * entry.volume + weights.velocity * velocity + weights.traders * len(entry.traders)
+
+    def top(self, k: int = 20) -> List[Dict[str, Any]]:
+        """Current top-k mints with their window stats, best first"""
+        ranked = []
+        for score, mint in self.heap.top(k):
+            entry = self.mints[mint]
+            name, symbol = self.names.get(mint, (None, None))
+            ranked.append({
+                "mint": mint,
+                "name": name,
+                "symbol": symbol,
+                "score": score,
+                "volume_sol": entry.volume,
+                "trades": len(entry.trades),
+                "trades_per_min": len(entry.trades) * 60.0 / self.window,
+                "unique_traders": len(entry.traders),
+                "buys": entry.buys,
+                "sells": entry.sells
+            })
+        return ranked
+
+    def _entry(self, mint: str) -> MintWindow:
+        entry = self.mints.get(mint)
+        if entry is None:
+            entry = self.mints[mint] = MintWindow(mint)
+        return entry
+
+    def _rescore(self, entry: MintWindow) -> None:
+        if entry.trades:
+            self.heap.update(entry.mint, self.score(entry))
+        else:
+            self.heap.remove(entry.mint)
+            del self.mints[entry.mint]
+
+def _sol_amount(data: Dict[str, Any]) -> float:
+    try:
+        return float(data.get("solAmount", data.get("sol_amount", 0)) or 0)
+    except (TypeError, ValueError):
+        return 0.0
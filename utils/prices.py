@@ -0,0 +1,206 @@
+"""
+Prices utility for GrimBundle
+Background-refreshed USD prices for SOL and watched tokens, so USD figures in
+cost estimates and tables never wait on a price lookup
+
+Prices come from Jupiter quotes against USDC (one whole token in, USDC out) or,
+with GRIMNODE_PRICE_SOURCE=jupiter_price, from Jupiter's batch Price API. Any
+callable taking {mint: decimals} and returning {mint: usd} can be passed as the
+source instead.
+"""
+
+from typing import Callable, Dict, Any, NamedTuple, Optional
+import os
+import threading
+import time
+
+from utils import metrics
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+USDC_MINT = "EPjFWdd5AufqSSqeM2qrxzvDNrV8BQdwTd5Cb3oopqG7"
+USDC_DECIMALS = 6
+# Pump.fun tokens are minted with 6 decimals
+DEFAULT_TOKEN_DECIMALS = 6
+DEFAULT_INTERVAL = 15.0
+# Readers are told a price is stale past this age
+MAX_PRICE_AGE = 120.0
+
+PriceSource = Callable[[Dict[str, int]], Dict[str, float]]
+
+class PricePoint(NamedTuple):
+    usd: float
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    @property
+    def stale(self) -> bool:
+        return self.age > MAX_PRICE_AGE
+
+class PriceSnapshot(NamedTuple):
+    prices: Dict[str, PricePoint]  # never mutated once published
+    refreshed_at: float
+
+    def usd(self, mint: str = SOL_MINT) -> Optional[float]:
+        point = self.prices.get(mint)
+        return point.usd if point is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {mint: {"usd": point.usd, "age_s": round(point.age, 3)} for mint, point in self.prices.items()}
+
+def jupiter_quote_source(mints: Dict[str, int]) -> Dict[str, float]:
+    """USD prices from Jupiter quotes of one whole token against USDC"""
+    from utils.jupiter import get_jupiter_quote
+    prices = {}
+    failure: Optional[Exception] = None
+    for mint, decimals in mints.items():
+        if mint == USDC_MINT:
+            prices[mint] = 1.0
+            continue
+        try:
+            quote = get_jupiter_quote(mint, USDC_MINT, 10 ** decimals)
+        except Exception as e:
+            failure = e
+            continue
+        if quote.get("outAmount"):
+            prices[mint] = int(quote["outAmount"]) / 10 ** USDC_DECIMALS
+    # One unquotable token shouldn't hide the rest; a refresh that priced nothing failed
+    if failure is not None and not prices:
+        raise failure
+    return prices
+
+def jupiter_price_source(mints: Dict[str, int]) -> Dict[str, float]:
+    """USD prices from Jupiter's Price API, all mints in one call"""
+    from utils.jupiter import get_jupiter_prices
+    return get_jupiter_prices(sorted(mints))
+
+SOURCES: Dict[str, PriceSource] = {
+    "jupiter_quote": jupiter_quote_source,
+    "jupiter_price": jupiter_price_source
+}
+
+def configured_source() -> PriceSource:
+    name = os.getenv("GRIMNODE_PRICE_SOURCE", "jupiter_quote")
+    if name not in SOURCES:
+        raise ValueError(f"unknown price source {name!r}; use one of {', '.join(SOURCES)}")
+    return SOURCES[name]
+
+class PriceService:
+    """
+    USD prices for SOL and every watched mint, refreshed on a background thread.
+
+    Each refresh publishes a new immutable snapshot with a single attribute
+    assignment, so readers take no lock. A mint whose refresh fails keeps its
+    last price, whose age tells readers how stale it is.
+    """
+
+    def __init__(self, source: Optional[PriceSource] = None, interval: float = DEFAULT_INTERVAL):
+        self.source = source or configured_source()
+        self.interval = interval
+        self.snapshot = PriceSnapshot({}, 0.0)
+        # Last refresh failure, for callers that want to show it (None once a refresh succeeds)
+        self.error: Optional[str] = None
+        self._watched: Dict[str, int] = {SOL_MINT: 9}
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def watch(self, mint: str, decimals: int = DEFAULT_TOKEN_DECIMALS) -> None:
+        """Include a mint from the next refresh on"""
+        if mint not in self._watched:
+            with self._lock:
+                # Replaced rather than mutated, so a refresh in progress iterates a stable dict
+                self._watched = {**self._watched, mint: decimals}
+
+    def start(self) -> "PriceService":
+        """Start the refresh thread (no-op if already running)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="price-service", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def refresh(self) -> PriceSnapshot:
+        """Fetch every watched price now and publish the result"""
+        try:
+            fetched = self.source(self._watched)
+            self.error = None
+            metrics.count("price_refreshes", outcome="ok")
+        except Exception as e:
+            # Runs on a background thread under tables and live displays; don't print
+            self.error = str(e)
+            metrics.count("price_refreshes", outcome="error")
+            fetched = {}
+        now = time.monotonic()
+        prices = dict(self.snapshot.prices)
+        prices.update((mint, PricePoint(usd, now)) for mint, usd in fetched.items())
+        self.snapshot = PriceSnapshot(prices, now)
+        self._ready.set()
+        return self.snapshot
+
+    def wait(self, timeout: float) -> PriceSnapshot:
+        """The snapshot once the first refresh has finished, or whatever exists after timeout"""
+        self._ready.wait(timeout)
+        return self.snapshot
+
+    def usd(self, mint: str = SOL_MINT) -> Optional[float]:
+        """Latest USD price of a mint, without any network access (None if never fetched)"""
+        return self.snapshot.usd(mint)
+
+    def point(self, mint: str = SOL_MINT) -> Optional[PricePoint]:
+        return self.snapshot.prices.get(mint)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"watched": len(self._watched), "priced": len(self.snapshot.prices),
+                "refreshed_s_ago": round(time.monotonic() - self.snapshot.refreshed_at, 1) if self.snapshot.refreshed_at else None,
+                "error": self.error}
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+_shared: Optional[PriceService] = None
+_shared_lock = threading.Lock()
+
+def shared_price_service() -> PriceService:
+    """Process-wide running price service"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = PriceService()
+        return _shared.start()
+
+def use_price_service(service: PriceService) -> PriceService:
+    """Make `service` the process-wide one, e.g. with a stand-in source; started as shared_price_service() would be"""
+    global _shared
+    with _shared_lock:
+        if _shared is not None and _shared is not service:
+            _shared.stop()
+        _shared = service
+        return service.start()
+
+def sol_usd(wait: float = 0.0) -> Optional[PricePoint]:
+    """
+    SOL/USD for one-shot commands: the daemon's warm price when a daemon is
+    running, otherwise this process's service (started on first use). Neither
+    path waits on the network unless `wait` is given; None until a price is cached.
+    """
+    from utils import daemon
+
+    def in_process() -> Optional[Dict[str, Any]]:
+        service = shared_price_service()
+        snapshot = service.wait(wait) if wait > 0 else service.snapshot
+        return snapshot.to_dict().get(SOL_MINT)
+
+    result = daemon.via_daemon("prices", in_process, mint=SOL_MINT, wait=wait)
+    if not result:
+        return None
+    return PricePoint(result["usd"], time.monotonic() - result.get("age_s", 0.0))
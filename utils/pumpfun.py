@@ -0,0 +1,174 @@
+"""
+Pump.fun program utility for GrimBundle
+Finds and decodes 'create' instructions in Pump.fun program transactions, shared
+by the in-process scan, the daemon and backfill
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import struct
+
+from utils import lookup_tables, metrics
+from utils.lookup_tables import LookupTableCache, LookupTableError, account_keys, tables_to_fetch
+
+PUMP_FUN_PROGRAM_ADDRESS = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+CREATE_DISCRIMINATOR = bytes.fromhex("181ec828051c0777")
+# Positions in the create instruction's account list
+CREATE_MINT_ACCOUNT = 0
+CREATE_USER_ACCOUNT = 7
+# Creates invoked through another program are numbered past every top-level index
+INNER_INDEX_BASE = 1000
+
+def _borsh_strings(data: bytes, count: int, offset: int = 0) -> Tuple[List[str], int]:
+    values = []
+    for _ in range(count):
+        (length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        if offset + length > len(data):
+            raise ValueError("string runs past the end of the instruction data")
+        values.append(data[offset:offset + length].decode("utf-8", errors="replace"))
+        offset += length
+    return values, offset
+
+def _instructions(message: Any, meta: Any):
+    """(index, instruction) for top-level instructions, then those each one invoked (CPI)"""
+    for index, ix in enumerate(message.instructions):
+        yield index, ix
+    for inner in (meta.inner_instructions if meta is not None else None) or ():
+        for position, ix in enumerate(inner.instructions):
+            # Only compiled instructions carry indexes (jsonParsed ones are already resolved)
+            if hasattr(ix, "program_id_index"):
+                yield (inner.index + 1) * INNER_INDEX_BASE + position, ix
+
+def decode_creates(tx_response: Any, cache: Optional[LookupTableCache] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Decode every 'create' instruction in a getTransaction response, top-level or invoked
+    through another program, with account indexes resolved across v0 loaded addresses
+
+    Args:
+        tx_response: Response of get_transaction(..., max_supported_transaction_version=0)
+        cache: Table cache for responses whose meta lacks loaded addresses
+            (default: the shared cache; fill it with lookup_tables.prepare() first)
+
+    Returns:
+        One dict per create (signature, index, mint, creator, name, symbol, uri, slot,
+        block_time), or None if the response carried no transaction. A create invoked
+        by top-level instruction i gets index (i + 1) * INNER_INDEX_BASE + its position
+        among i's inner instructions. Raises LookupTableError if loaded addresses are
+        missing and a lookup table can't be resolved
+    """
+    import base58
+    value = tx_response.value
+    if not (value and value.transaction and value.transaction.transaction):
+        return None
+    transaction = value.transaction.transaction
+    message = transaction.message
+    keys = account_keys(tx_response, cache)
+    if keys is None:
+        raise LookupTableError(f"unresolved lookup tables: {', '.join(tables_to_fetch(tx_response, cache))}")
+    key = lambda i: keys[i] if i < len(keys) else None
+    creates = []
+    for index, ix in _instructions(message, value.transaction.meta):
+        if key(ix.program_id_index) != PUMP_FUN_PROGRAM_ADDRESS:
+            continue
+        data = base58.b58decode(ix.data)
+        if not data.startswith(CREATE_DISCRIMINATOR):
+            continue
+        accounts = list(ix.accounts)
+        try:
+            (name, symbol, uri), _ = _borsh_strings(data, 3, len(CREATE_DISCRIMINATOR))
+        except (ValueError, struct.error):
+            name = symbol = uri = None
+        creates.append({
+            "signature": str(transaction.signatures[0]),
+            "index": index,
+            "mint": key(accounts[CREATE_MINT_ACCOUNT]) if len(accounts) > CREATE_MINT_ACCOUNT else None,
+            "creator": key(accounts[CREATE_USER_ACCOUNT]) if len(accounts) > CREATE_USER_ACCOUNT else None,
+            "name": name,
+            "symbol": symbol,
+            "uri": uri,
+            "slot": value.slot,
+            "block_time": value.block_time
+        })
+    return creates
+
+def _inspected(
+    signature: str,
+    creates: Optional[List[Dict[str, Any]]] = None,
+    error: Optional[BaseException] = None
+) -> Dict[str, Any]:
+    if error is not None:
+        return {"signature": signature, "status": "error", "creates": [], "error": str(error)}
+    if creates is None:
+        return {"signature": signature, "status": "missing", "creates": [], "error": None}
+    return {"signature": signature, "status": "ok", "creates": creates, "error": None}
+
+def scan_program(client: Any, limit: int) -> List[Dict[str, Any]]:
+    """
+    Inspect the program's latest transactions one by one with a sync Client
+
+    Args:
+        client: solana.rpc.api.Client
+        limit: Number of recent signatures to inspect
+
+    Returns:
+        Per-signature results ({signature, status, creates, error}, with creates as
+        decoded by decode_creates), newest first; raises if the signatures can't be fetched
+    """
+    from solders.pubkey import Pubkey
+    with metrics.track("solana_rpc", "getSignaturesForAddress"):
+        signatures = client.get_signatures_for_address(Pubkey.from_string(PUMP_FUN_PROGRAM_ADDRESS), limit=limit)
+    results = []
+    for sig_info in signatures.value:
+        try:
+            with metrics.track("solana_rpc", "getTransaction"):
+                tx_response = client.get_transaction(sig_info.signature, max_supported_transaction_version=0)
+            lookup_tables.prepare(client, [tx_response])
+            results.append(_inspected(str(sig_info.signature), decode_creates(tx_response)))
+        except Exception as e:
+            results.append(_inspected(str(sig_info.signature), error=e))
+    return results
+
+async def scan_program_async(
+    client: Any,
+    limit: int,
+    cache: Optional[Dict[str, Dict[str, Any]]] = None,
+    concurrency: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    scan_program() over an AsyncClient, fetching transactions concurrently
+
+    Args:
+        client: solana.rpc.async_api.AsyncClient
+        limit: Number of recent signatures to inspect
+        cache: Results of earlier scans by signature; confirmed transactions never
+            change, so only signatures missing from it are fetched
+        concurrency: getTransaction calls in flight at once
+
+    Returns:
+        Per-signature results, newest first
+    """
+    from solders.pubkey import Pubkey
+    cache = cache if cache is not None else {}
+    with metrics.track("solana_rpc", "getSignaturesForAddress"):
+        signatures = await client.get_signatures_for_address(Pubkey.from_string(PUMP_FUN_PROGRAM_ADDRESS), limit=limit)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def inspect(sig_info: Any) -> Dict[str, Any]:
+        signature = str(sig_info.signature)
+        cached = cache.get(signature)
+        if cached is not None:
+            return cached
+        try:
+            async with semaphore:
+                with metrics.track("solana_rpc", "getTransaction"):
+                    tx_response = await client.get_transaction(sig_info.signature, max_supported_transaction_version=0)
+                await lookup_tables.prepare_async(client, [tx_response])
+            result = _inspected(signature, decode_creates(tx_response))
+        except Exception as e:
+            return _inspected(signature, error=e)
+        if result["status"] == "ok":
+            cache[signature] = result
+        return result
+
+    return list(await asyncio.gather(*(inspect(sig_info) for sig_info in signatures.value)))
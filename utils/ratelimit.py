@@ -0,0 +1,372 @@
+"""
+Rate limit utility for GrimBundle
+Process-wide, per-host request limiter shared by every HTTP and RPC client:
+a token bucket for request rate plus an AIMD (additive increase, multiplicative
+decrease) cap on concurrent requests. A 429 or Retry-After cuts both and
+pauses the host; each success ramps them back up, so clients settle just under
+each provider's limit.
+
+Hosts with a known public limit start at it (HOST_LIMITS). Other hosts are
+unlimited until they first push back, and from then on are paced from the
+rate observed at that moment. Override or add limits with
+GRIMNODE_RATE_LIMITS="host=requests_per_second[:max_concurrency],...".
+"""
+
+from collections import deque
+from typing import Callable, Dict, Any, Optional, Tuple
+import asyncio
+import email.utils
+import functools
+import os
+import threading
+import time
+
+from utils import metrics
+
+# Documented public-tier limits, in requests per second
+HOST_LIMITS: Dict[str, Tuple[float, Optional[int]]] = {
+    "api.mainnet-beta.solana.com": (10.0, 40)
+}
+
+MIN_RATE = 0.2
+MAX_CONCURRENCY = 256
+DECREASE = 0.7
+# Fraction of the current rate added per second of successful traffic
+RATE_INCREASE = 0.1
+# 429s arriving within this long of a decrease belong to the same burst and don't cut again
+DECREASE_COOLDOWN = 1.0
+# Pause after a 429 without Retry-After, doubled for each consecutive one
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+MAX_RETRIES = 3
+# How often a caller waiting for a concurrency slot looks again
+SLOT_POLL = 0.005
+
+class HostLimiter:
+    """Token bucket and AIMD concurrency window for one host"""
+
+    def __init__(self, host: str, rate: Optional[float] = None, concurrency: Optional[int] = None):
+        self.host = host
+        self.ceiling = rate
+        self.rate = rate
+        self.tokens = max(1.0, rate or 1.0)
+        self.limit: Optional[float] = float(concurrency) if concurrency else None
+        self.max_limit = float(concurrency or MAX_CONCURRENCY)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.throttles = 0
+        self._decreased_at = float("-inf")
+        self._refilled = time.monotonic()
+        self._recent: deque = deque(maxlen=128)
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a request slot and return 0, or return how long to wait before trying again"""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.limit is not None and self.in_flight >= int(self.limit):
+                return SLOT_POLL
+            if self.rate is not None:
+                self.tokens = min(max(1.0, self.rate), self.tokens + (now - self._refilled) * self.rate)
+                self._refilled = now
+                if self.tokens < 1.0:
+                    return (1.0 - self.tokens) / self.rate
+                self.tokens -= 1.0
+            self.in_flight += 1
+            self._recent.append(now)
+            return 0.0
+
+    def release(self, outcome: str, retry_after: Optional[float] = None) -> None:
+        """
+        Return a slot and adapt to how the request went
+
+        Args:
+            outcome: "ok", "throttled" (429/Retry-After) or "error" (anything else; no adjustment)
+            retry_after: Seconds the server asked us to wait, if it said
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if outcome == "ok":
+                self.throttles = 0
+                if self.rate is not None:
+                    # One success per 1/rate seconds, so this adds RATE_INCREASE * rate per second
+                    self.rate += RATE_INCREASE
+                    if self.ceiling is not None:
+                        self.rate = min(self.rate, self.ceiling)
+                if self.limit is not None:
+                    self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            elif outcome == "throttled":
+                now = time.monotonic()
+                if now - self._decreased_at >= DECREASE_COOLDOWN:
+                    self._decreased_at = now
+                    self.rate = max(MIN_RATE, (self.rate or self._observed_rate(now)) * DECREASE)
+                    self.limit = max(1.0, (self.limit or self.in_flight + 1) * DECREASE)
+                self.tokens = 0.0
+                self._refilled = now
+                if retry_after is None:
+                    retry_after = min(MAX_BACKOFF, BASE_BACKOFF * 2 ** self.throttles)
+                self.throttles += 1
+                self.blocked_until = max(self.blocked_until, now + min(retry_after, MAX_BACKOFF))
+        if outcome == "throttled":
+            metrics.count("rate_limited", host=self.host)
+
+    def _observed_rate(self, now: float) -> float:
+        if len(self._recent) < 2 or now <= self._recent[0]:
+            return 1.0
+        return len(self._recent) / (now - self._recent[0])
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "host": self.host,
+                "rate": None if self.rate is None else round(self.rate, 2),
+                "concurrency": None if self.limit is None else int(self.limit),
+                "in_flight": self.in_flight,
+                "blocked_for_s": round(max(0.0, self.blocked_until - time.monotonic()), 3)
+            }
+
+_limiters: Dict[str, HostLimiter] = {}
+_registry_lock = threading.Lock()
+
+def _configured_limits() -> Dict[str, Tuple[float, Optional[int]]]:
+    limits = dict(HOST_LIMITS)
+    for entry in filter(None, os.getenv("GRIMNODE_RATE_LIMITS", "").split(",")):
+        try:
+            host, spec = entry.strip().split("=", 1)
+            rate, _, concurrency = spec.partition(":")
+            limits[host] = (float(rate), int(concurrency) if concurrency else None)
+        except ValueError:
+            print(f"Ignoring malformed GRIMNODE_RATE_LIMITS entry: {entry!r}")
+    return limits
+
+def limiter(host: str) -> HostLimiter:
+    """The process-wide limiter for a host"""
+    found = _limiters.get(host)
+    if found is None:
+        with _registry_lock:
+            found = _limiters.get(host)
+            if found is None:
+                rate, concurrency = _configured_limits().get(host, (None, None))
+                found = _limiters[host] = HostLimiter(host, rate, concurrency)
+    return found
+
+def reset() -> None:
+    """Forget every host's learned limits"""
+    with _registry_lock:
+        _limiters.clear()
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {found.host: found.snapshot() for found in limiters}
+
+def acquire(host: str) -> HostLimiter:
+    """Block until a request to host may go out"""
+    found = limiter(host)
+    while True:
+        wait = found.try_acquire()
+        if not wait:
+            return found
+        time.sleep(wait)
+
+async def acquire_async(host: str) -> HostLimiter:
+    """acquire() without blocking the event loop"""
+    found = limiter(host)
+    while True:
+        wait = found.try_acquire()
+        if not wait:
+            return found
+        await asyncio.sleep(wait)
+
+def classify(status: int, headers: Any) -> Tuple[str, Optional[float]]:
+    """Outcome for HostLimiter.release() from a response's status and headers"""
+    retry_after = parse_retry_after(headers.get("Retry-After"))
+    if status == 429 or (status == 503 and retry_after is not None):
+        return "throttled", retry_after
+    return ("error" if status >= 500 else "ok"), None
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds, from either delta-seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def _send(host: str, send: Callable[[], Any], close: Callable[[Any], None]) -> Any:
+    for attempt in range(MAX_RETRIES + 1):
+        found = acquire(host)
+        try:
+            response = send()
+        except Exception:
+            found.release("error")
+            raise
+        outcome, retry_after = classify(response.status_code, response.headers)
+        found.release(outcome, retry_after)
+        if outcome != "throttled" or attempt == MAX_RETRIES:
+            return response
+        close(response)
+
+def limited_session(session: Optional[Any] = None) -> Any:
+    """
+    Route a requests.Session through the shared limiter
+
+    Args:
+        session: Session to mount the limiter on; a new one if omitted
+
+    Returns:
+        The session; throttled requests are retried after the server's Retry-After
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    class RateLimitedAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            host = requests.utils.urlparse(request.url).hostname or ""
+            return _send(host, lambda: super(RateLimitedAdapter, self).send(request, **kwargs), lambda r: r.close())
+
+    session = session or requests.Session()
+    adapter = RateLimitedAdapter(pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+_shared_session = None
+
+def session() -> Any:
+    """A process-wide rate-limited requests.Session for module-level helpers"""
+    global _shared_session
+    if _shared_session is None:
+        with _registry_lock:
+            if _shared_session is None:
+                _shared_session = limited_session()
+    return _shared_session
+
+@functools.lru_cache(maxsize=None)
+def _transports():
+    """httpx transports that pass through the limiter (built lazily so httpx loads only when used)"""
+    import httpx
+
+    class RateLimitedTransport(httpx.BaseTransport):
+        def __init__(self):
+            self.inner = httpx.HTTPTransport()
+
+        def handle_request(self, request):
+            return _send(request.url.host, lambda: self.inner.handle_request(request), lambda r: r.close())
+
+        def close(self):
+            self.inner.close()
+
+    class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+        def __init__(self):
+            self.inner = httpx.AsyncHTTPTransport()
+
+        async def handle_async_request(self, request):
+            host = request.url.host
+            for attempt in range(MAX_RETRIES + 1):
+                found = await acquire_async(host)
+                try:
+                    response = await self.inner.handle_async_request(request)
+                except Exception:
+                    found.release("error")
+                    raise
+                outcome, retry_after = classify(response.status_code, response.headers)
+                found.release(outcome, retry_after)
+                if outcome != "throttled" or attempt == MAX_RETRIES:
+                    return response
+                await response.aclose()
+
+        async def aclose(self):
+            await self.inner.aclose()
+
+    return RateLimitedTransport, AsyncRateLimitedTransport
+
+_rpc_http = None
+
+def _shared_rpc_http() -> Any:
+    global _rpc_http
+    if _rpc_http is None:
+        import httpx
+        with _registry_lock:
+            if _rpc_http is None:
+                transport, _ = _transports()
+                _rpc_http = httpx.Client(transport=transport(), timeout=None)
+    return _rpc_http
+
+# solana_client() and async_solana_client() subclass solana-py's HTTP providers and
+# call into their internals; requirements.txt pins the release they were written against
+SOLANA_PY_TESTED = "0.34"
+
+def _solana_internals() -> Tuple[Any, Any]:
+    """(_HTTPProviderCore, _after_request_unparsed), or a clear error if solana-py changed them"""
+    try:
+        from solana.rpc.core import _ClientCore  # noqa: F401 (used by _async_client_class)
+        from solana.rpc.providers.core import _after_request_unparsed, _HTTPProviderCore
+        from solana.rpc.providers.http import HTTPProvider
+        if not all(hasattr(HTTPProvider, name) for name in ("_before_request", "_before_batch_request")):
+            raise ImportError("HTTPProvider request hooks are missing")
+    except ImportError as e:
+        import importlib.metadata
+        version = importlib.metadata.version("solana")
+        raise RuntimeError(f"solana-py {version} is not supported by the rate-limited RPC clients "
+                           f"(written against {SOLANA_PY_TESTED}.x): {e}") from e
+    return _HTTPProviderCore, _after_request_unparsed
+
+def solana_client(endpoint: str, **kwargs: Any) -> Any:
+    """
+    solana.rpc.api.Client whose requests go through the limiter
+
+    The stock sync provider opens a fresh connection per call; this one also
+    shares one keep-alive connection pool across every sync client in the process.
+    """
+    from solana.rpc.api import Client
+    from solana.rpc.providers.http import HTTPProvider
+    _, after_request_unparsed = _solana_internals()
+
+    class LimitedHTTPProvider(HTTPProvider):
+        def make_request_unparsed(self, body):
+            request_kwargs = self._before_request(body=body)
+            return after_request_unparsed(_shared_rpc_http().post(timeout=self.timeout, **request_kwargs))
+
+        def make_batch_request_unparsed(self, reqs):
+            request_kwargs = self._before_batch_request(reqs)
+            return after_request_unparsed(_shared_rpc_http().post(timeout=self.timeout, **request_kwargs))
+
+    client = Client(endpoint, **kwargs)
+    provider = client._provider
+    client._provider = LimitedHTTPProvider(endpoint, extra_headers=provider.extra_headers, timeout=provider.timeout)
+    return client
+
+@functools.lru_cache(maxsize=None)
+def _async_client_class() -> Any:
+    import httpx
+    from solana.rpc.async_api import AsyncClient
+    from solana.rpc.core import _ClientCore
+    from solana.rpc.providers.async_http import AsyncHTTPProvider
+    provider_core, _ = _solana_internals()
+    _, transport = _transports()
+
+    class LimitedAsyncHTTPProvider(AsyncHTTPProvider):
+        def __init__(self, endpoint: Optional[str], extra_headers: Optional[Dict[str, str]], timeout: float):
+            # Skips AsyncHTTPProvider.__init__, which would open a stock httpx.AsyncClient nothing closes
+            provider_core.__init__(self, endpoint, extra_headers, timeout)
+            self.session = httpx.AsyncClient(timeout=timeout, transport=transport())
+
+    class LimitedAsyncClient(AsyncClient):
+        def __init__(self, endpoint: Optional[str] = None, commitment: Optional[Any] = None, timeout: float = 10,
+                     extra_headers: Optional[Dict[str, str]] = None):
+            _ClientCore.__init__(self, commitment)
+            self._provider = LimitedAsyncHTTPProvider(endpoint, extra_headers, timeout)
+
+    return LimitedAsyncClient
+
+def async_solana_client(endpoint: str, **kwargs: Any) -> Any:
+    """solana.rpc.async_api.AsyncClient whose requests go through the limiter"""
+    return _async_client_class()(endpoint, **kwargs)
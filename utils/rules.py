@@ -0,0 +1,378 @@
+"""
+Rules utility for GrimBundle
+Filter/alert rules for monitor and livefeed: a small expression language read
+from a TOML (or JSON) file, compiled once into Python predicates, with
+matching events routed to console, JSON-lines and webhook sinks
+
+    [[rules]]
+    name = "whale-buy"
+    on = ["trade"]
+    when = "is_buy and sol_amount >= 10"
+    sinks = ["alerts"]
+
+    [sinks.alerts]
+    type = "jsonl"
+    path = "alerts.jsonl"
+
+Expressions use the fields in FIELDS with and/or/not, comparisons, + - * / %,
+`in [...]` against literal lists, and the helpers match(field, "regex"),
+lower(field), abs(), min() and max(). monitor and livefeed show only events that
+match some rule; sinks are extra destinations for a rule's matches.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, Any, List, NamedTuple, Optional, Sequence
+import ast
+import copy
+import json
+import queue
+import re
+import threading
+import time
+
+from utils import metrics, models, ratelimit
+from utils.models import LiveEvent, Token, Trade
+
+NUMERIC_FIELDS = ("market_cap", "sol_amount", "token_amount", "price", "volume_24h", "timestamp")
+STRING_FIELDS = ("event", "mint", "name", "symbol", "creator", "trader")
+BOOL_FIELDS = ("is_buy",)
+FIELDS = NUMERIC_FIELDS + STRING_FIELDS + BOOL_FIELDS
+EVENT_TYPES = ("new_token", "trade", "migration", "other")
+
+class RuleError(ValueError):
+    """A rules file or expression that can't be compiled"""
+
+class Rule(NamedTuple):
+    name: str
+    when: str
+    on: tuple = ()
+    sinks: tuple = ()
+
+def normalize_event(event: Any) -> Dict[str, Any]:
+    """
+    Flatten a PumpPortal livefeed event or REST token into the rule fields
+
+    Accepts the utils.models types (LiveEvent, Token, Trade) or raw dicts.
+    Missing numbers read as 0, missing strings as "", so every comparison is defined.
+    """
+    if isinstance(event, LiveEvent):
+        if event.kind in ("new_token", "trade"):
+            return _model_fields(event.data)
+        event = {"method": event.method, "data": event.data}
+    elif isinstance(event, (Token, Trade)):
+        return _model_fields(event)
+    data = event.get("data", event)
+    method = event.get("method") or data.get("txType")
+    if method in ("newToken", "create"):
+        kind = "new_token"
+    elif method in ("tokenTrade", "accountTrade", "buy", "sell"):
+        kind = "trade"
+    elif method in ("migration", "migrate"):
+        kind = "migration"
+    elif method is None and "symbol" in data:
+        kind = "new_token"
+    else:
+        kind = "other"
+    # A launch's amounts are the creator's initial buy
+    is_buy = True if kind == "new_token" else data.get("txType") == "buy" if "txType" in data else bool(data.get("is_buy", False))
+    return {
+        "event": kind,
+        "mint": str(data.get("mint") or ""),
+        "name": str(data.get("name") or ""),
+        "symbol": str(data.get("symbol") or ""),
+        "creator": str(data.get("creator") or (data.get("traderPublicKey") if kind == "new_token" else "") or ""),
+        "trader": str(data.get("trader") or data.get("traderPublicKey") or ""),
+        "is_buy": is_buy,
+        "market_cap": _number(data.get("market_cap", data.get("marketCapSol"))),
+        "sol_amount": _number(data.get("sol_amount", data.get("solAmount"))),
+        "token_amount": _number(data.get("token_amount", data.get("tokenAmount"))),
+        "price": _number(data.get("price")),
+        "volume_24h": _number(data.get("volume_24h")),
+        "timestamp": _number(data.get("timestamp", data.get("created_timestamp")))
+    }
+
+def _model_fields(model: Any) -> Dict[str, Any]:
+    if isinstance(model, Token):
+        return {
+            "event": "new_token", "mint": model.mint, "name": model.name, "symbol": model.symbol,
+            "creator": model.creator, "trader": model.creator, "is_buy": True, "market_cap": model.market_cap,
+            "sol_amount": model.initial_buy_sol, "token_amount": model.initial_buy_tokens, "price": model.price,
+            "volume_24h": model.volume_24h, "timestamp": model.created_timestamp
+        }
+    return {
+        "event": "trade", "mint": model.mint, "name": "", "symbol": "", "creator": "", "trader": model.trader,
+        "is_buy": model.is_buy, "market_cap": model.market_cap, "sol_amount": model.sol_amount,
+        "token_amount": model.token_amount, "price": model.price, "volume_24h": 0.0, "timestamp": model.timestamp
+    }
+
+def _number(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Compare, ast.Eq, ast.NotEq,
+    ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn, ast.Name, ast.Load, ast.Constant,
+    ast.Call, ast.List, ast.Tuple, ast.Set
+)
+_FUNCTIONS = ("match", "lower", "abs", "min", "max")
+
+def _parse(rule: Rule) -> ast.Expression:
+    """Validate a rule's expression; match() calls get their regex compiled onto node.pattern"""
+    if not isinstance(rule.when, str):
+        raise RuleError(f"rule {rule.name!r}: 'when' must be a string, not {type(rule.when).__name__}")
+    try:
+        tree = ast.parse(rule.when, mode="eval")
+    except (SyntaxError, ValueError) as e:
+        raise RuleError(f"rule {rule.name!r}: {getattr(e, 'msg', e)} in {rule.when!r}") from e
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise RuleError(f"rule {rule.name!r}: {type(node).__name__} is not allowed in {rule.when!r}")
+        if isinstance(node, ast.Name) and node.id not in FIELDS and node.id not in _FUNCTIONS:
+            raise RuleError(f"rule {rule.name!r}: unknown field {node.id!r}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS or node.keywords:
+                raise RuleError(f"rule {rule.name!r}: only {', '.join(_FUNCTIONS)} can be called")
+            if node.func.id == "match" and (len(node.args) != 2 or not isinstance(node.args[1], ast.Constant)
+                                            or not isinstance(node.args[1].value, str)):
+                raise RuleError(f"rule {rule.name!r}: match() takes a field and a literal regex")
+            if node.func.id == "match":
+                try:
+                    node.pattern = re.compile(node.args[1].value)
+                except re.error as e:
+                    raise RuleError(f"rule {rule.name!r}: bad regex {node.args[1].value!r}: {e}") from e
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)) and not all(isinstance(e, ast.Constant) for e in node.elts):
+            raise RuleError(f"rule {rule.name!r}: lists may only hold literals")
+    return tree
+
+class _Constants:
+    """Regexes and literal sets hoisted out of the generated code"""
+
+    def __init__(self):
+        self.names: Dict[str, Any] = {}
+
+    def add(self, prefix: str, value: Any) -> ast.Name:
+        name = f"_{prefix}{len(self.names)}"
+        self.names[name] = value
+        return ast.Name(name, ast.Load())
+
+class _ScalarCompiler(ast.NodeTransformer):
+    """Rewrites a validated expression into plain Python over hoisted field locals"""
+
+    def __init__(self, constants: _Constants):
+        self.constants = constants
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        if node.func.id == "match":
+            pattern = self.constants.add("re", node.pattern)
+            search = ast.Call(ast.Attribute(pattern, "search", ast.Load()), [node.args[0]], [])
+            return ast.Compare(search, [ast.IsNot()], [ast.Constant(None)])
+        if node.func.id == "lower":
+            return ast.Call(ast.Attribute(node.args[0], "lower", ast.Load()), [], [])
+        return node
+
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        self.generic_visit(node)
+        node.comparators = [
+            self.constants.add("set", frozenset(e.value for e in c.elts)) if isinstance(c, (ast.List, ast.Tuple, ast.Set)) else c
+            for c in node.comparators
+        ]
+        return node
+
+def _fields_used(trees: Sequence[ast.AST]) -> List[str]:
+    used = {node.id for tree in trees for node in ast.walk(tree) if isinstance(node, ast.Name) and node.id in FIELDS}
+    return [field for field in FIELDS if field in used]
+
+class RuleSet:
+    """
+    Compiled rules.
+
+    match() runs one generated function per event type that evaluates every
+    applicable rule inline, with the fields it needs read into locals once.
+    A rule that raises on an event (say, dividing by zero) just doesn't match.
+    """
+
+    def __init__(self, rules: Sequence[Rule], sinks: Optional[Dict[str, "Sink"]] = None):
+        self.rules = list(rules)
+        self.sinks: Dict[str, Sink] = {"console": ConsoleSink()}
+        self.sinks.update(sinks or {})
+        for rule in self.rules:
+            unknown = [name for name in rule.sinks if name not in self.sinks]
+            if unknown:
+                raise RuleError(f"rule {rule.name!r}: unknown sink(s) {', '.join(unknown)}")
+            bad = [kind for kind in rule.on if kind not in EVENT_TYPES]
+            if bad:
+                raise RuleError(f"rule {rule.name!r}: unknown event type(s) {', '.join(bad)}")
+        trees = [_parse(rule) for rule in self.rules]
+        self._scalar = {kind: self._compile_scalar(trees, kind) for kind in EVENT_TYPES}
+
+    def _applies(self, rule: Rule, kind: str) -> bool:
+        return not rule.on or kind in rule.on
+
+    def _compile_scalar(self, trees: List[ast.Expression], kind: str) -> Callable[[Dict[str, Any]], List[int]]:
+        constants = _Constants()
+        indices = [i for i, rule in enumerate(self.rules) if self._applies(rule, kind)]
+        used = _fields_used([trees[i] for i in indices])
+        lines = ["def _matcher(f):"]
+        lines += [f"    {field} = f[{field!r}]" for field in used]
+        lines.append("    matched = []")
+        for i in indices:
+            expr = ast.unparse(_ScalarCompiler(constants).visit(copy.deepcopy(trees[i])).body)
+            lines += ["    try:", f"        if {expr}:", f"            matched.append({i})", "    except Exception:", "        pass"]
+        lines.append("    return matched")
+        namespace = {"lower": str.lower, "abs": abs, "min": min, "max": max, **constants.names}
+        exec(compile("\n".join(lines), f"<rules:{kind}>", "exec"), namespace)
+        return namespace["_matcher"]
+
+    def match(self, event: Dict[str, Any]) -> List[Rule]:
+        """Rules matching one raw event"""
+        fields = normalize_event(event)
+        return [self.rules[i] for i in self._scalar[fields["event"]](fields)]
+
+    def dispatch(self, event: Dict[str, Any], rules: Sequence[Rule]) -> None:
+        """Send an event to every sink named by the rules it matched (once per sink)"""
+        by_sink: Dict[str, List[str]] = {}
+        for rule in rules:
+            for sink in rule.sinks:
+                by_sink.setdefault(sink, []).append(rule.name)
+        for sink, names in by_sink.items():
+            try:
+                self.sinks[sink].emit(event, names)
+            except Exception as e:
+                print(f"Error writing to sink {sink}: {e}")
+
+    def process(self, event: Dict[str, Any]) -> List[Rule]:
+        """match() then dispatch(); returns the matched rules"""
+        matched = self.match(event)
+        if matched:
+            self.dispatch(event, matched)
+        return matched
+
+    def process_batch(self, events: Sequence[Dict[str, Any]]) -> List[List[Rule]]:
+        """process() for each event; matched rules per event"""
+        return [self.process(event) for event in events]
+
+    def close(self) -> None:
+        for sink in self.sinks.values():
+            sink.close()
+
+class Sink:
+    def emit(self, event: Dict[str, Any], rules: List[str]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+class ConsoleSink(Sink):
+    def emit(self, event: Dict[str, Any], rules: List[str]) -> None:
+        fields = normalize_event(event)
+        detail = f"{fields['sol_amount']:.4f} SOL {'buy' if fields['is_buy'] else 'sell'}" if fields["event"] == "trade" \
+            else fields["name"]
+        print(f"ALERT [{', '.join(rules)}] {fields['event']} {fields['symbol'] or '-'} {fields['mint']} {detail}")
+
+class JsonlSink(Sink):
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a")
+
+    def emit(self, event: Dict[str, Any], rules: List[str]) -> None:
+        self._file.write(models.dumps({"time": time.time(), "rules": rules, "event": event}) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+class WebhookSink(Sink):
+    """POSTs matches as JSON from a background thread so the event path never waits on the network"""
+
+    def __init__(self, url: str, timeout: float = 5.0, max_queue: int = 10_000):
+        self.url = url
+        self.timeout = timeout
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(max_queue)
+        self._thread = threading.Thread(target=self._run, name="rules-webhook", daemon=True)
+        self._thread.start()
+
+    def emit(self, event: Dict[str, Any], rules: List[str]) -> None:
+        try:
+            self._queue.put_nowait({"time": time.time(), "rules": rules, "event": models.plain(event)})
+        except queue.Full:
+            metrics.count("webhook_dropped", url=self.url)
+
+    def _run(self) -> None:
+        # Alert hooks (Discord, Slack, ...) rate limit too; share the per-host limiter
+        session = ratelimit.limited_session()
+        while True:
+            payload = self._queue.get()
+            if payload is None:
+                return
+            try:
+                with metrics.track("webhook", self.url):
+                    session.post(self.url, json=payload, timeout=self.timeout).raise_for_status()
+            except Exception as e:
+                print(f"Error posting alert to {self.url}: {e}")
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=self.timeout)
+
+_SINK_TYPES = {
+    "console": lambda config: ConsoleSink(),
+    "jsonl": lambda config: JsonlSink(config["path"]),
+    "webhook": lambda config: WebhookSink(config["url"], float(config.get("timeout", 5.0)))
+}
+
+def load_rules(path: str) -> RuleSet:
+    """
+    Load and compile a rules file
+
+    Args:
+        path: TOML file (JSON if it ends in .json) with [[rules]] and optional [sinks.*] tables
+
+    Returns:
+        A compiled RuleSet; raises RuleError if anything in the file is invalid
+    """
+    path = Path(path)
+    try:
+        if path.suffix == ".json":
+            config = json.loads(path.read_text())
+        else:
+            try:
+                import tomllib
+            except ImportError:
+                import tomli as tomllib
+            config = tomllib.loads(path.read_text())
+    except Exception as e:
+        raise RuleError(f"cannot read rules from {path}: {e}") from e
+    rules = []
+    for i, entry in enumerate(config.get("rules") or []):
+        if "when" not in entry:
+            raise RuleError(f"rule #{i + 1} has no 'when' expression")
+        rules.append(Rule(
+            name=str(entry.get("name", f"rule-{i + 1}")),
+            when=entry["when"],
+            on=tuple(entry.get("on", ())),
+            sinks=tuple(entry.get("sinks", ()))
+        ))
+    # Check every expression before any sink opens a file or starts a thread
+    for rule in rules:
+        _parse(rule)
+    sink_configs = config.get("sinks") or {}
+    for name, sink_config in sink_configs.items():
+        if sink_config.get("type") not in _SINK_TYPES:
+            raise RuleError(f"sink {name!r}: unknown type {sink_config.get('type')!r}")
+    sinks: Dict[str, Sink] = {}
+    try:
+        for name, sink_config in sink_configs.items():
+            try:
+                sinks[name] = _SINK_TYPES[sink_config["type"]](sink_config)
+            except KeyError as e:
+                raise RuleError(f"sink {name!r}: missing {e.args[0]!r}") from e
+        return RuleSet(rules, sinks)
+    except Exception:
+        for sink in sinks.values():
+            sink.close()
+        raise
@@ -1,28 +1,62 @@
 """
 Solana client utility for GrimBundle
-Connects to Solana Devnet and fetches token/account info
+Connects to Solana Devnet, fetches token/account info and submits signed bundles
 """
 
-from solana.rpc.api import Client
-from solana.publickey import PublicKey
-from typing import Dict, Any, Optional
-from solana.keypair import Keypair
+from solana.rpc.types import TokenAccountOpts, TxOpts
+from spl.token.constants import TOKEN_PROGRAM_ID
+from spl.token.instructions import get_associated_token_address
+from solders.pubkey import Pubkey
+from solders.keypair import Keypair
+from solders.hash import Hash
+from solders.message import Message
+from solders.signature import Signature
+from solders.transaction import Transaction
+from utils.blockhash import BlockhashCache, shared_blockhash_cache
+from utils.fees import (DEFAULT_COMPUTE_UNIT_LIMIT, DEFAULT_LANDING_PROBABILITY, contended_accounts,
+                        shared_fee_estimator, with_compute_budget)
+from utils import metrics, ratelimit
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+import asyncio
+import itertools
 import json
+import struct
+import time
+import websockets
 from pathlib import Path
 
 
 DEVNET_URL = "https://api.devnet.solana.com"
 
+# getMultipleAccounts rejects requests with more keys than this
+MULTIPLE_ACCOUNTS_LIMIT = 100
+# Chunks fetched at once by the bulk readers
+BULK_CONCURRENCY = 8
+
+LAMPORTS_PER_SOL = 1_000_000_000
+
+# SPL Token account layout: mint (32) | owner (32) | amount (u64) | ...
+TOKEN_ACCOUNT_AMOUNT = struct.Struct("<Q")
+TOKEN_ACCOUNT_AMOUNT_OFFSET = 64
+# SPL Mint layout: mint_authority option (36) | supply (u64) | decimals (u8) | ...
+MINT_SUPPLY_DECIMALS = struct.Struct("<QB")
+MINT_SUPPLY_OFFSET = 36
+
+# Below this many transactions, process start-up costs more than signing in-process
+PARALLEL_SIGN_THRESHOLD = 64
+
 class SolanaClient:
     def __init__(self, endpoint: str = DEVNET_URL):
-        self.client = Client(endpoint)
+        self.endpoint = endpoint
+        self.client = ratelimit.solana_client(endpoint)
 
     def get_balance(self, pubkey: str) -> Optional[float]:
         """Get SOL balance for a public key (in SOL)"""
         try:
-            resp = self.client.get_balance(PublicKey(pubkey))
-            if resp["result"] and "value" in resp["result"]:
-                return resp["result"]["value"] / 1_000_000_000
+            with metrics.track("solana_rpc", "getBalance"):
+                resp = self.client.get_balance(Pubkey.from_string(pubkey))
+            return resp.value / LAMPORTS_PER_SOL
         except Exception as e:
             print(f"Error fetching balance: {e}")
         return None
@@ -30,9 +64,9 @@ class SolanaClient:
     def get_token_account_balance(self, token_account: str) -> Optional[Dict[str, Any]]:
         """Get SPL token account balance and info"""
         try:
-            resp = self.client.get_token_account_balance(PublicKey(token_account))
-            if resp["result"] and "value" in resp["result"]:
-                return resp["result"]["value"]
+            with metrics.track("solana_rpc", "getTokenAccountBalance"):
+                resp = self.client.get_token_account_balance(Pubkey.from_string(token_account))
+            return _ui_token_amount(int(resp.value.amount), resp.value.decimals)
         except Exception as e:
             print(f"Error fetching token account balance: {e}")
         return None
@@ -40,25 +74,494 @@ class SolanaClient:
     def get_token_supply(self, mint_address: str) -> Optional[Dict[str, Any]]:
         """Get total supply and decimals for a token mint"""
         try:
-            resp = self.client.get_token_supply(PublicKey(mint_address))
-            if resp["result"] and "value" in resp["result"]:
-                return resp["result"]["value"]
+            with metrics.track("solana_rpc", "getTokenSupply"):
+                resp = self.client.get_token_supply(Pubkey.from_string(mint_address))
+            return _ui_token_amount(int(resp.value.amount), resp.value.decimals)
         except Exception as e:
             print(f"Error fetching token supply: {e}")
         return None
 
-    def get_recent_blockhash(self) -> Optional[str]:
-        """Get a recent blockhash for transaction simulation"""
+    def get_multiple_accounts(self, pubkeys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Fetch many accounts with chunked, concurrent getMultipleAccounts calls
+
+        Args:
+            pubkeys: Base58 account addresses (duplicates are fetched once)
+
+        Returns:
+            Mapping of address to solders Account, or None for missing accounts.
+            Addresses in a chunk whose call failed are left out, so an absent key
+            means unknown rather than missing; other chunks' results are kept
+        """
+        return {key: account for key, (account, _) in self.get_multiple_accounts_with_slot(pubkeys).items()}
+
+    def get_multiple_accounts_with_slot(self, pubkeys: Iterable[str]) -> Dict[str, Tuple[Any, int]]:
+        """
+        get_multiple_accounts() that also keeps the context slot each account was read at
+
+        Args:
+            pubkeys: Base58 account addresses (duplicates are fetched once)
+
+        Returns:
+            Mapping of address to (solders Account or None, slot); chunks are separate
+            calls, so addresses in different chunks may carry different slots
+        """
+        keys = list(dict.fromkeys(pubkeys))
         try:
-            resp = self.client.get_recent_blockhash()
-            if resp["result"] and "value" in resp["result"]:
-                return resp["result"]["value"]["blockhash"]
+            accounts, errors = asyncio.run(self._fetch_accounts(keys))
         except Exception as e:
-            print(f"Error fetching blockhash: {e}")
-        return None
+            print(f"Error fetching accounts: {e}")
+            return {}
+        if errors:
+            print(f"Error fetching accounts: {len(keys) - len(accounts)} of {len(keys)} unknown "
+                  f"({len(errors)} failed calls, e.g. {errors[0]})")
+        return accounts
+
+    def get_balances(self, pubkeys: Iterable[str]) -> Dict[str, Optional[float]]:
+        """Get SOL balances (in SOL) for many public keys; missing accounts read as 0, unfetched ones are left out"""
+        accounts = self.get_multiple_accounts(pubkeys)
+        return {
+            key: (account.lamports / LAMPORTS_PER_SOL if account is not None else 0.0)
+            for key, account in accounts.items()
+        }
+
+    def get_token_supplies(self, mint_addresses: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get supply and decimals for many mints, decoded from raw mint accounts"""
+        accounts = self.get_multiple_accounts(mint_addresses)
+        return {key: _decode_mint(account) for key, account in accounts.items()}
+
+    def get_token_account_balances(self, token_accounts: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get balances for many SPL token accounts; decimals come from one batched mint fetch"""
+        accounts = self.get_multiple_accounts(token_accounts)
+        raw = {key: _decode_token_account(account) for key, account in accounts.items()}
+        mints = self.get_token_supplies(info[0] for info in raw.values() if info is not None)
+        balances = {}
+        for key, info in raw.items():
+            mint_info = mints.get(info[0]) if info is not None else None
+            balances[key] = None if mint_info is None else _ui_token_amount(info[1], mint_info["decimals"])
+        return balances
+
+    def get_token_balances(self, owners: Iterable[str], mint_address: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get one token's balance for many wallets via their associated token accounts
+
+        The ATAs are derived locally, so hundreds of wallets cost a handful of
+        getMultipleAccounts calls. Wallets without an ATA report a zero balance;
+        wallets whose ATA couldn't be fetched are left out.
+        """
+        mint = Pubkey.from_string(mint_address)
+        atas = {owner: str(get_associated_token_address(Pubkey.from_string(owner), mint)) for owner in owners}
+        balances = self.get_token_account_balances(atas.values())
+        atas = {owner: ata for owner, ata in atas.items() if ata in balances}
+        if all(balances[ata] for ata in atas.values()):
+            return {owner: balances[ata] for owner, ata in atas.items()}
+        decimals = (self.get_token_supplies([mint_address]).get(mint_address) or {}).get("decimals", 0)
+        return {owner: balances[ata] or _ui_token_amount(0, decimals) for owner, ata in atas.items()}
+
+    def get_token_accounts_by_owner(self, owners: Iterable[str]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Discover every SPL balance held by many wallets (one concurrent getTokenAccountsByOwner per wallet)"""
+        try:
+            return asyncio.run(self._fetch_token_accounts(list(dict.fromkeys(owners))))
+        except Exception as e:
+            print(f"Error fetching token accounts: {e}")
+            return {}
+
+    def get_portfolio(self, owners: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """SOL balance plus every SPL holding for each wallet"""
+        owners = list(dict.fromkeys(owners))
+        sol = self.get_balances(owners)
+        tokens = self.get_token_accounts_by_owner(owners)
+        return {owner: {"sol": sol.get(owner), "tokens": tokens.get(owner, {})} for owner in owners}
+
+    async def _fetch_accounts(self, keys: List[str]) -> Tuple[Dict[str, Tuple[Any, int]], List[str]]:
+        chunks = [keys[i:i + MULTIPLE_ACCOUNTS_LIMIT] for i in range(0, len(keys), MULTIPLE_ACCOUNTS_LIMIT)]
+        semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+        async with ratelimit.async_solana_client(self.endpoint) as client:
+            async def fetch(chunk: List[str]) -> Any:
+                async with semaphore:
+                    with metrics.track("solana_rpc", "getMultipleAccounts"):
+                        return await client.get_multiple_accounts([Pubkey.from_string(k) for k in chunk])
+            results = await asyncio.gather(*(fetch(chunk) for chunk in chunks), return_exceptions=True)
+        accounts: Dict[str, Tuple[Any, int]] = {}
+        errors: List[str] = []
+        for chunk, resp in zip(chunks, results):
+            if isinstance(resp, BaseException):
+                errors.append(str(resp))
+                continue
+            accounts.update((key, (account, resp.context.slot)) for key, account in zip(chunk, resp.value))
+        return accounts, errors
+
+    async def _fetch_token_accounts(self, owners: List[str]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+        opts = TokenAccountOpts(program_id=TOKEN_PROGRAM_ID)
+        async with ratelimit.async_solana_client(self.endpoint) as client:
+            async def fetch(owner: str) -> Dict[str, Dict[str, Any]]:
+                async with semaphore:
+                    with metrics.track("solana_rpc", "getTokenAccountsByOwner"):
+                        resp = await client.get_token_accounts_by_owner_json_parsed(Pubkey.from_string(owner), opts)
+                holdings = {}
+                for keyed in resp.value:
+                    info = keyed.account.data.parsed["info"]
+                    amount = info["tokenAmount"]
+                    holdings[info["mint"]] = _ui_token_amount(int(amount["amount"]), amount["decimals"])
+                return holdings
+            results = await asyncio.gather(*(fetch(owner) for owner in owners))
+        return dict(zip(owners, results))
+
+    def get_recent_blockhash(self) -> Optional[str]:
+        """Get a recent blockhash from the shared background cache"""
+        snapshot = shared_blockhash_cache(self.endpoint).get()
+        if snapshot is None:
+            return None
+        return str(snapshot.blockhash)
 
     def load_keypair_from_file(self, path: str) -> Keypair:
         """Load a Solana keypair from a local JSON file (Solana CLI format)"""
         with open(path, 'r') as f:
             secret = json.load(f)
-        return Keypair.from_secret_key(bytes(secret)) 
\ No newline at end of file
+        return Keypair.from_bytes(bytes(secret))
+
+    def submit_bundle(
+        self,
+        messages: Sequence[Message],
+        signers: Sequence[Sequence[Keypair]],
+        landing_probability: Optional[float] = DEFAULT_LANDING_PROBABILITY
+    ) -> Dict[str, Any]:
+        """Sign, send and confirm a bundle of messages, priced to land with landing_probability (see SubmissionPipeline)"""
+        return SubmissionPipeline(
+            self.endpoint, blockhash_cache=shared_blockhash_cache(self.endpoint), landing_probability=landing_probability
+        ).run(messages, signers)
+
+def _ui_token_amount(amount: int, decimals: int) -> Dict[str, Any]:
+    """Same shape as the RPC's UiTokenAmount"""
+    whole, fraction = divmod(amount, 10 ** decimals)
+    ui_string = f"{whole}.{fraction:0{decimals}d}".rstrip("0").rstrip(".") if decimals else str(amount)
+    return {
+        "amount": str(amount),
+        "decimals": decimals,
+        "uiAmount": amount / 10 ** decimals,
+        "uiAmountString": ui_string
+    }
+
+def _decode_mint(account: Any) -> Optional[Dict[str, Any]]:
+    if account is None or len(account.data) < MINT_SUPPLY_OFFSET + MINT_SUPPLY_DECIMALS.size:
+        return None
+    supply, decimals = MINT_SUPPLY_DECIMALS.unpack_from(account.data, MINT_SUPPLY_OFFSET)
+    return _ui_token_amount(supply, decimals)
+
+def _decode_token_account(account: Any) -> Optional[Tuple[str, int]]:
+    """(mint, raw amount) from an SPL token account"""
+    if account is None or len(account.data) < TOKEN_ACCOUNT_AMOUNT_OFFSET + TOKEN_ACCOUNT_AMOUNT.size:
+        return None
+    mint = str(Pubkey.from_bytes(bytes(account.data[:32])))
+    return mint, TOKEN_ACCOUNT_AMOUNT.unpack_from(account.data, TOKEN_ACCOUNT_AMOUNT_OFFSET)[0]
+
+def _sign_worker(job: Tuple[bytes, List[bytes], str]) -> Tuple[bytes, str]:
+    """Sign one serialized message; runs inside a worker process"""
+    message_bytes, secrets, blockhash = job
+    keypairs = [Keypair.from_bytes(secret) for secret in secrets]
+    tx = Transaction(keypairs, Message.from_bytes(message_bytes), Hash.from_string(blockhash))
+    return bytes(tx), str(tx.signatures[0])
+
+def _sign_job(message: Message, keypairs: Sequence[Keypair], blockhash: Hash) -> Tuple[bytes, List[bytes], str]:
+    return bytes(message), [bytes(kp) for kp in keypairs], str(blockhash)
+
+def sign_transactions(
+    messages: Sequence[Message],
+    signers: Sequence[Sequence[Keypair]],
+    blockhash: Hash,
+    executor: Optional[Executor] = None
+) -> List[Tuple[bytes, str]]:
+    """
+    Sign many messages against one blockhash
+
+    Args:
+        messages: Unsigned messages, the first signer of each being the fee payer
+        signers: Keypairs required by each message, in the same order
+        blockhash: Recent blockhash to sign against
+        executor: Optional process pool to reuse; one is created for large batches otherwise
+
+    Returns:
+        List of (serialized transaction, signature) tuples in input order
+    """
+    jobs = [_sign_job(m, kps, blockhash) for m, kps in zip(messages, signers)]
+    if executor is None and len(jobs) < PARALLEL_SIGN_THRESHOLD:
+        return [_sign_worker(job) for job in jobs]
+    if executor is not None:
+        return list(executor.map(_sign_worker, jobs, chunksize=16))
+    with ProcessPoolExecutor() as pool:
+        return list(pool.map(_sign_worker, jobs, chunksize=16))
+
+def ws_url(endpoint: str) -> str:
+    """Websocket URL served alongside an HTTP RPC endpoint"""
+    return endpoint.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class _SignatureWatcher:
+    """Resolves one future per signature from signatureSubscribe notifications on a single socket"""
+
+    def __init__(self, ws_endpoint: str, commitment: str):
+        self.ws_endpoint = ws_endpoint
+        self.commitment = commitment
+        self._ids = itertools.count(1)
+        self._requests: Dict[int, str] = {}
+        self._subscriptions: Dict[int, str] = {}
+        self._futures: Dict[str, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "_SignatureWatcher":
+        self._ws = await websockets.connect(self.ws_endpoint, max_size=None)
+        self._reader = asyncio.create_task(self._read())
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._reader.cancel()
+        await self._ws.close()
+
+    async def watch(self, signature: str) -> asyncio.Future:
+        """Subscribe to a signature; the future resolves to the transaction error (None on success)"""
+        future = asyncio.get_running_loop().create_future()
+        self._futures[signature] = future
+        request_id = next(self._ids)
+        self._requests[request_id] = signature
+        await self._ws.send(json.dumps({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "signatureSubscribe",
+            "params": [signature, {"commitment": self.commitment}]
+        }))
+        return future
+
+    def forget(self, signature: str) -> None:
+        self._futures.pop(signature, None)
+
+    async def _read(self) -> None:
+        try:
+            async for raw in self._ws:
+                msg = json.loads(raw)
+                metrics.count("ws_messages", feed="signature_subscribe", method=msg.get("method", "response"))
+                if "id" in msg:
+                    signature = self._requests.pop(msg["id"], None)
+                    if signature is None:
+                        continue
+                    if "error" in msg:
+                        self._resolve(signature, exc=RuntimeError(msg["error"]))
+                    else:
+                        self._subscriptions[msg["result"]] = signature
+                elif msg.get("method") == "signatureNotification":
+                    params = msg["params"]
+                    signature = self._subscriptions.pop(params["subscription"], None)
+                    if signature is not None:
+                        self._resolve(signature, result=params["result"]["value"].get("err"))
+        finally:
+            for signature in list(self._futures):
+                self._resolve(signature, exc=ConnectionError("signature subscription socket closed"))
+
+    def _resolve(self, signature: str, result: Any = None, exc: Optional[BaseException] = None) -> None:
+        future = self._futures.pop(signature, None)
+        if future is None or future.done():
+            return
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+class _BlockhashGeneration:
+    """A blockhash plus the event that fires once the chain passes its last valid block height"""
+
+    def __init__(self, blockhash: Hash, last_valid_block_height: int):
+        self.blockhash = blockhash
+        self.last_valid_block_height = last_valid_block_height
+        self.expired = asyncio.Event()
+
+class SubmissionPipeline:
+    """
+    Signs transactions across a process pool, submits them concurrently over async RPC
+    and tracks confirmations through signatureSubscribe. Transactions whose blockhash
+    expires before they land are re-signed against a fresh blockhash and resubmitted.
+
+    With compute_unit_price, or landing_probability to take it from recent
+    prioritization fees on the accounts the batch writes to (utils.fees), every
+    message is rebuilt with compute budget instructions before signing.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = DEVNET_URL,
+        ws_endpoint: Optional[str] = None,
+        commitment: str = "confirmed",
+        max_in_flight: int = 64,
+        max_resubmits: int = 3,
+        workers: Optional[int] = None,
+        block_height_interval: float = 2.0,
+        blockhash_cache: Optional[BlockhashCache] = None,
+        compute_unit_price: Optional[int] = None,
+        landing_probability: Optional[float] = None,
+        compute_unit_limit: int = DEFAULT_COMPUTE_UNIT_LIMIT
+    ):
+        self.endpoint = endpoint
+        self.ws_endpoint = ws_endpoint or ws_url(endpoint)
+        self.commitment = commitment
+        self.max_in_flight = max_in_flight
+        self.max_resubmits = max_resubmits
+        self.workers = workers
+        self.block_height_interval = block_height_interval
+        self.blockhash_cache = blockhash_cache
+        self.compute_unit_price = compute_unit_price
+        self.landing_probability = landing_probability
+        self.compute_unit_limit = compute_unit_limit
+
+    def run(self, messages: Sequence[Message], signers: Sequence[Sequence[Keypair]]) -> Dict[str, Any]:
+        """Blocking wrapper around submit()"""
+        return asyncio.run(self.submit(messages, signers))
+
+    async def submit(self, messages: Sequence[Message], signers: Sequence[Sequence[Keypair]]) -> Dict[str, Any]:
+        """
+        Sign, send and confirm a batch of messages
+
+        Args:
+            messages: Unsigned messages, the first signer of each being the fee payer
+            signers: Keypairs required by each message, in the same order
+
+        Returns:
+            Report with landed rate, time-to-confirmation percentiles and per-transaction outcomes
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        self._resubmitted = 0
+        self._price = self.compute_unit_price
+        if self._price is None and self.landing_probability is not None:
+            estimator = shared_fee_estimator(self.endpoint)
+            self._price = await loop.run_in_executor(
+                None, estimator.recommend, contended_accounts(messages), self.landing_probability
+            )
+        if self._price is not None:
+            messages = [with_compute_budget(message, self.compute_unit_limit, self._price) for message in messages]
+        async with ratelimit.async_solana_client(self.endpoint, commitment=self.commitment) as client, \
+                _SignatureWatcher(self.ws_endpoint, self.commitment) as watcher:
+            with ProcessPoolExecutor(self.workers) as pool:
+                self._client, self._watcher, self._pool = client, watcher, pool
+                self._refresh_lock = asyncio.Lock()
+                self._generation = await self._fetch_generation()
+                signed = await loop.run_in_executor(
+                    None, sign_transactions, messages, signers, self._generation.blockhash, pool
+                )
+                monitor = asyncio.create_task(self._watch_block_height())
+                semaphore = asyncio.Semaphore(self.max_in_flight)
+                try:
+                    outcomes = await asyncio.gather(*(
+                        self._land(semaphore, message, keypairs, raw, signature)
+                        for message, keypairs, (raw, signature) in zip(messages, signers, signed)
+                    ))
+                finally:
+                    monitor.cancel()
+        return self._report(outcomes, time.perf_counter() - started)
+
+    async def _fetch_generation(self, stale: Optional[_BlockhashGeneration] = None) -> _BlockhashGeneration:
+        # Prefer the prefetched hash; only go to the network if the cache has nothing newer
+        if self.blockhash_cache is not None:
+            snapshot = self.blockhash_cache.current()
+            if snapshot is None or (stale is not None and snapshot.blockhash == stale.blockhash):
+                snapshot = await asyncio.get_running_loop().run_in_executor(None, self.blockhash_cache.refresh)
+            if snapshot is not None:
+                return _BlockhashGeneration(snapshot.blockhash, snapshot.last_valid_block_height)
+        with metrics.track("solana_rpc", "getLatestBlockhash"):
+            resp = await self._client.get_latest_blockhash(self.commitment)
+        return _BlockhashGeneration(resp.value.blockhash, resp.value.last_valid_block_height)
+
+    async def _fresh_generation(self, stale: _BlockhashGeneration) -> _BlockhashGeneration:
+        async with self._refresh_lock:
+            if self._generation is stale:
+                self._generation = await self._fetch_generation(stale)
+            return self._generation
+
+    async def _watch_block_height(self) -> None:
+        while True:
+            await asyncio.sleep(self.block_height_interval)
+            try:
+                with metrics.track("solana_rpc", "getBlockHeight"):
+                    height = (await self._client.get_block_height(self.commitment)).value
+            except Exception:
+                continue
+            if height > self._generation.last_valid_block_height:
+                self._generation.expired.set()
+
+    async def _land(
+        self,
+        semaphore: asyncio.Semaphore,
+        message: Message,
+        keypairs: Sequence[Keypair],
+        raw: bytes,
+        signature: str
+    ) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        generation = self._generation
+        first_sent = None
+        attempts = 0
+        async with semaphore:
+            while True:
+                attempts += 1
+                confirmation = await self._watcher.watch(signature)
+                first_sent = first_sent or time.perf_counter()
+                try:
+                    with metrics.track("solana_rpc", "sendTransaction"):
+                        await self._client.send_raw_transaction(
+                            raw, opts=TxOpts(skip_confirmation=True, skip_preflight=True)
+                        )
+                except Exception as e:
+                    self._watcher.forget(signature)
+                    if attempts > self.max_resubmits:
+                        return {"signature": signature, "status": "failed", "error": repr(e), "attempts": attempts}
+                    await asyncio.sleep(0.1 * attempts)
+                    continue
+                expiry = asyncio.ensure_future(generation.expired.wait())
+                await asyncio.wait({confirmation, expiry}, return_when=asyncio.FIRST_COMPLETED)
+                expiry.cancel()
+                if confirmation.done():
+                    elapsed_ms = (time.perf_counter() - first_sent) * 1000
+                    try:
+                        err = confirmation.result()
+                    except Exception as e:
+                        return {"signature": signature, "status": "failed", "error": repr(e), "attempts": attempts}
+                    status = "landed" if err is None else "failed"
+                    return {"signature": signature, "status": status, "error": err,
+                            "attempts": attempts, "confirm_ms": elapsed_ms}
+                # The blockhash expired; make sure the notification didn't just lose the race
+                self._watcher.forget(signature)
+                with metrics.track("solana_rpc", "getSignatureStatuses"):
+                    statuses = await self._client.get_signature_statuses([Signature.from_string(signature)])
+                landed = statuses.value[0]
+                if landed is not None:
+                    elapsed_ms = (time.perf_counter() - first_sent) * 1000
+                    err = None if landed.err is None else str(landed.err)
+                    return {"signature": signature, "status": "landed" if err is None else "failed", "error": err,
+                            "attempts": attempts, "confirm_ms": elapsed_ms}
+                if attempts > self.max_resubmits:
+                    return {"signature": signature, "status": "expired", "error": None, "attempts": attempts}
+                generation = await self._fresh_generation(generation)
+                raw, signature = await loop.run_in_executor(
+                    self._pool, _sign_worker, _sign_job(message, keypairs, generation.blockhash)
+                )
+                self._resubmitted += 1
+
+    def _report(self, outcomes: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+        submitted = len(outcomes)
+        landed = [o for o in outcomes if o["status"] == "landed"]
+        confirm_ms = [o["confirm_ms"] for o in landed]
+        return {
+            "submitted": submitted,
+            "landed": len(landed),
+            "failed": sum(1 for o in outcomes if o["status"] == "failed"),
+            "expired": sum(1 for o in outcomes if o["status"] == "expired"),
+            "resubmitted": self._resubmitted,
+            "compute_unit_price": self._price,
+            "landed_rate": round(len(landed) / submitted, 4) if submitted else 0.0,
+            "confirm_p50_ms": _percentile(confirm_ms, 0.50),
+            "confirm_p99_ms": _percentile(confirm_ms, 0.99),
+            "elapsed_s": round(elapsed, 3),
+            "transactions": outcomes
+        }
@@ -0,0 +1,340 @@
+"""
+ZK prover utility for GrimBundle
+Python bridge to a pool of long-lived Node proof workers (grimnode-ts/src/prover-worker.ts)
+that keep the circuit wasm, zkey and curve loaded, so each proof costs only
+witness generation and proving instead of a Node start and artifact reload
+
+Requests are batched onto the workers' stdin pipes as JSON lines and answered
+per proof as soon as each is done. The pool reports end-to-end latency, worker
+proving time and throughput. Set GRIMNODE_PROVER_COMMAND to run a different
+worker (it receives --wasm and --zkey and must speak the same protocol).
+"""
+
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Any, Deque, List, Optional
+import json
+import os
+import shlex
+import subprocess
+import threading
+import time
+
+from utils import metrics
+
+GRIMNODE_TS = Path(__file__).resolve().parent.parent / "grimnode-ts"
+DEFAULT_WASM = GRIMNODE_TS / "src" / "circuits" / "preimage_js" / "preimage.wasm"
+DEFAULT_ZKEY = GRIMNODE_TS / "preimage_0000.zkey"
+
+DEFAULT_WORKERS = 2
+# Proofs per message to a worker, and how long to wait for a batch to fill
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_BATCH_WAIT = 0.002
+# Proofs a worker may have queued before it gets more, so one is always ready to start
+MAX_PENDING_BATCHES = 2
+START_TIMEOUT = 120.0
+# Allowance per proof for callers that bound a whole batch (a cold pool loads first)
+PROOF_TIMEOUT = 30.0
+# Recent proofs kept for latency percentiles
+STATS_WINDOW = 4096
+
+class ProverError(RuntimeError):
+    """A proof worker failed to start, died, or rejected a proof"""
+
+def worker_command() -> List[str]:
+    """GRIMNODE_PROVER_COMMAND, else the compiled worker in dist/, else the TypeScript source via ts-node"""
+    if os.getenv("GRIMNODE_PROVER_COMMAND"):
+        return shlex.split(os.environ["GRIMNODE_PROVER_COMMAND"])
+    compiled = GRIMNODE_TS / "dist" / "prover-worker.js"
+    if compiled.exists():
+        return ["node", str(compiled)]
+    return ["node", "-r", "ts-node/register/transpile-only", str(GRIMNODE_TS / "src" / "prover-worker.ts")]
+
+class _Job:
+    __slots__ = ("id", "request", "future", "submitted")
+
+    def __init__(self, job_id: int, request: Dict[str, Any]):
+        self.id = job_id
+        self.request = request
+        self.future: Future = Future()
+        self.submitted = time.perf_counter()
+
+class _Worker:
+    """One Node worker process and the jobs sent to it"""
+
+    def __init__(self, index: int, command: List[str], on_result):
+        self.index = index
+        self.pending: Dict[int, _Job] = {}
+        self.proofs = 0
+        self.load_ms: Optional[float] = None
+        self.pid: Optional[int] = None
+        self.ready = threading.Event()
+        self.error: Optional[str] = None
+        self._on_result = on_result
+        self._stderr: Deque[str] = deque(maxlen=20)
+        self._write_lock = threading.Lock()
+        self.process = subprocess.Popen(
+            command, cwd=str(GRIMNODE_TS), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, bufsize=0
+        )
+        self._log_thread = threading.Thread(target=self._read_stderr, name=f"zk-prover-{index}-log", daemon=True)
+        self._log_thread.start()
+        threading.Thread(target=self._read, name=f"zk-prover-{index}", daemon=True).start()
+
+    @property
+    def alive(self) -> bool:
+        return self.ready.is_set() and self.error is None and self.process.poll() is None
+
+    def send(self, jobs: List[_Job]) -> None:
+        for job in jobs:
+            self.pending[job.id] = job
+        line = json.dumps({"batch": [{"id": job.id, **job.request} for job in jobs]}).encode() + b"\n"
+        try:
+            with self._write_lock:
+                self.process.stdin.write(line)
+                self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self._fail(f"worker {self.index} pipe closed: {e}")
+
+    def close(self, timeout: float = 5.0) -> None:
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+    def _read(self) -> None:
+        for line in self.process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if "ready" in message:
+                if message["ready"]:
+                    self.pid, self.load_ms = message.get("pid"), message.get("load_ms")
+                else:
+                    self.error = f"worker {self.index} failed to load its circuit: {message.get('error')}"
+                self.ready.set()
+                continue
+            job = self.pending.pop(message.get("id"), None)
+            if job is not None:
+                self.proofs += "error" not in message
+                self._on_result(self, job, message)
+        # Let the last of stderr arrive so the failure says why
+        self._log_thread.join(1.0)
+        self._fail(f"worker {self.index} exited ({self.process.wait()}): {self.stderr_tail()}")
+
+    def _read_stderr(self) -> None:
+        for line in self.process.stderr:
+            self._stderr.append(line.decode(errors="replace").rstrip())
+
+    def _fail(self, reason: str) -> None:
+        self.error = self.error or reason
+        self.ready.set()
+        pending, self.pending = self.pending, {}
+        for job in pending.values():
+            if not job.future.done():
+                job.future.set_exception(ProverError(reason))
+        self._on_result(self, None, None)
+
+    def stderr_tail(self) -> str:
+        return " | ".join(self._stderr) or "no output"
+
+class ProverPool:
+    """
+    Long-lived Node proof workers fed from one request queue.
+
+    A dispatcher thread groups queued proofs into batches (up to batch_size, or
+    whatever arrived within batch_wait, split across the workers with room) and
+    sends each batch to the least busy worker that has room, keeping up to MAX_PENDING_BATCHES queued per worker so
+    the next proof is already waiting when one finishes.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        command: Optional[List[str]] = None,
+        wasm: Optional[str] = None,
+        zkey: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_wait: float = DEFAULT_BATCH_WAIT
+    ):
+        self.size = max(1, workers)
+        self.command = (command or worker_command()) + [
+            "--wasm", str(Path(wasm) if wasm else DEFAULT_WASM), "--zkey", str(Path(zkey) if zkey else DEFAULT_ZKEY)
+        ]
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.workers: List[_Worker] = []
+        self._queue: Deque[_Job] = deque()
+        self._cond = threading.Condition()
+        self._start_lock = threading.Lock()
+        self._next_id = 0
+        self._closed = False
+        self._dispatcher: Optional[threading.Thread] = None
+        self._latencies: Deque[float] = deque(maxlen=STATS_WINDOW)
+        self._prove_ms: Deque[float] = deque(maxlen=STATS_WINDOW)
+        self._proofs = 0
+        self._errors = 0
+        self._first_submit: Optional[float] = None
+        self._last_result: Optional[float] = None
+
+    def start(self, timeout: float = START_TIMEOUT) -> "ProverPool":
+        """Spawn the workers and wait until each has its circuit loaded"""
+        if self.workers:
+            return self
+        self.workers = [_Worker(i, self.command, self._result) for i in range(self.size)]
+        deadline = time.monotonic() + timeout
+        for worker in self.workers:
+            if not worker.ready.wait(max(0.0, deadline - time.monotonic())):
+                self.close()
+                raise ProverError(f"worker {worker.index} did not load its circuit within {timeout:.0f}s")
+            if worker.error:
+                self.close()
+                raise ProverError(worker.error)
+        self._dispatcher = threading.Thread(target=self._dispatch, name="zk-prover-dispatch", daemon=True)
+        self._dispatcher.start()
+        return self
+
+    def submit(self, preimage: Optional[str] = None, circuit_input: Optional[Dict[str, Any]] = None) -> Future:
+        """
+        Queue one proof
+
+        Args:
+            preimage: Secret preimage; the worker builds the circuit input from it
+            circuit_input: Raw circuit input, instead of a preimage
+
+        Returns:
+            A Future resolving to {proof, publicSignals, witness_ms, prove_ms, latency_ms, worker}
+        """
+        if circuit_input is None and preimage is None:
+            raise ValueError("submit() needs a preimage or a circuit input")
+        request = {"input": circuit_input} if circuit_input is not None else {"preimage": preimage}
+        if not self.workers:
+            with self._start_lock:
+                self.start()
+        with self._cond:
+            if self._closed:
+                raise ProverError("prover pool is closed")
+            self._next_id += 1
+            job = _Job(self._next_id, request)
+            if self._first_submit is None:
+                self._first_submit = job.submitted
+            self._queue.append(job)
+            self._cond.notify_all()
+        return job.future
+
+    def prove(self, preimage: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Prove one preimage, blocking until done"""
+        return self.submit(preimage).result(timeout)
+
+    def prove_many(self, preimages: List[str], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Prove several preimages across the pool; results in input order"""
+        futures = [self.submit(preimage) for preimage in preimages]
+        return [future.result(timeout) for future in futures]
+
+    def stats(self) -> Dict[str, Any]:
+        """Proof counts, throughput and latency percentiles over the recent window"""
+        latencies = sorted(self._latencies)
+        prove_ms = sorted(self._prove_ms)
+        elapsed = (self._last_result or 0.0) - (self._first_submit or 0.0)
+        pick = lambda values, q: round(values[min(len(values) - 1, int(q * len(values)))], 2) if values else None
+        return {
+            "workers": [{"pid": w.pid, "load_ms": w.load_ms, "proofs": w.proofs, "pending": len(w.pending),
+                         "alive": w.alive} for w in self.workers],
+            "proofs": self._proofs,
+            "errors": self._errors,
+            "queued": len(self._queue),
+            "proofs_per_s": round(self._proofs / elapsed, 2) if elapsed > 0 else None,
+            "latency_p50_ms": pick(latencies, 0.5),
+            "latency_p99_ms": pick(latencies, 0.99),
+            "prove_p50_ms": pick(prove_ms, 0.5)
+        }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            queued, self._queue = list(self._queue), deque()
+            self._cond.notify_all()
+        for job in queued:
+            job.future.set_exception(ProverError("prover pool closed"))
+        for worker in self.workers:
+            worker.close()
+
+    def __enter__(self) -> "ProverPool":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not (self._queue and self._has_room()):
+                    if self.workers and not any(w.alive for w in self.workers):
+                        self._fail_queued("every proof worker has exited")
+                    self._cond.wait(0.5)
+                if self._closed:
+                    return
+                # While every worker is still busy, waiting for a batch to fill costs no latency;
+                # an idle worker gets its proofs at once
+                busy = not any(w.alive and not w.pending for w in self.workers)
+                deadline = time.monotonic() + (self.batch_wait if busy else 0.0)
+                while len(self._queue) < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batches = self._assign()
+            for worker, batch in batches.items():
+                worker.send(batch)
+
+    def _room(self, worker: _Worker, assigned: int = 0) -> bool:
+        return worker.alive and len(worker.pending) + assigned < self.batch_size * MAX_PENDING_BATCHES
+
+    def _has_room(self) -> bool:
+        return any(self._room(w) for w in self.workers)
+
+    def _assign(self) -> Dict[_Worker, List[_Job]]:
+        """Deal queued proofs one at a time to the least loaded worker, so a small burst spreads over the pool"""
+        batches: Dict[_Worker, List[_Job]] = {}
+        load = lambda w: len(w.pending) + len(batches.get(w, ()))
+        while self._queue:
+            candidates = [w for w in self.workers
+                          if self._room(w, len(batches.get(w, ()))) and len(batches.get(w, ())) < self.batch_size]
+            if not candidates:
+                break
+            batches.setdefault(min(candidates, key=load), []).append(self._queue.popleft())
+        return batches
+
+    def _fail_queued(self, reason: str) -> None:
+        queued, self._queue = list(self._queue), deque()
+        for job in queued:
+            job.future.set_exception(ProverError(reason))
+
+    def _result(self, worker: _Worker, job: Optional[_Job], message: Optional[Dict[str, Any]]) -> None:
+        if job is not None:
+            now = time.perf_counter()
+            latency_ms = (now - job.submitted) * 1000
+            if "error" in message:
+                self._errors += 1
+                metrics.count("zk_proofs", outcome="error")
+                job.future.set_exception(ProverError(message["error"]))
+            else:
+                self._proofs += 1
+                self._last_result = now
+                self._latencies.append(latency_ms)
+                self._prove_ms.append(float(message.get("prove_ms") or 0))
+                metrics.count("zk_proofs", outcome="ok")
+                job.future.set_result({
+                    "proof": message.get("proof"),
+                    "publicSignals": message.get("publicSignals"),
+                    "witness_ms": message.get("witness_ms"),
+                    "prove_ms": message.get("prove_ms"),
+                    "latency_ms": round(latency_ms, 2),
+                    "worker": worker.index
+                })
+        # A worker has room again (or has died); wake the dispatcher
+        with self._cond:
+            self._cond.notify_all()